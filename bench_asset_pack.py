@@ -0,0 +1,85 @@
+# bench_asset_pack.py
+
+#   Benchmark: asset pack vs loose files at startup
+#
+#   Writes a few thousand small PNG sprites to a temporary directory, packs them
+#   with AssetPackBuilder, then times a "startup": reading every asset's bytes
+#   and decoding every image, once from the loose files and once through
+#   AssetPack. Files are read through the OS page cache (warm), so the numbers
+#   show the per-file open/read overhead rather than disk seek time.
+#   Needs no window.
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from raylibpy import *
+from raylibpy.assetpack import AssetPack, AssetPackBuilder
+
+SPRITES = 2000
+RUNS = 3
+
+
+def best(run) -> float:
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000.0
+
+
+def main():
+
+    directory = tempfile.mkdtemp(prefix='raylibpy-pack-')
+    try:
+        loose = os.path.join(directory, 'sprites')
+        os.makedirs(loose)
+        rng = random.Random(1)
+        for i in range(SPRITES):
+            image = gen_image_checked(rng.randint(8, 48), rng.randint(8, 48), 4, 4, RED, BLUE)
+            export_image(os.path.join(loose, 'sprite{:04}.png'.format(i)), image)
+            unload_image(image)
+        names = sorted(os.listdir(loose))
+
+        pack_name = os.path.join(directory, 'sprites.rlpack')
+        start = time.perf_counter()
+        with AssetPackBuilder(pack_name) as builder:
+            builder.add_directory(loose)
+        print("{} sprites, packed in {:.1f} ms, {:.0f} KB loose, {:.0f} KB pack".format(
+            SPRITES, (time.perf_counter() - start) * 1000.0,
+            sum(os.path.getsize(os.path.join(loose, name)) for name in names) / 1024.0,
+            os.path.getsize(pack_name) / 1024.0))
+
+        def read_loose():
+            for name in names:
+                with open(os.path.join(loose, name), 'rb') as f:
+                    f.read()
+
+        def read_pack():
+            with AssetPack(pack_name) as pack:
+                for name in names:
+                    data = pack.read(name)
+                    if isinstance(data, memoryview):
+                        data.release()
+
+        def decode_loose():
+            for name in names:
+                unload_image(load_image(os.path.join(loose, name)))
+
+        def decode_pack():
+            with AssetPack(pack_name) as pack:
+                for name in names:
+                    unload_image(pack.load_image(name))
+
+        print("{:<8} {:>12} {:>12}".format('', 'loose', 'pack'))
+        print("{:<8} {:>9.1f} ms {:>9.1f} ms".format('read', best(read_loose), best(read_pack)))
+        print("{:<8} {:>9.1f} ms {:>9.1f} ms".format('decode', best(decode_loose), best(decode_pack)))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# bench_atlas_packing.py
+
+#   Benchmark: texture atlas packing throughput
+#
+#   Packs sets of random sized sprites (8..64 pixels) with the MaxRects packer
+#   alone, then with build_atlas() (packing plus pixel copies into the pages),
+#   and saves/reloads the result. Prints sprites per second, pages and page
+#   efficiency. Needs no window.
+
+import os
+import random
+import tempfile
+import time
+
+from raylibpy import *
+from raylibpy.atlas import MaxRectsPacker, build_atlas, load_atlas
+
+MAX_SIZE = 2048
+
+
+def sprites(count: int) -> dict:
+    rng = random.Random(count)
+    images = {}
+    for i in range(count):
+        color = Color(rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+        images['sprite{}'.format(i)] = gen_image_color(rng.randint(8, 64), rng.randint(8, 64), color)
+    return images
+
+
+def main():
+
+    print("{:>8} {:>16} {:>16} {:>10} {:>10} {:>10} {:>10}".format(
+        'sprites', 'packer/s', 'build_atlas/s', 'pages', 'effic.', 'save', 'load'))
+    for count in (250, 1000, 4000):
+        images = sprites(count)
+        sizes = sorted(((image.width + 1, image.height + 1) for image in images.values()),
+                       key=lambda size: (max(size), size[0] * size[1]), reverse=True)
+
+        start = time.perf_counter()
+        packers = [MaxRectsPacker(MAX_SIZE, MAX_SIZE)]
+        for width, height in sizes:
+            if packers[-1].insert(width, height) is None:
+                packers.append(MaxRectsPacker(MAX_SIZE, MAX_SIZE))
+                packers[-1].insert(width, height)
+        packed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        atlas = build_atlas(images, max_size=MAX_SIZE)
+        built = time.perf_counter() - start
+
+        path = os.path.join(tempfile.gettempdir(), 'bench_atlas_packing.rlatlas')
+        start = time.perf_counter()
+        atlas.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = load_atlas(path)
+        reloaded = time.perf_counter() - start
+        os.remove(path)
+
+        print("{:>8} {:>16.0f} {:>16.0f} {:>10} {:>10.1%} {:>7.1f} ms {:>7.1f} ms".format(
+            count, count / packed, count / built, len(atlas.pages), atlas.efficiency,
+            saved * 1000.0, reloaded * 1000.0))
+
+        loaded.unload()
+        atlas.unload()
+        for image in images.values():
+            unload_image(image)
+
+
+if __name__ == '__main__':
+    main()
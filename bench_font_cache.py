@@ -0,0 +1,60 @@
+# bench_font_cache.py
+
+#   Benchmark: cold vs warm font loading through the on-disk atlas cache
+#
+#   For a few sizes and glyph sets, times load_font_ex() (rasterizes every
+#   run), load_font_cached() with an empty cache (rasterizes and writes the
+#   cache file) and load_font_cached() again (reads the cache file). The cache
+#   lives in a temporary directory, the user cache is left alone.
+
+import shutil
+import tempfile
+import time
+
+from raylibpy import *
+from raylibpy.fontcache import load_font_cached
+
+FONT = "resources/KAISG.ttf"
+RUNS = 5
+
+GLYPH_SETS = {
+    'ascii': list(range(32, 127)),
+    'latin-1': list(range(32, 127)) + list(range(160, 256)),
+}
+
+
+def timed(load) -> float:
+    best = None
+    for run in range(RUNS):
+        start = time.perf_counter()
+        font = load(run)
+        elapsed = time.perf_counter() - start
+        unload_font(font)
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000.0
+
+
+def main():
+
+    init_window(320, 180, "raylib [text] benchmark - font cache")
+
+    cache_dir = tempfile.mkdtemp(prefix='raylibpy-fonts-')
+    try:
+        print("{:>8} {:>5} {:>14} {:>12} {:>12}".format('glyphs', 'size', 'load_font_ex', 'cold cache', 'warm cache'))
+        for name, chars in GLYPH_SETS.items():
+            for size in (32, 64, 128):
+                direct = timed(lambda run: load_font_ex(FONT, size, len(chars), chars))
+                # a fresh directory per run keeps the cache cold
+                cold = timed(lambda run: load_font_cached(FONT, size, chars, cache_dir="{}/cold{}-{}".format(
+                    cache_dir, size, run)))
+                load_font_cached(FONT, size, chars, cache_dir=cache_dir)
+                warm = timed(lambda run: load_font_cached(FONT, size, chars, cache_dir=cache_dir))
+                print("{:>8} {:>5} {:>11.2f} ms {:>9.2f} ms {:>9.2f} ms".format(name, size, direct, cold, warm))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    close_window()
+
+
+if __name__ == '__main__':
+    main()
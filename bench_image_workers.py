@@ -0,0 +1,68 @@
+# bench_image_workers.py
+
+#   Benchmark: images per second per core of the process-pool batch jobs
+#
+#   Runs the three process-pool front ends (ImagePipeline, RenderService and
+#   compare_images) over the same batch of 512x512 images, in the calling
+#   process (workers=0) and with 1, 2, ... os.cpu_count() worker processes.
+#   Prints images/s and images/s per worker: with enough cores the second
+#   number should stay close to the in-process one. Needs no window.
+
+import os
+import shutil
+import tempfile
+import time
+
+from raylibpy import *
+from raylibpy.canvas import RenderService
+from raylibpy.imagediff import compare_images
+from raylibpy.pipeline import ImagePipeline
+
+IMAGES = 48
+SIZE = 512
+
+
+def render_card(canvas, job):
+    for i in range(32):
+        canvas.draw_rectangle((job * 7 + i * 13) % SIZE, (i * 29) % SIZE, 96, 64, Color(i * 8, job % 256, 90, 255))
+        canvas.draw_circle((i * 37) % SIZE, (job * 11 + i * 17) % SIZE, 24, Color(200, i * 8, job % 256, 255))
+
+
+def timed(name: str, workers: int, run) -> None:
+    start = time.perf_counter()
+    results = list(run(workers))
+    elapsed = time.perf_counter() - start
+    assert len(results) == IMAGES and all(result.ok for result in results)
+    rate = IMAGES / elapsed
+    print("  {:<16} workers {:>2}: {:8.1f} images/s {:8.1f} images/s/core".format(name, workers, rate,
+                                                                                 rate / max(workers, 1)))
+
+
+def main():
+
+    directory = tempfile.mkdtemp(prefix='raylibpy-workers-')
+    try:
+        sources = []
+        for i in range(IMAGES):
+            image = gen_image_gradient_radial(SIZE, SIZE, 0.1 + i / (2.0 * IMAGES), RED, DARKBLUE)
+            sources.append(os.path.join(directory, 'src', 'image{:02}.png'.format(i)))
+            os.makedirs(os.path.dirname(sources[-1]), exist_ok=True)
+            export_image(sources[-1], image)
+            unload_image(image)
+        pipeline = ImagePipeline().resize(256, 256).alpha_premultiply().format(UNCOMPRESSED_R5G6B5)
+        pairs = list(zip(sources, sources[1:] + sources[:1]))
+
+        cpus = os.cpu_count() or 1
+        print("{} images of {}x{}, {} cores".format(IMAGES, SIZE, SIZE, cpus))
+        for workers in sorted({0, 1, min(2, cpus), cpus}):
+            timed('ImagePipeline', workers, lambda workers: pipeline.imap(
+                sources, os.path.join(directory, 'out{}'.format(workers)), workers=workers))
+            with RenderService(render_card, SIZE, SIZE, RAYWHITE, workers=workers) as service:
+                timed('RenderService', workers, lambda workers: service.imap(range(IMAGES)))
+            timed('compare_images', workers, lambda workers: compare_images(pairs, workers=workers))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
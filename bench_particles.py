@@ -0,0 +1,43 @@
+# bench_particles.py
+
+#   Benchmark: particle emitter update and vertex building
+#
+#   Fills emitters of 1k, 10k and 100k particles (forces, drag, spin and color
+#   and size curves on) and times update() and build_vertices(), the CPU part
+#   of draw(). Runs without a window: nothing is sent to the GPU.
+
+import time
+
+from raylibpy import *
+from raylibpy.particles import ParticleEmitter, vortex, wind
+
+FRAMES = 200
+DT = 1.0 / 60.0
+
+
+def timed(step) -> float:
+    step()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        step()
+    return (time.perf_counter() - start) / FRAMES * 1000.0
+
+
+def main():
+
+    print("{:>9} {:>12} {:>16}".format('particles', 'update', 'build_vertices'))
+    for count in (1000, 10000, 100000):
+        # rate replaces the particles dying each frame, the count stays near capacity
+        emitter = ParticleEmitter(capacity=count, rate=count / 2.0, lifetime=(1.5, 2.5), speed=(20, 80),
+                                  size=[4, 16, 2], color=[SKYBLUE, fade(BLUE, 0.0)], spin=(-90, 90),
+                                  acceleration=(0, 30), drag=0.5, position=(400, 225), radius=20, seed=1)
+        emitter.forces.append(wind((20, 0), 0.5))
+        emitter.forces.append(vortex((400, 225), 0.2))
+        emitter.emit(count)
+        update = timed(lambda: emitter.update(DT))
+        build = timed(emitter.build_vertices)
+        print("{:>9} {:>9.3f} ms {:>13.3f} ms".format(emitter.count, update, build))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# bench_sprites.py
+
+#   Benchmark: animated sprite submission
+#
+#   Animates 10000 sprites of resources/scarfy.png (6 frame run cycle, random
+#   clocks, half of them flipped) and draws them every frame, first with a
+#   Python loop of draw_texture_rec() calls, then through SpriteAnimator
+#   (update() plus one draw_texture_quads() submission). Prints the CPU time
+#   of the animate + submit part per frame and the draw calls of the last
+#   frame.
+
+import random
+import time
+
+from raylibpy import *
+from raylibpy.spritesheet import SpriteAnimator, SpriteSheet
+
+SPRITES = 10000
+FRAMES = 120
+
+
+def run(name: str, frame) -> None:
+    spent = 0.0
+    for i in range(FRAMES):
+        begin_drawing()
+        clear_background(RAYWHITE)
+        start = time.perf_counter()
+        frame(1.0 / 60.0)
+        spent += time.perf_counter() - start
+        end_drawing()
+    stats = get_render_batch_stats()
+    print("  {:<34} {:8.3f} ms/frame {:6} draw calls".format(name, spent / FRAMES * 1000.0, stats.draw_calls))
+
+
+def main():
+
+    init_window(800, 450, "raylib [textures] benchmark - sprite submission")
+
+    scarfy = load_texture("resources/scarfy.png")
+    sheet = SpriteSheet.from_grid(scarfy, scarfy.width // 6, scarfy.height)
+    run_cycle = sheet.add_animation("run", range(6), fps=12)
+
+    rng = random.Random(1)
+    sprites = [(rng.uniform(0, 800), rng.uniform(0, 450), rng.random(), rng.random() < 0.5) for _ in range(SPRITES)]
+
+    # one Python object per sprite, frame picked and drawn one by one
+    clocks = [clock for x, y, clock, flip in sprites]
+    frame_width = scarfy.width / 6.0
+
+    def loop_frame(dt: float) -> None:
+        for i, (x, y, clock, flip) in enumerate(sprites):
+            clocks[i] += dt
+            frame = int(clocks[i] * 12) % 6
+            source = (frame * frame_width, 0, -frame_width if flip else frame_width, scarfy.height)
+            draw_texture_rec(scarfy, source, (x - frame_width * 0.5, y - scarfy.height * 0.25), WHITE)
+
+    animator = SpriteAnimator(sheet, capacity=SPRITES, anchor=(0.5, 0.25))
+    for x, y, clock, flip in sprites:
+        animator.add(run_cycle, (x, y), flip_x=flip, time=clock)
+
+    def animator_frame(dt: float) -> None:
+        animator.update(dt)
+        animator.draw()
+
+    print("{} sprites, {} frames".format(SPRITES, FRAMES))
+    run("draw_texture_rec() loop", loop_frame)
+    run("SpriteAnimator update() + draw()", animator_frame)
+
+    unload_texture(scarfy)
+    close_window()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# bench_texture_upload.py
+
+#   Benchmark: texture upload throughput
+#
+#   Streams a 1920x1080 RGBA frame from a NumPy array into a texture with
+#   update_texture() (no copy), with a bytes copy first (the cost the zero-copy
+#   path saves), with update_texture_rec() for one 512x512 rectangle, and with
+#   update_texture_regions() for 16 scattered 128x128 dirty rectangles.
+#   Prints MB/s of pixel data handed to the driver and ms per upload.
+
+import time
+
+import numpy as np
+
+from raylibpy import *
+
+WIDTH = 1920
+HEIGHT = 1080
+UPLOADS = 120
+
+
+def timed(name: str, upload, megabytes: float) -> None:
+    upload()
+    start = time.perf_counter()
+    for i in range(UPLOADS):
+        upload()
+    # make sure the driver really took the data
+    begin_drawing()
+    end_drawing()
+    elapsed = (time.perf_counter() - start) / UPLOADS
+    print("  {:<34} {:8.1f} MB/s {:8.3f} ms".format(name, megabytes / elapsed, elapsed * 1000.0))
+
+
+def main():
+
+    init_window(640, 360, "raylib [textures] benchmark - texture upload")
+
+    image = gen_image_color(WIDTH, HEIGHT, BLACK)
+    texture = load_texture_from_image(image)
+    unload_image(image)
+
+    frame = np.random.default_rng(1).integers(0, 255, (HEIGHT, WIDTH, 4), dtype=np.uint8)
+    block = np.ascontiguousarray(frame[:512, :512])
+    rng = np.random.default_rng(2)
+    regions = [(int(x), int(y), 128, 128) for x, y in zip(rng.integers(0, WIDTH - 128, 16),
+                                                          rng.integers(0, HEIGHT - 128, 16))]
+
+    frame_mb = frame.nbytes / 1e6
+    print("{}x{} RGBA frame, {} uploads".format(WIDTH, HEIGHT, UPLOADS))
+    timed("update_texture (array, no copy)", lambda: update_texture(texture, frame), frame_mb)
+    timed("update_texture (bytes copy)", lambda: update_texture(texture, frame.tobytes()), frame_mb)
+    timed("update_texture_rec 512x512", lambda: update_texture_rec(texture, (0, 0, 512, 512), block),
+          block.nbytes / 1e6)
+    timed("update_texture_regions 16x128x128", lambda: update_texture_regions(texture, frame, regions),
+          16 * 128 * 128 * 4 / 1e6)
+
+    unload_texture(texture)
+    close_window()
+
+
+if __name__ == '__main__':
+    main()
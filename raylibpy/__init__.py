@@ -1,10 +1,12 @@
 import sys
 import os
 import colorsys
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
 from pathlib import Path
 from math import modf
 from enum import IntEnum, IntFlag
-from typing import Tuple, List, Union, Sequence, AnyStr, Optional, Iterator, Type
+from typing import Tuple, List, Union, Sequence, AnyStr, Optional, Iterator, Iterable, Callable, Type
 from ctypes import (
 	c_bool,
 	c_char_p,
@@ -24,7 +26,11 @@ from ctypes import (
 	POINTER,
 	CDLL,
 	Structure,
-	byref
+	Array,
+	byref,
+	cast,
+	memmove,
+	addressof
 )
 
 _lib_filename = {
@@ -192,9 +198,10 @@ __all__ = [
 	'LOC_VERTEX_TANGENT',
 	'LOC_VERTEX_COLOR',
 	'LOC_MATRIX_MVP',
-	'LOC_MATRIX_MODEL',
 	'LOC_MATRIX_VIEW',
 	'LOC_MATRIX_PROJECTION',
+	'LOC_MATRIX_MODEL',
+	'LOC_MATRIX_NORMAL',
 	'LOC_VECTOR_VIEW',
 	'LOC_COLOR_DIFFUSE',
 	'LOC_COLOR_SPECULAR',
@@ -212,6 +219,16 @@ __all__ = [
 	'LOC_MAP_BRDF',
 	'LOC_MAP_DIFFUSE',
 	'LOC_MAP_SPECULAR',
+	'ShaderUniformDataType',
+	'SHADER_UNIFORM_FLOAT',
+	'SHADER_UNIFORM_VEC2',
+	'SHADER_UNIFORM_VEC3',
+	'SHADER_UNIFORM_VEC4',
+	'SHADER_UNIFORM_INT',
+	'SHADER_UNIFORM_IVEC2',
+	'SHADER_UNIFORM_IVEC3',
+	'SHADER_UNIFORM_IVEC4',
+	'SHADER_UNIFORM_SAMPLER2D',
 	'TexmapIndex',
 	'MAP_ALBEDO',
 	'MAP_METALNESS',
@@ -299,6 +316,8 @@ __all__ = [
 	'Camera3DPtr',
 	'CharInfo',
 	'CharInfoPtr',
+	'GlyphInfo',
+	'GlyphInfoPtr',
 	'Color',
 	'ColorPtr',
 	'Font',
@@ -316,6 +335,7 @@ __all__ = [
 	'Ray',
 	'RayHitInfo',
 	'Rectangle',
+	'RectanglePtr',
 	'RenderTexture',
 	'RenderTexture2D',
 	'NPatchInfo',
@@ -333,6 +353,11 @@ __all__ = [
 	'Vector4Ptr',
 	'Wave',
 	'WavePtr',
+	'VertexBuffer',
+	'DrawCall',
+	'RenderBatch',
+	'RenderBatchPtr',
+	'RenderBatchStats',
 	# C types
 	'Bool',
 	'VoidPtr',
@@ -404,6 +429,8 @@ __all__ = [
 	'is_file_dropped',
 	'get_dropped_files',
 	'clear_dropped_files',
+	'mem_alloc',
+	'mem_free',
 
 	# input
 	'is_key_pressed',
@@ -467,6 +494,10 @@ __all__ = [
 
 	# Module: TEXTURES
 	'load_image',
+	'load_image_from_memory',
+	'load_image_from_screen',
+	'load_image_anim',
+	'image_from_array',
 	'export_image',
 	'load_texture',
 	'load_texture_from_image',
@@ -475,8 +506,18 @@ __all__ = [
 	'unload_texture',
 	'unload_render_texture',
 	'get_pixel_data_size',
+	'load_image_colors',
+	'load_image_palette',
+	'get_image_color',
+	'get_image_colors',
+	'get_image_alpha_border',
+	'image_unique_colors',
+	'image_histogram',
 	'update_texture',
+	'update_texture_rec',
+	'update_texture_regions',
 	'image_copy',
+	'image_from_image',
 	'image_to_pot',
 	'image_format',
 	'image_alpha_mask',
@@ -492,7 +533,13 @@ __all__ = [
 	'image_text',
 	'image_text_ex',
 	'image_draw',
+	'image_clear_background',
+	'image_draw_pixel',
+	'image_draw_line',
+	'image_draw_circle',
 	'image_draw_rectangle',
+	'image_draw_rectangle_rec',
+	'image_draw_rectangle_lines',
 	'image_draw_text',
 	'image_draw_text_ex',
 	'image_flip_vertical',
@@ -525,8 +572,10 @@ __all__ = [
 	'get_font_default',
 	'load_font',
 	'load_font_ex',
+	'load_font_from_memory',
 	'load_font_data',
 	'gen_image_font_atlas',
+	'unload_font_data',
 	'unload_font',
 	'draw_fps',
 	'draw_text',
@@ -536,6 +585,66 @@ __all__ = [
 	'format_text',
 	'sub_text',
 	'get_glyph_index',
+	'clear_text_cache',
+	'load_codepoints',
+
+	# Module: RLGL
+	'DEFAULT_BATCH_BUFFERS',
+	'DEFAULT_BATCH_BUFFER_ELEMENTS',
+	'DEFAULT_BATCH_DRAWCALLS',
+	'load_render_batch',
+	'unload_render_batch',
+	'draw_render_batch',
+	'set_render_batch_active',
+	'draw_render_batch_active',
+	'check_render_batch_limit',
+	'get_render_batch_stats',
+	'reset_render_batch_stats',
+	'RL_LINES',
+	'RL_TRIANGLES',
+	'RL_QUADS',
+	'rl_begin',
+	'rl_end',
+	'rl_vertex2f',
+	'rl_tex_coord2f',
+	'rl_color4ub',
+	'rl_set_texture',
+	'RL_UNSIGNED_BYTE',
+	'RL_FLOAT',
+	'rl_load_vertex_array',
+	'rl_load_vertex_buffer',
+	'rl_update_vertex_buffer',
+	'rl_set_vertex_attribute',
+	'rl_enable_vertex_attribute',
+	'rl_enable_vertex_array',
+	'rl_disable_vertex_array',
+	'rl_enable_vertex_buffer',
+	'rl_disable_vertex_buffer',
+	'rl_draw_vertex_array',
+	'rl_unload_vertex_array',
+	'rl_unload_vertex_buffer',
+	'rl_enable_shader',
+	'rl_disable_shader',
+	'rl_get_shader_id_default',
+	'rl_get_shader_locs_default',
+	'rl_get_texture_id_default',
+	'rl_set_uniform',
+	'rl_set_uniform_matrix',
+	'rl_get_matrix_modelview',
+	'rl_get_matrix_projection',
+	'rl_get_matrix_transform',
+	'rl_active_texture_slot',
+	'rl_enable_texture',
+	'rl_disable_texture',
+	'draw_texture_quads',
+
+	# Module: AUDIO
+	'load_wave',
+	'load_wave_from_memory',
+	'unload_wave',
+	'load_music_stream',
+	'load_music_stream_from_memory',
+	'unload_music_stream',
 	#gui
 	'gui_slider_bar',
 	'gui_button',
@@ -615,6 +724,22 @@ def _str_out(value: str) -> bytes:
 	return value.decode('utf-8', 'ignore') if isinstance(value, bytes) else value
 
 
+_TEXT_CACHE_SIZE = 4096
+_text_cache = {}
+
+
+def _text_in(value: AnyStr) -> bytes:
+	# Same as _str_in, but remembers the encoded bytes of strings drawn every frame.
+	if not isinstance(value, str):
+		return value
+	encoded = _text_cache.get(value)
+	if encoded is None:
+		if len(_text_cache) >= _TEXT_CACHE_SIZE:
+			del _text_cache[next(iter(_text_cache))]
+		encoded = _text_cache[value] = value.encode('utf-8', 'ignore')
+	return encoded
+
+
 def _vec2(seq: Sequence[Number]) -> 'Vector2':
 	if isinstance(seq, Vector2):
 		return seq
@@ -722,6 +847,41 @@ def _flatten(filter_types: List[Type], *values, map_to: Optional[Type]=None) ->
 	return result
 
 
+def _pool_imap(func: Callable, jobs: Iterable[tuple], workers: Optional[int]=None, max_pending: Optional[int]=None,
+			   executor: Optional[Executor]=None) -> Iterator:
+	"""
+	Yield func(*job) for every job, as they complete (not in input order).
+
+	workers=0 runs the jobs in the calling process. Otherwise they go to executor
+	(or to a pool of workers processes, os.cpu_count() by default, created for
+	this call) with at most max_pending (2 * workers) jobs in flight, so results
+	and inputs never pile up in memory however long jobs is.
+	"""
+	if workers == 0:
+		for job in jobs:
+			yield func(*job)
+		return
+
+	workers = workers or os.cpu_count() or 1
+	max_pending = max(max_pending or 2 * workers, 1)
+	if executor is None:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			yield from _pool_imap(func, jobs, workers, max_pending, executor)
+		return
+
+	pending = set()
+	for job in jobs:
+		if len(pending) >= max_pending:
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				yield future.result()
+		pending.add(executor.submit(func, *job))
+	while pending:
+		done, pending = wait(pending, return_when=FIRST_COMPLETED)
+		for future in done:
+			yield future.result()
+
+
 _NOARGS = []
 
 PI = 3.14159265358979323846
@@ -834,6 +994,20 @@ MOUSE_MIDDLE_BUTTON = 2
 MAX_SHADER_LOCATIONS = 32
 MAX_MATERIAL_MAPS = 12
 
+# rlgl render batch defaults (desktop OpenGL build)
+DEFAULT_BATCH_BUFFERS = 1
+DEFAULT_BATCH_BUFFER_ELEMENTS = 8192
+DEFAULT_BATCH_DRAWCALLS = 256
+
+# rlgl primitive assembly modes
+RL_LINES = 0x0001
+RL_TRIANGLES = 0x0004
+RL_QUADS = 0x0007
+
+# rlgl vertex attribute data types
+RL_UNSIGNED_BYTE = 0x1401
+RL_FLOAT = 0x1406
+
 
 # STRUCTURES DEFINITIONS
 # -------------------------------------------------------------------
@@ -1736,6 +1910,27 @@ class Image(Structure):
 	def __str__(self) -> str:
 		return "(IMAGE: {}w, {}h, mipmap: {}, format: {})".format(self.width, self.height, self.mipmaps, self.format)
 
+	def as_array(self) -> 'numpy.ndarray':
+		"""
+		Zero-copy NumPy view (height, width, channels) of the first mipmap level.
+
+		Packed 16 bit formats (R5G6B5, R5G5B5A1, R4G4B4A4) are viewed as one uint16
+		channel. The view is only valid while the pixel data is: unload_image() or
+		any image_* function that reallocates the data (resize, format, crop...)
+		leaves it dangling.
+		"""
+		import numpy as np
+
+		layout = _PIXEL_LAYOUTS.get(self.format)
+		if layout is None:
+			raise ValueError("Pixel format {} has no array view (compressed or unknown).".format(self.format))
+		if not self.data:
+			raise ValueError("Image has no pixel data.")
+		dtype, channels = layout
+		count = self.width * self.height * channels
+		buffer = (c_ubyte * (count * np.dtype(dtype).itemsize)).from_address(self.data)
+		return np.frombuffer(buffer, dtype=dtype, count=count).reshape(self.height, self.width, channels)
+
 
 ImagePtr = POINTER(Image)
 
@@ -1803,64 +1998,64 @@ class _NPatchInfo(Structure):
 		('type', c_int),
 	]
 
+def _npatch_type(value: Union[int, 'NPatchType']) -> 'NPatchType':
+	try:
+		return NPatchType(value)
+	except ValueError:
+		return NPT_9PATCH
+
+
 class NPatchInfo(_NPatchInfo):
 
 	def __init__(self, source_rec: 'Rectangle', left: int=1, top:int=1, right: int=1, bottom: int=1, npatch_type: Union[int, 'NPatchType']=0) -> None:
-		if npatch_type not in NPatchType:
-			npatch_type = {
-				0: NPT_9PATCH,
-				1: NPT_3PATCH_VERTICAL,
-				2: NPT_3PATCH_VERTICAL
-			}.get(npatch_type, NPT_9PATCH)
-
-		super(NPatchInfo, self).__init__(source_rec, left, top, right, bottom, npatch_type)
+		super(NPatchInfo, self).__init__(source_rec, left, top, right, bottom, _npatch_type(npatch_type))
 
 	def __str__(self) -> str:
 		"""Textual representation."""
-		npt = {
-			0: NPT_9PATCH,
-			1: NPT_3PATCH_VERTICAL,
-			2: NPT_3PATCH_VERTICAL
-		}.get(self.type, NPT_9PATCH).name
+		npt = _npatch_type(self.type).name
 		return "(NPATCHINFO: rec: {0.sourceRec}, ltrb: [{0.left}, {0.top}, {0.right}, {0.bottom}], type: {1})".format(self, npt)
 
 	def __repr__(self) -> str:
 		rc = repr(self.sourceRec)
-		npt = {
-			0: NPT_9PATCH,
-			1: NPT_3PATCH_VERTICAL,
-			2: NPT_3PATCH_VERTICAL
-		}.get(self.type, NPT_9PATCH).name
+		npt = _npatch_type(self.type).name
 		return "{0.__class__.__qualname__}({1}, {0.left}, {0.top}, {0.right}, {0.bottom}, {2})".format(self, rc, npt)
 
 
-class CharInfo(Structure):
+class GlyphInfo(Structure):
 	_fields_ = [
 		('value', c_int),
-		('rec', Rectangle),
 		('offsetX', c_int),
 		('offsetY', c_int),
 		('advanceX', c_int),
-		('data', c_char_p),
+		('image', Image),
 	]
 
 	def __str__(self) -> str:
-		return "(CHARINFO: {}, rec: {}, offset: ({}, {}), advanceX: {})".format(self.value, self.rec, self.offsetY, self.offsetY, self.advanceX)
+		return "(GLYPHINFO: {}, offset: ({}, {}), advanceX: {}, image: {}x{})".format(
+			self.value, self.offsetX, self.offsetY, self.advanceX, self.image.width, self.image.height
+		)
 
 
-CharInfoPtr = POINTER(CharInfo)
+GlyphInfoPtr = POINTER(GlyphInfo)
+CharInfo = GlyphInfo
+CharInfoPtr = GlyphInfoPtr
+RectanglePtr = POINTER(Rectangle)
 
 
 class Font(Structure):
 	_fields_ = [
-		('texture', Texture2D),
 		('baseSize', c_int),
-		('charsCount', c_int),
-		('chars', POINTER(CharInfo)),
+		('glyphCount', c_int),
+		('glyphPadding', c_int),
+		('texture', Texture2D),
+		('recs', RectanglePtr),
+		('glyphs', GlyphInfoPtr),
 	]
 
 	def __str__(self) -> str:
-		return "(FONT: texture: {}, baseSize: {}, charsCount: {})".format(self.width, self.height, self.mipmaps, self.format)
+		return "(FONT: texture: {}, baseSize: {}, glyphCount: {}, glyphPadding: {})".format(
+			self.texture, self.baseSize, self.glyphCount, self.glyphPadding
+		)
 
 
 SpriteFont = Font
@@ -2031,7 +2226,7 @@ class Wave(Structure):
 	_fields_ = [
 		('sampleCount', c_uint),
 		('sampleRate', c_uint),
-		('SampleSize', c_uint),
+		('sampleSize', c_uint),
 		('channels', c_uint),
 		('data', c_void_p),
 	]
@@ -2059,29 +2254,91 @@ class Sound(Structure):
 		)
 
 
-class Music(Structure):
-	
+class AudioStream(Structure):
+	_fields_ = [
+		('buffer', c_void_p),
+		('sampleRate', c_uint),
+		('sampleSize', c_uint),
+		('channels', c_uint),
+	]
+
 	def __str__(self) -> str:
-		return "(MUSIC: <no info>)"
+		return "(AUDIOSTREAM: sampleRate: {}, sampleSize: {}, channels: {})".format(
+			self.sampleRate, self.sampleSize, self.channels
+		)
+
+
+class Music(Structure):
+	_fields_ = [
+		('stream', AudioStream),
+		('frameCount', c_uint),
+		('looping', c_bool),
+		('ctxType', c_int),
+		('ctxData', c_void_p),
+	]
 
+	def __str__(self) -> str:
+		return "(MUSIC: frameCount: {}, looping: {}, ctxType: {}, stream: {})".format(
+			self.frameCount, self.looping, self.ctxType, self.stream
+		)
 
 
 MusicData = POINTER(Music)
 
 
-class AudioStream(Structure):
+class VertexBuffer(Structure):
+	"""
+	Wrapper for rlgl rlVertexBuffer struct (OpenGL 3.3 layout).
+	"""
 	_fields_ = [
-		('sampleRate', c_uint),
-		('SampleSize', c_uint),
-		('channels', c_uint),
+		('elementCount', c_int),
 
-		('audioBuffer', c_void_p),
+		('vertices', POINTER(c_float)),
+		('texcoords', POINTER(c_float)),
+		('colors', POINTER(c_ubyte)),
+		('indices', POINTER(c_uint)),
 
-		('format', c_int),
-		('source', c_uint),
-		('buffers', c_uint * 2),
+		('vaoId', c_uint),
+		('vboId', c_uint * 4),
 	]
 
+	def __str__(self) -> str:
+		return "(VERTEXBUFFER: elementCount: {}, vaoId: {})".format(self.elementCount, self.vaoId)
+
+
+class DrawCall(Structure):
+	_fields_ = [
+		('mode', c_int),
+		('vertexCount', c_int),
+		('vertexAlignment', c_int),
+		('textureId', c_uint),
+	]
+
+	def __str__(self) -> str:
+		return "(DRAWCALL: mode: {}, vertexCount: {}, vertexAlignment: {}, textureId: {})".format(
+			self.mode, self.vertexCount, self.vertexAlignment, self.textureId
+		)
+
+
+class RenderBatch(Structure):
+	_fields_ = [
+		('bufferCount', c_int),
+		('currentBuffer', c_int),
+		('vertexBuffer', POINTER(VertexBuffer)),
+
+		('draws', POINTER(DrawCall)),
+		('drawCounter', c_int),
+		('currentDepth', c_float),
+	]
+
+	def __str__(self) -> str:
+		return "(RENDERBATCH: bufferCount: {}, currentBuffer: {}, drawCounter: {})".format(
+			self.bufferCount, self.currentBuffer, self.drawCounter
+		)
+
+
+RenderBatchPtr = POINTER(RenderBatch)
+
 
 
 
@@ -2135,16 +2392,17 @@ LOG_OTHER = LogType.LOG_OTHER
 
 # Shader location point type
 class ShaderLocationIndex(IntEnum):
-	LOC_VERTEX_POSITION = 1
-	LOC_VERTEX_TEXCOORD01 = 2
-	LOC_VERTEX_TEXCOORD02 = 3
-	LOC_VERTEX_NORMAL = 4
-	LOC_VERTEX_TANGENT = 5
-	LOC_VERTEX_COLOR = 6
-	LOC_MATRIX_MVP = 7
-	LOC_MATRIX_MODEL = 8
-	LOC_MATRIX_VIEW = 9
-	LOC_MATRIX_PROJECTION = 10
+	LOC_VERTEX_POSITION = 0
+	LOC_VERTEX_TEXCOORD01 = 1
+	LOC_VERTEX_TEXCOORD02 = 2
+	LOC_VERTEX_NORMAL = 3
+	LOC_VERTEX_TANGENT = 4
+	LOC_VERTEX_COLOR = 5
+	LOC_MATRIX_MVP = 6
+	LOC_MATRIX_VIEW = 7
+	LOC_MATRIX_PROJECTION = 8
+	LOC_MATRIX_MODEL = 9
+	LOC_MATRIX_NORMAL = 10
 	LOC_VECTOR_VIEW = 11
 	LOC_COLOR_DIFFUSE = 12
 	LOC_COLOR_SPECULAR = 13
@@ -2169,9 +2427,10 @@ LOC_VERTEX_NORMAL = ShaderLocationIndex.LOC_VERTEX_NORMAL
 LOC_VERTEX_TANGENT = ShaderLocationIndex.LOC_VERTEX_TANGENT
 LOC_VERTEX_COLOR = ShaderLocationIndex.LOC_VERTEX_COLOR
 LOC_MATRIX_MVP = ShaderLocationIndex.LOC_MATRIX_MVP
-LOC_MATRIX_MODEL = ShaderLocationIndex.LOC_MATRIX_MODEL
 LOC_MATRIX_VIEW = ShaderLocationIndex.LOC_MATRIX_VIEW
 LOC_MATRIX_PROJECTION = ShaderLocationIndex.LOC_MATRIX_PROJECTION
+LOC_MATRIX_MODEL = ShaderLocationIndex.LOC_MATRIX_MODEL
+LOC_MATRIX_NORMAL = ShaderLocationIndex.LOC_MATRIX_NORMAL
 LOC_VECTOR_VIEW = ShaderLocationIndex.LOC_VECTOR_VIEW
 LOC_COLOR_DIFFUSE = ShaderLocationIndex.LOC_COLOR_DIFFUSE
 LOC_COLOR_SPECULAR = ShaderLocationIndex.LOC_COLOR_SPECULAR
@@ -2191,6 +2450,30 @@ LOC_MAP_DIFFUSE = ShaderLocationIndex.LOC_MAP_ALBEDO
 LOC_MAP_SPECULAR = ShaderLocationIndex.LOC_MAP_METALNESS
 
 
+# Shader uniform data type
+class ShaderUniformDataType(IntEnum):
+	SHADER_UNIFORM_FLOAT = 0
+	SHADER_UNIFORM_VEC2 = 1
+	SHADER_UNIFORM_VEC3 = 2
+	SHADER_UNIFORM_VEC4 = 3
+	SHADER_UNIFORM_INT = 4
+	SHADER_UNIFORM_IVEC2 = 5
+	SHADER_UNIFORM_IVEC3 = 6
+	SHADER_UNIFORM_IVEC4 = 7
+	SHADER_UNIFORM_SAMPLER2D = 8
+
+
+SHADER_UNIFORM_FLOAT = ShaderUniformDataType.SHADER_UNIFORM_FLOAT
+SHADER_UNIFORM_VEC2 = ShaderUniformDataType.SHADER_UNIFORM_VEC2
+SHADER_UNIFORM_VEC3 = ShaderUniformDataType.SHADER_UNIFORM_VEC3
+SHADER_UNIFORM_VEC4 = ShaderUniformDataType.SHADER_UNIFORM_VEC4
+SHADER_UNIFORM_INT = ShaderUniformDataType.SHADER_UNIFORM_INT
+SHADER_UNIFORM_IVEC2 = ShaderUniformDataType.SHADER_UNIFORM_IVEC2
+SHADER_UNIFORM_IVEC3 = ShaderUniformDataType.SHADER_UNIFORM_IVEC3
+SHADER_UNIFORM_IVEC4 = ShaderUniformDataType.SHADER_UNIFORM_IVEC4
+SHADER_UNIFORM_SAMPLER2D = ShaderUniformDataType.SHADER_UNIFORM_SAMPLER2D
+
+
 # Material map type
 class TexmapIndex(IntEnum):
 	MAP_ALBEDO = 0
@@ -2267,6 +2550,20 @@ COMPRESSED_PVRT_RGBA = PixelFormat.COMPRESSED_PVRT_RGBA
 COMPRESSED_ASTC_4x4_RGBA = PixelFormat.COMPRESSED_ASTC_4x4_RGBA
 COMPRESSED_ASTC_8x8_RGBA = PixelFormat.COMPRESSED_ASTC_8x8_RGBA
 
+# NumPy dtype and channel count of every uncompressed pixel format
+_PIXEL_LAYOUTS = {
+	PixelFormat.UNCOMPRESSED_GRAYSCALE: ('uint8', 1),
+	PixelFormat.UNCOMPRESSED_GRAY_ALPHA: ('uint8', 2),
+	PixelFormat.UNCOMPRESSED_R5G6B5: ('uint16', 1),
+	PixelFormat.UNCOMPRESSED_R8G8B8: ('uint8', 3),
+	PixelFormat.UNCOMPRESSED_R5G5B5A1: ('uint16', 1),
+	PixelFormat.UNCOMPRESSED_R4G4B4A4: ('uint16', 1),
+	PixelFormat.UNCOMPRESSED_R8G8B8A8: ('uint8', 4),
+	PixelFormat.UNCOMPRESSED_R32: ('float32', 1),
+	PixelFormat.UNCOMPRESSED_R32G32B32: ('float32', 3),
+	PixelFormat.UNCOMPRESSED_R32G32B32A32: ('float32', 4),
+}
+
 
 class TextureFilterMode(IntEnum):
 	FILTER_POINT = 0
@@ -2378,7 +2675,11 @@ _rl.InitWindow.argtypes = [Int, Int, CharPtr]
 _rl.InitWindow.restype = None
 def init_window(width: int, height: int, title: AnyStr) -> None:
 	"""Initialize window and OpenGL context"""
-	return _rl.InitWindow(_int(width), _int(height), _str_in(title))
+	_measure_cache.clear()
+	_glyph_tables.clear()
+	_rl.InitWindow(_int(width), _int(height), _str_in(title))
+	if _rl.IsWindowReady():
+		_install_default_render_batch()
 
 
 def init_window_v(size: Union[Vector2, Seq], title: AnyStr) -> None:
@@ -2391,6 +2692,10 @@ _rl.CloseWindow.argtypes = _NOARGS
 _rl.CloseWindow.restype = None
 def close_window() -> None:
 	"""Close window and unload OpenGL context"""
+	_measure_cache.clear()
+	_glyph_tables.clear()
+	_release_quad_stream()
+	_release_default_render_batch()
 	return _rl.CloseWindow()
 
 
@@ -2537,13 +2842,16 @@ _rl.EndDrawing.argtypes = _NOARGS
 _rl.EndDrawing.restype = None
 def end_drawing() -> None:
 	"""End canvas drawing and swap buffers (double buffering)"""
-	return _rl.EndDrawing()
+	_sample_render_batch(_render_batch_frame)
+	_rl.EndDrawing()
+	_next_render_batch_frame()
 
 
 _rl.BeginMode2D.argtypes = [Camera2D]
 _rl.BeginMode2D.restype = None
 def begin_mode2d(camera: Camera2D) -> None:
 	"""Initialize 2D mode with custom camera (2D)"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.BeginMode2D(camera)
 
 
@@ -2551,6 +2859,7 @@ _rl.EndMode2D.argtypes = _NOARGS
 _rl.EndMode2D.restype = None
 def end_mode2d() -> None:
 	"""Ends 2D mode with custom camera"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.EndMode2D()
 
 
@@ -2558,6 +2867,7 @@ _rl.BeginMode3D.argtypes = [Camera3D]
 _rl.BeginMode3D.restype = None
 def begin_mode3d(camera: Camera3D) -> None:
 	"""Initializes 3D mode with custom camera (3D)"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.BeginMode3D(camera)
 
 
@@ -2565,6 +2875,7 @@ _rl.EndMode3D.argtypes = _NOARGS
 _rl.EndMode3D.restype = None
 def end_mode3d() -> None:
 	"""Ends 3D mode and returns to default 2D orthographic mode"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.EndMode3D()
 
 
@@ -2572,6 +2883,7 @@ _rl.BeginTextureMode.argtypes = [RenderTexture2D]
 _rl.BeginTextureMode.restype = None
 def begin_texture_mode(target: RenderTexture2D) -> None:
 	"""Initializes render texture for drawing"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.BeginTextureMode(target)
 
 
@@ -2579,6 +2891,7 @@ _rl.EndTextureMode.argtypes = _NOARGS
 _rl.EndTextureMode.restype = None
 def end_texture_mode() -> None:
 	"""Ends drawing to render texture"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.EndTextureMode()
 
 
@@ -2768,6 +3081,20 @@ def clear_dropped_files() -> None:
 	return _rl.ClearDroppedFiles()
 
 
+_rl.MemAlloc.argtypes = [Int]
+_rl.MemAlloc.restype = VoidPtr
+def mem_alloc(size: int) -> int:
+	"""Internal memory allocator (memory owned by raylib)"""
+	return _rl.MemAlloc(_int(size))
+
+
+_rl.MemFree.argtypes = [VoidPtr]
+_rl.MemFree.restype = None
+def mem_free(ptr: Union[int, VoidPtr]) -> None:
+	"""Internal memory free"""
+	return _rl.MemFree(ptr)
+
+
 
 
 #------------------------------------------------------------------------------------
@@ -3254,11 +3581,77 @@ def load_image_raw(file_name: AnyStr, width: int, height: int, img_format: Union
 	return _rl.LoadImageRaw(_str_in(file_name), _int(width), _int(height), _int(img_format), _int(header_size))
 
 
-_rl.ExportImage.argtypes = [CharPtr, Image]
-_rl.ExportImage.restype = None
-def export_image(file_name: AnyStr, image: Image) -> None:
-	"""Export image as a PNG file"""
-	return _rl.ExportImage(_str_in(file_name), image)
+_rl.LoadImageAnim.argtypes = [CharPtr, IntPtr]
+_rl.LoadImageAnim.restype = Image
+def load_image_anim(file_name: AnyStr) -> Tuple[Image, int]:
+	"""Load image sequence from file (frames appended to image.data), returns the image and the frame count"""
+	frames = Int()
+	image = _rl.LoadImageAnim(_str_in(file_name), byref(frames))
+	return image, frames.value
+
+
+_rl.LoadImageFromMemory.argtypes = [CharPtr, VoidPtr, Int]
+_rl.LoadImageFromMemory.restype = Image
+def load_image_from_memory(file_type: AnyStr, file_data: Union[bytes, bytearray, memoryview]) -> Image:
+	"""Load image from memory buffer, file_type refers to extension: i.e. '.png'"""
+	address, size, owner = _pixel_buffer(file_data)
+	return _rl.LoadImageFromMemory(_str_in(file_type), address, size)
+
+
+_rl.LoadImageFromScreen.argtypes = _NOARGS
+_rl.LoadImageFromScreen.restype = Image
+def load_image_from_screen() -> Image:
+	"""Load image from screen buffer (screenshot, UNCOMPRESSED_R8G8B8A8)"""
+	return _rl.LoadImageFromScreen()
+
+
+def image_from_array(array: 'numpy.ndarray', pxl_format: Optional[Union[int, PixelFormat]]=None, copy: bool=True) -> Image:
+	"""
+	Create an Image from a (height, width[, channels]) NumPy array.
+
+	The pixel format is deduced from dtype and channels (uint8 1-4, float32 1/3/4);
+	uint16 data needs an explicit packed pxl_format. With copy=True the pixels are
+	copied into raylib memory and the image behaves like any loaded one. With
+	copy=False the image points into the array itself (which must be C-contiguous):
+	keep the array alive, never unload_image() it and only use image_* functions
+	that do not reallocate the data.
+	"""
+	import numpy as np
+
+	if array.ndim == 2:
+		array = array[:, :, np.newaxis]
+	if array.ndim != 3:
+		raise ValueError("Expected a (height, width[, channels]) array, not {} dimensions.".format(array.ndim))
+	height, width, channels = array.shape
+
+	if pxl_format is None:
+		for candidate, layout in _PIXEL_LAYOUTS.items():
+			if layout == (array.dtype.name, channels) and array.dtype.name != 'uint16':
+				pxl_format = candidate
+				break
+		else:
+			raise ValueError("Cannot deduce a pixel format for {} data with {} channels.".format(array.dtype.name, channels))
+	elif _PIXEL_LAYOUTS.get(pxl_format) != (array.dtype.name, channels):
+		raise ValueError("Array of {} x {} does not match pixel format {}.".format(array.dtype.name, channels, int(pxl_format)))
+
+	if copy:
+		array = np.ascontiguousarray(array)
+		data = mem_alloc(array.nbytes)
+		memmove(data, array.ctypes.data, array.nbytes)
+		return Image(data, width, height, 1, _int(pxl_format))
+
+	if not array.flags['C_CONTIGUOUS']:
+		raise ValueError("Zero-copy images need a C-contiguous array.")
+	image = Image(array.ctypes.data, width, height, 1, _int(pxl_format))
+	image._array = array  # keeps the memory alive as long as this Python object
+	return image
+
+
+_rl.ExportImage.argtypes = [Image, CharPtr]
+_rl.ExportImage.restype = Bool
+def export_image(file_name: AnyStr, image: Image) -> bool:
+	"""Export image data to file (format from extension), returns true on success"""
+	return _rl.ExportImage(image, _str_in(file_name))
 
 
 _rl.LoadTexture.argtypes = [CharPtr]
@@ -3312,12 +3705,199 @@ def get_pixel_data_size(width: int, height: int, pxl_format: Union[int, PixelFor
 	return _rl.GetPixelDataSize(_int(width), _int(height), _int(pxl_format))
 
 
+_rl.LoadImageColors.argtypes = [Image]
+_rl.LoadImageColors.restype = ColorPtr
+_rl.UnloadImageColors.argtypes = [ColorPtr]
+_rl.UnloadImageColors.restype = None
+def load_image_colors(image: Image) -> 'numpy.ndarray':
+	"""Load color data from image as a (height, width, 4) RGBA uint8 array (any pixel format)"""
+	import numpy as np
+
+	colors = _rl.LoadImageColors(image)
+	if not colors:
+		raise ValueError("Cannot read colors of image {}.".format(image))
+	try:
+		count = image.width * image.height * 4
+		buffer = (c_ubyte * count).from_address(addressof(colors.contents))
+		return np.frombuffer(buffer, dtype=np.uint8).reshape(image.height, image.width, 4).copy()
+	finally:
+		_rl.UnloadImageColors(colors)
+
+
+_rl.LoadImagePalette.argtypes = [Image, Int, IntPtr]
+_rl.LoadImagePalette.restype = ColorPtr
+_rl.UnloadImagePalette.argtypes = [ColorPtr]
+_rl.UnloadImagePalette.restype = None
+def load_image_palette(image: Image, max_palette_size: int=256) -> 'numpy.ndarray':
+	"""Load colors palette from image as a (count, 4) RGBA uint8 array (at most max_palette_size colors)"""
+	import numpy as np
+
+	count = Int(0)
+	palette = _rl.LoadImagePalette(image, _int(max_palette_size), byref(count))
+	if not palette:
+		return np.zeros((0, 4), dtype=np.uint8)
+	try:
+		buffer = (c_ubyte * (count.value * 4)).from_address(addressof(palette.contents))
+		return np.frombuffer(buffer, dtype=np.uint8).reshape(count.value, 4).copy()
+	finally:
+		_rl.UnloadImagePalette(palette)
+
+
+_rl.GetImageColor.argtypes = [Image, Int, Int]
+_rl.GetImageColor.restype = Color
+def get_image_color(image: Image, x: int, y: int) -> Color:
+	"""Get image pixel color at (x, y) position"""
+	return _rl.GetImageColor(image, _int(x), _int(y))
+
+
+def get_image_colors(image: Image, points: Union['numpy.ndarray', Sequence[Seq]]) -> 'numpy.ndarray':
+	"""Get the RGBA colors at many (x, y) positions at once, as a (n, 4) uint8 array"""
+	import numpy as np
+
+	points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+	if (points < 0).any() or (points[:, 0] >= image.width).any() or (points[:, 1] >= image.height).any():
+		raise ValueError("Points outside of the {}x{} image.".format(image.width, image.height))
+	if image.format == PixelFormat.UNCOMPRESSED_R8G8B8A8:
+		colors = image.as_array()
+	else:
+		colors = load_image_colors(image)
+	return colors[points[:, 1], points[:, 0]]
+
+
+_rl.GetImageAlphaBorder.argtypes = [Image, Float]
+_rl.GetImageAlphaBorder.restype = Rectangle
+def get_image_alpha_border(image: Image, threshold: float) -> Rectangle:
+	"""Get image alpha border rectangle"""
+	return _rl.GetImageAlphaBorder(image, _float(threshold))
+
+
+def _image_rgba(image: Image) -> 'numpy.ndarray':
+	# (n, 4) RGBA view (R8G8B8A8) or converted copy of the pixels
+	if image.format == PixelFormat.UNCOMPRESSED_R8G8B8A8:
+		return image.as_array().reshape(-1, 4)
+	return load_image_colors(image).reshape(-1, 4)
+
+
+def image_unique_colors(image: Image, max_count: Optional[int]=None) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+	"""
+	Distinct RGBA colors of an image and their pixel counts, most used first.
+
+	Unlike load_image_palette() the whole image is counted (vectorized) and
+	max_count only truncates the result.
+	"""
+	import numpy as np
+
+	packed = np.ascontiguousarray(_image_rgba(image)).view(np.uint32).ravel()
+	values, counts = np.unique(packed, return_counts=True)
+	order = np.argsort(-counts, kind='stable')[:max_count]
+	return values[order].view(np.uint8).reshape(-1, 4), counts[order]
+
+
+def image_histogram(image: Image, bins: int=256) -> 'numpy.ndarray':
+	"""Per channel (R, G, B, A) histograms of an image as a (4, bins) array"""
+	import numpy as np
+
+	rgba = _image_rgba(image)
+	if bins == 256:
+		indices = rgba.astype(np.intp)
+	else:
+		indices = (rgba.astype(np.intp) * bins) >> 8
+	# one bincount for all channels: channel c uses bins [c * bins, (c + 1) * bins)
+	indices = indices + np.arange(4) * bins
+	return np.bincount(indices.ravel(), minlength=4 * bins).reshape(4, bins)
+
+
+PixelBuffer = Union[VoidPtr, int, bytes, bytearray, memoryview, 'numpy.ndarray']
+
+
+def _pixel_buffer(pixels: PixelBuffer) -> Tuple[Optional[int], Optional[int], object]:
+	# Address, size in bytes (None when unknown) and owner of a pixel buffer.
+	# Only read-only buffers other than bytes need a copy to get an address.
+	if pixels is None or isinstance(pixels, int):
+		return pixels, None, None
+	if isinstance(pixels, VoidPtr):
+		return pixels.value, None, None
+	if isinstance(pixels, bytes):
+		return cast(pixels, VoidPtr).value, len(pixels), pixels
+	interface = getattr(pixels, '__array_interface__', None)
+	if interface is not None:
+		if not pixels.flags['C_CONTIGUOUS']:
+			raise ValueError("Pixel arrays must be C-contiguous.")
+		return interface['data'][0], pixels.nbytes, pixels
+	view = memoryview(pixels)
+	if not view.c_contiguous:
+		raise ValueError("Pixel buffers must be C-contiguous.")
+	if view.readonly:
+		buffer = (c_ubyte * view.nbytes).from_buffer_copy(view)
+	else:
+		buffer = (c_ubyte * view.nbytes).from_buffer(view.cast('B'))
+	return addressof(buffer), view.nbytes, buffer
+
+
+def _check_pixels(pixels: PixelBuffer, size: Optional[int], width: int, height: int, pxl_format: int) -> None:
+	expected = get_pixel_data_size(width, height, pxl_format)
+	if size is not None and size < expected:
+		raise ValueError("Pixel buffer too small: {} bytes for {}x{} format {} ({} needed).".format(
+			size, width, height, pxl_format, expected
+		))
+	shape = getattr(pixels, 'shape', None)
+	if shape is not None and len(shape) == 3:
+		layout = _PIXEL_LAYOUTS.get(pxl_format)
+		if tuple(shape[:2]) != (height, width) or (layout is not None and layout != (pixels.dtype.name, shape[2])):
+			raise ValueError("Array of shape {} ({}) does not match {}x{} format {}.".format(
+				tuple(shape), pixels.dtype.name, width, height, pxl_format
+			))
+
+
+def _check_region(texture: Texture2D, rec: Rectangle) -> Tuple[int, int, int, int]:
+	x, y, width, height = int(rec.x), int(rec.y), int(rec.width), int(rec.height)
+	if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > texture.width or y + height > texture.height:
+		raise ValueError("Region {} is outside of the {}x{} texture.".format(rec, texture.width, texture.height))
+	return x, y, width, height
+
 
 _rl.UpdateTexture.argtypes = [Texture2D, VoidPtr]
 _rl.UpdateTexture.restype = None
-def update_texture(texture: Texture2D, pixels: Union[VoidPtr, bytes]) -> None:
-	"""Update GPU texture with new data"""
-	return _rl.UpdateTexture(texture, pixels)
+def update_texture(texture: Texture2D, pixels: PixelBuffer) -> None:
+	"""Update GPU texture with new data (any C-contiguous buffer, not copied)"""
+	address, size, owner = _pixel_buffer(pixels)
+	_check_pixels(pixels, size, texture.width, texture.height, texture.format)
+	return _rl.UpdateTexture(texture, address)
+
+
+_rl.UpdateTextureRec.argtypes = [Texture2D, Rectangle, VoidPtr]
+_rl.UpdateTextureRec.restype = None
+def update_texture_rec(texture: Texture2D, rec: Union[Rectangle, Seq], pixels: PixelBuffer) -> None:
+	"""Update GPU texture rectangle with new data (pixels packed to the rectangle size)"""
+	rec = _rect(rec)
+	x, y, width, height = _check_region(texture, rec)
+	address, size, owner = _pixel_buffer(pixels)
+	_check_pixels(pixels, size, width, height, texture.format)
+	return _rl.UpdateTextureRec(texture, rec, address)
+
+
+def update_texture_regions(texture: Texture2D, pixels: PixelBuffer, recs: Sequence[Union[Rectangle, Seq]]) -> None:
+	"""Update only the dirty rectangles of a texture from a full-size frame buffer"""
+	address, size, owner = _pixel_buffer(pixels)
+	_check_pixels(pixels, size, texture.width, texture.height, texture.format)
+	frame_pitch = get_pixel_data_size(texture.width, 1, texture.format)
+	pixel_size = get_pixel_data_size(1, 1, texture.format)
+	scratch = None
+	for rec in recs:
+		rec = _rect(rec)
+		x, y, width, height = _check_region(texture, rec)
+		pitch = get_pixel_data_size(width, 1, texture.format)
+		if pitch == frame_pitch:
+			# full-width rows are already packed in the frame
+			_rl.UpdateTextureRec(texture, rec, address + y * frame_pitch)
+			continue
+		if scratch is None or len(scratch) < pitch * height:
+			scratch = (c_ubyte * (pitch * height))()
+		row = address + y * frame_pitch + x * pixel_size
+		for i in range(height):
+			memmove(addressof(scratch) + i * pitch, row, pitch)
+			row += frame_pitch
+		_rl.UpdateTextureRec(texture, rec, addressof(scratch))
 
 
 # Image manipulation functions
@@ -3328,6 +3908,13 @@ def image_copy(image: Image):
 	return _rl.ImageCopy(image)
 
 
+_rl.ImageFromImage.argtypes = [Image, Rectangle]
+_rl.ImageFromImage.restype = Image
+def image_from_image(image: Image, rec: Union[Rectangle, Seq]) -> Image:
+	"""Create an image from another image piece"""
+	return _rl.ImageFromImage(image, _rect(rec))
+
+
 _rl.ImageToPOT.argtypes = [ImagePtr, Color]
 _rl.ImageToPOT.restype = None
 def image_to_pot(image: Image, fill_color: Union[Color, Seq]) -> None:
@@ -3426,32 +4013,74 @@ def image_text_ex(font: Font, text: AnyStr, font_size: float, spacing: float, ti
 	return _rl.ImageTextEx(font, _str_in(text), _float(font_size), _float(spacing), _color(tint))
 
 
-_rl.ImageDraw.argtypes = [ImagePtr, Image, Rectangle, Rectangle]
+_rl.ImageDraw.argtypes = [ImagePtr, Image, Rectangle, Rectangle, Color]
 _rl.ImageDraw.restype = None
-def image_draw(dst: Image, src: Image, src_rec: Union[Rectangle, Seq], dst_rec: Union[Rectangle, Seq]) -> None:
-	"""Draw a source image within a destination image"""
-	return _rl.ImageDraw(dst, src, _rect(src_rec), _rect(dst_rec))
+def image_draw(dst: Image, src: Image, src_rec: Union[Rectangle, Seq], dst_rec: Union[Rectangle, Seq], tint: Union[Color, Seq]=WHITE) -> None:
+	"""Draw a source image within a destination image (tint applied to source)"""
+	return _rl.ImageDraw(dst, src, _rect(src_rec), _rect(dst_rec), _color(tint))
+
+
+_rl.ImageClearBackground.argtypes = [ImagePtr, Color]
+_rl.ImageClearBackground.restype = None
+def image_clear_background(dst: Image, color: Union[Color, Seq]) -> None:
+	"""Clear image background with given color"""
+	return _rl.ImageClearBackground(dst, _color(color))
+
 
+_rl.ImageDrawPixel.argtypes = [ImagePtr, Int, Int, Color]
+_rl.ImageDrawPixel.restype = None
+def image_draw_pixel(dst: Image, pos_x: int, pos_y: int, color: Union[Color, Seq]) -> None:
+	"""Draw pixel within an image"""
+	return _rl.ImageDrawPixel(dst, _int(pos_x), _int(pos_y), _color(color))
 
-_rl.ImageDrawRectangle.argtypes = [ImagePtr, Vector2, Rectangle, Color]
+
+_rl.ImageDrawLine.argtypes = [ImagePtr, Int, Int, Int, Int, Color]
+_rl.ImageDrawLine.restype = None
+def image_draw_line(dst: Image, start_pos_x: int, start_pos_y: int, end_pos_x: int, end_pos_y: int, color: Union[Color, Seq]) -> None:
+	"""Draw line within an image"""
+	return _rl.ImageDrawLine(dst, _int(start_pos_x), _int(start_pos_y), _int(end_pos_x), _int(end_pos_y), _color(color))
+
+
+_rl.ImageDrawCircle.argtypes = [ImagePtr, Int, Int, Int, Color]
+_rl.ImageDrawCircle.restype = None
+def image_draw_circle(dst: Image, center_x: int, center_y: int, radius: int, color: Union[Color, Seq]) -> None:
+	"""Draw circle within an image"""
+	return _rl.ImageDrawCircle(dst, _int(center_x), _int(center_y), _int(radius), _color(color))
+
+
+_rl.ImageDrawRectangle.argtypes = [ImagePtr, Int, Int, Int, Int, Color]
 _rl.ImageDrawRectangle.restype = None
-def image_draw_rectangle(dst: Image, position: Union[Vector2, Seq], rec: Union[Rectangle, Seq], color: Union[Color, Seq]) -> None:
+def image_draw_rectangle(dst: Image, pos_x: int, pos_y: int, width: int, height: int, color: Union[Color, Seq]) -> None:
+	"""Draw rectangle within an image"""
+	return _rl.ImageDrawRectangle(dst, _int(pos_x), _int(pos_y), _int(width), _int(height), _color(color))
+
+
+_rl.ImageDrawRectangleRec.argtypes = [ImagePtr, Rectangle, Color]
+_rl.ImageDrawRectangleRec.restype = None
+def image_draw_rectangle_rec(dst: Image, rec: Union[Rectangle, Seq], color: Union[Color, Seq]) -> None:
 	"""Draw rectangle within an image"""
-	return _rl.ImageDrawRectangle(dst, _vec2(position), _rect(rec), _color(color))
+	return _rl.ImageDrawRectangleRec(dst, _rect(rec), _color(color))
 
 
-_rl.ImageDrawText.argtypes = [ImagePtr, Vector2, CharPtr, Int, Color]
+_rl.ImageDrawRectangleLines.argtypes = [ImagePtr, Rectangle, Int, Color]
+_rl.ImageDrawRectangleLines.restype = None
+def image_draw_rectangle_lines(dst: Image, rec: Union[Rectangle, Seq], thick: int, color: Union[Color, Seq]) -> None:
+	"""Draw rectangle lines within an image"""
+	return _rl.ImageDrawRectangleLines(dst, _rect(rec), _int(thick), _color(color))
+
+
+_rl.ImageDrawText.argtypes = [ImagePtr, CharPtr, Int, Int, Int, Color]
 _rl.ImageDrawText.restype = None
-def image_draw_text(dst: Image, position: Union[Vector2, Seq], text: AnyStr, font_size: int, color: Union[Color, Seq]) -> None:
-	"""Draw text (default font) within an image (destination)"""
-	return _rl.ImageDrawText(dst, _vec2(position), _str_in(text), _int(font_size), _color(color))
+def image_draw_text(dst: Image, text: AnyStr, pos_x: int, pos_y: int, font_size: int, color: Union[Color, Seq]) -> None:
+	"""Draw text (using default font) within an image (destination)"""
+	return _rl.ImageDrawText(dst, _str_in(text), _int(pos_x), _int(pos_y), _int(font_size), _color(color))
 
 
-_rl.ImageDrawTextEx.argtypes = [ImagePtr, Vector2, Font, CharPtr, Float, Float, Color]
+_rl.ImageDrawTextEx.argtypes = [ImagePtr, Font, CharPtr, Vector2, Float, Float, Color]
 _rl.ImageDrawTextEx.restype = None
-def image_draw_text_ex(dst: Image, position: Union[Vector2, Seq], font: Font, text: AnyStr, font_size: float, spacing: float, color: Union[Color, Seq]) -> None:
+def image_draw_text_ex(dst: Image, font: Font, text: AnyStr, position: Union[Vector2, Seq], font_size: float, spacing: float, tint: Union[Color, Seq]) -> None:
 	"""Draw text (custom sprite font) within an image (destination)"""
-	return _rl.ImageDrawTextEx(dst, _vec2(position), font, _str_in(text), _float(font_size), _float(spacing), _color(color))
+	return _rl.ImageDrawTextEx(dst, font, _str_in(text), _vec2(position), _float(font_size), _float(spacing), _color(tint))
 
 
 _rl.ImageFlipVertical.argtypes = [ImagePtr]
@@ -3633,7 +4262,7 @@ _rl.DrawTextureNPatch.argtypes = [Texture2D, NPatchInfo, Rectangle, Vector2, Flo
 _rl.DrawTextureNPatch.restype = None
 def draw_texture_npatch(texture: Texture2D, npatch_info: NPatchInfo, dest_rec: Union[Rectangle, Seq], origin: Union[Vector2, Seq], rotation: float, tint: Union[Color, Seq]) -> None:
 	"""Draws a textures that stretches and shrinks nicely."""
-	return _rl.DrawNPatch(texture, npatch_info, _rect(dest_rec), _vec2(origin), _float(rotation), _color(tint))
+	return _rl.DrawTextureNPatch(texture, npatch_info, _rect(dest_rec), _vec2(origin), _float(rotation), _color(tint))
 
 # -----------------------------------------------------------------------------------
 # Font Loading and Text Drawing Functions (Module: text)
@@ -3654,31 +4283,68 @@ def load_font(file_name: AnyStr) -> Font:
 	return _rl.LoadFont(_str_in(file_name))
 
 
-_rl.LoadFontEx.argtypes = [CharPtr, Int, Int, IntPtr]
+def _font_chars(font_chars: Optional[Sequence[int]], chars_count: int) -> Tuple[Optional[IntPtr], int]:
+	# NULL and 0 make raylib use the default ASCII set
+	if font_chars is None:
+		return None, _int(chars_count)
+	if not isinstance(font_chars, Array):
+		font_chars = (Int * len(font_chars))(*font_chars)
+	return font_chars, _int(chars_count) or len(font_chars)
+
+
+_rl.LoadFontEx.argtypes = [CharPtr, Int, IntPtr, Int]
 _rl.LoadFontEx.restype = Font
-def load_font_ex(file_name: AnyStr, font_size: int, chars_count: int, font_chars: int) -> Font:
+def load_font_ex(file_name: AnyStr, font_size: int, chars_count: int=0, font_chars: Optional[Sequence[int]]=None) -> Font:
 	"""Load font from file with extended parameters"""
-	return _rl.LoadFontEx(_str_in(file_name), _int(font_size), _int(chars_count), _int(font_chars))
+	chars, count = _font_chars(font_chars, chars_count)
+	return _rl.LoadFontEx(_str_in(file_name), _int(font_size), chars, count)
 
 
-_rl.LoadFontData.argtypes = [CharPtr, Int, IntPtr, Int, Bool]
-_rl.LoadFontData.restype = CharInfoPtr
-def load_font_data(file_name: AnyStr, font_size: int, font_chars: int, chars_count: int, sdf: bool) -> CharInfoPtr:
-	"""Load font data for further use"""
-	return _rl.LoadFontData(_str_in(file_name), _int(font_size), font_chars, _int(chars_count), sdf)
+_rl.LoadFontFromMemory.argtypes = [CharPtr, VoidPtr, Int, Int, IntPtr, Int]
+_rl.LoadFontFromMemory.restype = Font
+def load_font_from_memory(file_type: AnyStr, file_data: Union[bytes, bytearray, memoryview], font_size: int, font_chars: Optional[Sequence[int]]=None) -> Font:
+	"""Load font from memory buffer, file_type refers to extension: i.e. '.ttf'"""
+	address, size, owner = _pixel_buffer(file_data)
+	chars, count = _font_chars(font_chars, 0)
+	return _rl.LoadFontFromMemory(_str_in(file_type), address, size, _int(font_size), chars, count)
 
 
-_rl.GenImageFontAtlas.argtypes = [CharInfoPtr, Int, Int, Int, Int]
+_FONT_DEFAULT = 0
+_FONT_SDF = 2
+
+_rl.LoadFontData.argtypes = [VoidPtr, Int, Int, IntPtr, Int, Int]
+_rl.LoadFontData.restype = GlyphInfoPtr
+def load_font_data(file_name: AnyStr, font_size: int, font_chars: Optional[Sequence[int]], chars_count: int, sdf: bool) -> GlyphInfoPtr:
+	"""Load font data for further use (glyph metrics and grayscale glyph images, no GPU needed)"""
+	with open(_str_out(file_name), 'rb') as f:
+		data = f.read()
+	chars, count = _font_chars(font_chars, chars_count)
+	return _rl.LoadFontData(data, len(data), _int(font_size), chars, count, _FONT_SDF if sdf else _FONT_DEFAULT)
+
+
+_rl.GenImageFontAtlas.argtypes = [GlyphInfoPtr, POINTER(RectanglePtr), Int, Int, Int, Int]
 _rl.GenImageFontAtlas.restype = Image
-def gen_image_font_atlas(chars: CharInfoPtr, font_size: int, chars_count: int, padding: int, pack_method: int) -> Image:
-	"""Generate image font atlas using chars info"""
-	return _rl.GenImageFontAtlas(chars, _int(font_size), _int(chars_count), _int(padding), _int(pack_method))
+def gen_image_font_atlas(chars: GlyphInfoPtr, font_size: int, chars_count: int, padding: int, pack_method: int) -> Tuple[Image, RectanglePtr]:
+	"""Generate image font atlas using chars info, returns the atlas and the glyph rectangles in it"""
+	recs = RectanglePtr()
+	image = _rl.GenImageFontAtlas(chars, byref(recs), _int(chars_count), _int(font_size), _int(padding), _int(pack_method))
+	return image, recs
+
+
+_rl.UnloadFontData.argtypes = [GlyphInfoPtr, Int]
+_rl.UnloadFontData.restype = None
+def unload_font_data(chars: GlyphInfoPtr, chars_count: int) -> None:
+	"""Unload font chars info data (RAM)"""
+	return _rl.UnloadFontData(chars, _int(chars_count))
 
 
 _rl.UnloadFont.argtypes = [Font]
 _rl.UnloadFont.restype = None
 def unload_font(font: Font) -> None:
 	"""Unload Font from GPU memory (VRAM)"""
+	# raylib reuses texture ids and glyph addresses: nothing keyed on them may outlive the font
+	_measure_cache.clear()
+	_glyph_tables.clear()
 	return _rl.UnloadFont(font)
 
 # Text drawing functions
@@ -3693,29 +4359,71 @@ _rl.DrawText.argtypes = [CharPtr, Int, Int, Int, Color]
 _rl.DrawText.restype = None
 def draw_text(text: AnyStr, pos_x: int, pos_y: int, font_size: int, color: Union[Color, Seq]) -> None:
 	"""Draw text (using default font)"""
-	return _rl.DrawText(_str_in(text), _int(pos_x), _int(pos_y), _int(font_size), _color(color))
+	return _rl.DrawText(_text_in(text), _int(pos_x), _int(pos_y), _int(font_size), _color(color))
 
 
 _rl.DrawTextEx.argtypes = [Font, CharPtr, Vector2, Float, Float, Color]
 _rl.DrawTextEx.restype = None
 def draw_text_ex(font: Font, text: AnyStr, position: Union[Vector2, Seq], font_size: float, spacing: float, tint: Union[Color, Seq]) -> None:
 	"""Draw text using font and additional parameters"""
-	return _rl.DrawTextEx(font, _str_in(text), position, _float(font_size), _float(spacing), _color(tint))
+	return _rl.DrawTextEx(font, _text_in(text), _vec2(position), _float(font_size), _float(spacing), _color(tint))
 
 
 # Text misc. functions
+_MEASURE_CACHE_SIZE = 1024
+_measure_cache = OrderedDict()
+_glyph_tables = {}  # font key -> textlayout.GlyphTable
+
+
+def _font_key(font: Font) -> tuple:
+	return font.texture.id, font.baseSize, font.glyphCount, cast(font.glyphs, VoidPtr).value
+
+
+def _measure_cache_put(key: tuple, value) -> None:
+	if len(_measure_cache) >= _MEASURE_CACHE_SIZE:
+		_measure_cache.popitem(last=False)
+	_measure_cache[key] = value
+
+
+def _forget_font(key: tuple) -> None:
+	# drop the measurements and glyph table of one font (by _font_key()), keep the others
+	for cached in [cached for cached in _measure_cache if cached[0] == key]:
+		del _measure_cache[cached]
+	_glyph_tables.pop(key, None)
+
+
+def clear_text_cache() -> None:
+	"""Clear cached text encodings and measurements"""
+	_text_cache.clear()
+	_measure_cache.clear()
+
+
 _rl.MeasureText.argtypes = [CharPtr, Int]
 _rl.MeasureText.restype = Int
 def measure_text(text: AnyStr, font_size: int) -> int:
 	"""Measure string width for default font"""
-	return _rl.MeasureText(_str_in(text), _int(font_size))
+	key = (None, text, font_size)
+	width = _measure_cache.get(key)
+	if width is None:
+		width = _rl.MeasureText(_text_in(text), _int(font_size))
+		_measure_cache_put(key, width)
+	else:
+		_measure_cache.move_to_end(key)
+	return width
 
 
 _rl.MeasureTextEx.argtypes = [Font, CharPtr, Float, Float]
 _rl.MeasureTextEx.restype = Vector2
 def measure_text_ex(font: Font, text: AnyStr, font_size: float, spacing: float) -> Vector2:
 	"""Measure string size for Font"""
-	return _rl.MeasureTextEx(font, _str_in(text), _float(font_size), _float(spacing))
+	key = (_font_key(font), text, font_size, spacing)
+	size = _measure_cache.get(key)
+	if size is None:
+		size = tuple(_rl.MeasureTextEx(font, _text_in(text), _float(font_size), _float(spacing)))
+		_measure_cache_put(key, size)
+	else:
+		_measure_cache.move_to_end(key)
+	return Vector2(size)
 
 
 _rl.TextFormat.argtypes = [CharPtr]
@@ -3738,10 +4446,28 @@ def get_glyph_index(font: Font, character: int) -> int:
 	"""Get index position for a unicode character on font"""
 	return _rl.GetGlyphIndex(font, _int(character))
 
+
+_rl.LoadCodepoints.argtypes = [CharPtr, IntPtr]
+_rl.LoadCodepoints.restype = IntPtr
+_rl.UnloadCodepoints.argtypes = [IntPtr]
+_rl.UnloadCodepoints.restype = None
+def load_codepoints(text: AnyStr) -> List[int]:
+	"""Get all codepoints of a UTF-8 text string"""
+	if not text:
+		# LoadCodepoints() hands back an already released buffer for empty strings
+		return []
+	count = Int(0)
+	result = _rl.LoadCodepoints(_text_in(text), byref(count))
+	codepoints = result[:count.value]
+	_rl.UnloadCodepoints(result)
+	return codepoints
+
+
 _rl.BeginBlendMode.argtypes = [Int]
 _rl.BeginBlendMode.restype = None
 def begin_blend_mode(mode: Union[int, BlendMode]) -> None:
 	"""Begin blending mode (alpha, additive, multiplied)"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.BeginBlendMode(_int(mode))
 
 
@@ -3749,14 +4475,601 @@ _rl.EndBlendMode.argtypes = _NOARGS
 _rl.EndBlendMode.restype = None
 def end_blend_mode() -> None:
 	"""End blending mode (reset to default: alpha blending)"""
+	_sample_render_batch(_render_batch_frame)
 	return _rl.EndBlendMode()
 
 
 
+# -----------------------------------------------------------------------------------
+# Render Batch Functions (Module: rlgl)
+# -----------------------------------------------------------------------------------
+
+class RenderBatchStats(object):
+	"""Per-frame counters gathered from the active render batch before it is flushed."""
+
+	def __init__(self) -> None:
+		self.flushes = 0
+		self.draw_calls = 0
+		self.vertices = 0
+		self.texture_binds = 0
+		self.texture_ids = set()
+
+	@property
+	def textures(self) -> int:
+		"""Number of distinct textures drawn."""
+		return len(self.texture_ids)
+
+	def merge(self, other: 'RenderBatchStats') -> None:
+		"""Add the counters of other to this one."""
+		self.flushes += other.flushes
+		self.draw_calls += other.draw_calls
+		self.vertices += other.vertices
+		self.texture_binds += other.texture_binds
+		self.texture_ids |= other.texture_ids
+
+	def __str__(self) -> str:
+		return "(RENDERBATCHSTATS: flushes: {}, draw_calls: {}, vertices: {}, texture_binds: {}, textures: {})".format(
+			self.flushes, self.draw_calls, self.vertices, self.texture_binds, self.textures
+		)
+
+
+_active_render_batch = None
+_default_render_batch = None
+_render_batch_frame = RenderBatchStats()
+_render_batch_last = RenderBatchStats()
+
+
+def _sample_render_batch(stats: RenderBatchStats, batch: Optional[RenderBatch]=None) -> None:
+	# rlgl keeps no counters of its own, so the pending draw calls of a batch
+	# are read right before raylib flushes it. Flushes raylib triggers by itself
+	# inside a draw call (batch full, DEFAULT_BATCH_DRAWCALLS reached) are not
+	# seen: their draw calls are lost from the counters.
+	batch = _active_render_batch if batch is None else batch
+	if batch is None:
+		return
+	last_texture = None
+	draw_calls = 0
+	for i in range(batch.drawCounter):
+		draw = batch.draws[i]
+		if draw.vertexCount <= 0:
+			continue
+		draw_calls += 1
+		stats.vertices += draw.vertexCount
+		if draw.textureId != last_texture:
+			stats.texture_binds += 1
+			last_texture = draw.textureId
+		stats.texture_ids.add(draw.textureId)
+	if draw_calls:
+		stats.draw_calls += draw_calls
+		stats.flushes += 1
+
+
+def _next_render_batch_frame() -> None:
+	global _render_batch_frame, _render_batch_last
+	_render_batch_last = _render_batch_frame
+	_render_batch_frame = RenderBatchStats()
+
+
+def _install_default_render_batch() -> None:
+	global _default_render_batch, _active_render_batch
+	# rlgl does not expose its internal batch, so init_window() makes a batch of
+	# the same size owned here the default one: its draw calls can then be sampled
+	_default_render_batch = _rl.rlLoadRenderBatch(DEFAULT_BATCH_BUFFERS, DEFAULT_BATCH_BUFFER_ELEMENTS)
+	_active_render_batch = _default_render_batch
+	_rl.rlSetRenderBatchActive(byref(_default_render_batch))
+
+
+def _release_default_render_batch() -> None:
+	global _default_render_batch, _active_render_batch
+	if _default_render_batch is None:
+		return
+	_sample_render_batch(_render_batch_frame)
+	_rl.rlSetRenderBatchActive(None)
+	_rl.rlUnloadRenderBatch(_default_render_batch)
+	_default_render_batch = None
+	_active_render_batch = None
+
+
+_rl.rlLoadRenderBatch.argtypes = [Int, Int]
+_rl.rlLoadRenderBatch.restype = RenderBatch
+def load_render_batch(num_buffers: int=DEFAULT_BATCH_BUFFERS, buffer_elements: int=DEFAULT_BATCH_BUFFER_ELEMENTS) -> RenderBatch:
+	"""Load a render batch system (buffer_elements quads per buffer)"""
+	return _rl.rlLoadRenderBatch(_int(num_buffers), _int(buffer_elements))
+
+
+_rl.rlUnloadRenderBatch.argtypes = [RenderBatch]
+_rl.rlUnloadRenderBatch.restype = None
+def unload_render_batch(batch: RenderBatch) -> None:
+	"""Unload render batch system"""
+	if batch is _default_render_batch:
+		raise ValueError("The default render batch is released by close_window().")
+	if batch is _active_render_batch:
+		set_render_batch_active(None)
+	return _rl.rlUnloadRenderBatch(batch)
+
+
+_rl.rlDrawRenderBatch.argtypes = [RenderBatchPtr]
+_rl.rlDrawRenderBatch.restype = None
+def draw_render_batch(batch: RenderBatch) -> None:
+	"""Draw render batch data (Update->Draw->Reset)"""
+	_sample_render_batch(_render_batch_frame, batch)
+	return _rl.rlDrawRenderBatch(byref(batch))
+
+
+_rl.rlSetRenderBatchActive.argtypes = [RenderBatchPtr]
+_rl.rlSetRenderBatchActive.restype = None
+def set_render_batch_active(batch: Optional[RenderBatch]) -> None:
+	"""Set the active render batch for rlgl (None for default)"""
+	global _active_render_batch
+	# rlgl flushes the previous batch before switching
+	_sample_render_batch(_render_batch_frame)
+	batch = _default_render_batch if batch is None else batch
+	# rlgl only stores the pointer, keep the struct alive while it is active
+	_active_render_batch = batch
+	return _rl.rlSetRenderBatchActive(byref(batch) if batch is not None else None)
+
+
+_rl.rlDrawRenderBatchActive.argtypes = _NOARGS
+_rl.rlDrawRenderBatchActive.restype = None
+def draw_render_batch_active() -> None:
+	"""Update and draw internal render batch"""
+	_sample_render_batch(_render_batch_frame)
+	return _rl.rlDrawRenderBatchActive()
+
+
+_rl.rlCheckRenderBatchLimit.argtypes = [Int]
+_rl.rlCheckRenderBatchLimit.restype = Bool
+def check_render_batch_limit(v_count: int) -> bool:
+	"""Check internal buffer overflow for a given number of vertex (flushes if needed)"""
+	pending = RenderBatchStats()
+	_sample_render_batch(pending)
+	overflow = _rl.rlCheckRenderBatchLimit(_int(v_count))
+	if overflow:
+		_render_batch_frame.merge(pending)
+	return overflow
+
+
+def get_render_batch_stats() -> RenderBatchStats:
+	"""Get draw statistics of the last frame (flushes raylib does inside its own draw calls are not counted)"""
+	return _render_batch_last
+
+
+def reset_render_batch_stats() -> None:
+	"""Reset render batch statistics"""
+	global _render_batch_frame, _render_batch_last
+	_render_batch_frame = RenderBatchStats()
+	_render_batch_last = RenderBatchStats()
+
+
+# Immediate-mode vertex submission
+_rl.rlBegin.argtypes = [Int]
+_rl.rlBegin.restype = None
+def rl_begin(mode: int) -> None:
+	"""Initialize drawing mode (how to organize vertex)"""
+	return _rl.rlBegin(_int(mode))
+
+
+_rl.rlEnd.argtypes = _NOARGS
+_rl.rlEnd.restype = None
+def rl_end() -> None:
+	"""Finish vertex providing"""
+	return _rl.rlEnd()
+
+
+_rl.rlVertex2f.argtypes = [Float, Float]
+_rl.rlVertex2f.restype = None
+def rl_vertex2f(x: float, y: float) -> None:
+	"""Define one vertex (position)"""
+	return _rl.rlVertex2f(_float(x), _float(y))
+
+
+_rl.rlTexCoord2f.argtypes = [Float, Float]
+_rl.rlTexCoord2f.restype = None
+def rl_tex_coord2f(x: float, y: float) -> None:
+	"""Define one vertex (texture coordinate)"""
+	return _rl.rlTexCoord2f(_float(x), _float(y))
+
+
+_rl.rlColor4ub.argtypes = [UChar, UChar, UChar, UChar]
+_rl.rlColor4ub.restype = None
+def rl_color4ub(r: int, g: int, b: int, a: int) -> None:
+	"""Define one vertex (color)"""
+	return _rl.rlColor4ub(_int(r), _int(g), _int(b), _int(a))
+
+
+_rl.rlSetTexture.argtypes = [UInt]
+_rl.rlSetTexture.restype = None
+def rl_set_texture(texture_id: int) -> None:
+	"""Set current texture for render batch and check buffers limits"""
+	return _rl.rlSetTexture(_int(texture_id))
+
+
+# Vertex arrays, shaders and matrices
+_rl.rlLoadVertexArray.argtypes = _NOARGS
+_rl.rlLoadVertexArray.restype = UInt
+def rl_load_vertex_array() -> int:
+	"""Load vertex array (vao) if supported"""
+	return _rl.rlLoadVertexArray()
+
+
+_rl.rlLoadVertexBuffer.argtypes = [VoidPtr, Int, Bool]
+_rl.rlLoadVertexBuffer.restype = UInt
+def rl_load_vertex_buffer(buffer: Optional[int], size: int, dynamic: bool) -> int:
+	"""Load a vertex buffer attribute (size in bytes, buffer may be None)"""
+	return _rl.rlLoadVertexBuffer(buffer, _int(size), dynamic)
+
+
+_rl.rlUpdateVertexBuffer.argtypes = [UInt, VoidPtr, Int, Int]
+_rl.rlUpdateVertexBuffer.restype = None
+def rl_update_vertex_buffer(buffer_id: int, data: int, data_size: int, offset: int) -> None:
+	"""Update GPU buffer with new data (data_size and offset in bytes)"""
+	return _rl.rlUpdateVertexBuffer(_int(buffer_id), data, _int(data_size), _int(offset))
+
+
+_rl.rlSetVertexAttribute.argtypes = [UInt, Int, Int, Bool, Int, VoidPtr]
+_rl.rlSetVertexAttribute.restype = None
+def rl_set_vertex_attribute(index: int, comp_size: int, data_type: int, normalized: bool, stride: int, pointer: Optional[int]) -> None:
+	"""Describe the layout of a vertex attribute in the bound vertex buffer"""
+	return _rl.rlSetVertexAttribute(_int(index), _int(comp_size), _int(data_type), normalized, _int(stride), pointer)
+
+
+_rl.rlEnableVertexAttribute.argtypes = [UInt]
+_rl.rlEnableVertexAttribute.restype = None
+def rl_enable_vertex_attribute(index: int) -> None:
+	"""Enable vertex attribute index"""
+	return _rl.rlEnableVertexAttribute(_int(index))
+
+
+_rl.rlEnableVertexArray.argtypes = [UInt]
+_rl.rlEnableVertexArray.restype = Bool
+def rl_enable_vertex_array(vao_id: int) -> bool:
+	"""Enable vertex array (VAO, if supported)"""
+	return _rl.rlEnableVertexArray(_int(vao_id))
+
+
+_rl.rlDisableVertexArray.argtypes = _NOARGS
+_rl.rlDisableVertexArray.restype = None
+def rl_disable_vertex_array() -> None:
+	"""Disable vertex array (VAO, if supported)"""
+	return _rl.rlDisableVertexArray()
+
+
+_rl.rlEnableVertexBuffer.argtypes = [UInt]
+_rl.rlEnableVertexBuffer.restype = None
+def rl_enable_vertex_buffer(id: int) -> None:
+	"""Enable vertex buffer (VBO)"""
+	return _rl.rlEnableVertexBuffer(_int(id))
+
+
+_rl.rlDisableVertexBuffer.argtypes = _NOARGS
+_rl.rlDisableVertexBuffer.restype = None
+def rl_disable_vertex_buffer() -> None:
+	"""Disable vertex buffer (VBO)"""
+	return _rl.rlDisableVertexBuffer()
+
+
+_rl.rlDrawVertexArray.argtypes = [Int, Int]
+_rl.rlDrawVertexArray.restype = None
+def rl_draw_vertex_array(offset: int, count: int) -> None:
+	"""Draw count vertices of the enabled vertex array as triangles"""
+	return _rl.rlDrawVertexArray(_int(offset), _int(count))
+
+
+_rl.rlUnloadVertexArray.argtypes = [UInt]
+_rl.rlUnloadVertexArray.restype = None
+def rl_unload_vertex_array(vao_id: int) -> None:
+	"""Unload vertex array (VAO)"""
+	return _rl.rlUnloadVertexArray(_int(vao_id))
+
+
+_rl.rlUnloadVertexBuffer.argtypes = [UInt]
+_rl.rlUnloadVertexBuffer.restype = None
+def rl_unload_vertex_buffer(vbo_id: int) -> None:
+	"""Unload vertex buffer (VBO)"""
+	return _rl.rlUnloadVertexBuffer(_int(vbo_id))
+
+
+_rl.rlEnableShader.argtypes = [UInt]
+_rl.rlEnableShader.restype = None
+def rl_enable_shader(id: int) -> None:
+	"""Enable shader program"""
+	return _rl.rlEnableShader(_int(id))
+
+
+_rl.rlDisableShader.argtypes = _NOARGS
+_rl.rlDisableShader.restype = None
+def rl_disable_shader() -> None:
+	"""Disable shader program"""
+	return _rl.rlDisableShader()
+
+
+_rl.rlGetShaderIdDefault.argtypes = _NOARGS
+_rl.rlGetShaderIdDefault.restype = UInt
+def rl_get_shader_id_default() -> int:
+	"""Get default shader id"""
+	return _rl.rlGetShaderIdDefault()
+
+
+_rl.rlGetShaderLocsDefault.argtypes = _NOARGS
+_rl.rlGetShaderLocsDefault.restype = IntPtr
+def rl_get_shader_locs_default() -> IntPtr:
+	"""Get default shader locations (indexed by ShaderLocationIndex)"""
+	return _rl.rlGetShaderLocsDefault()
+
+
+_rl.rlGetTextureIdDefault.argtypes = _NOARGS
+_rl.rlGetTextureIdDefault.restype = UInt
+def rl_get_texture_id_default() -> int:
+	"""Get default texture id (1x1 white pixel)"""
+	return _rl.rlGetTextureIdDefault()
+
+
+_rl.rlSetUniform.argtypes = [Int, VoidPtr, Int, Int]
+_rl.rlSetUniform.restype = None
+def rl_set_uniform(loc_index: int, value, uniform_type: Union[int, ShaderUniformDataType], count: int) -> None:
+	"""Set shader value uniform of the enabled shader"""
+	return _rl.rlSetUniform(_int(loc_index), value, _int(uniform_type), _int(count))
+
+
+_rl.rlSetUniformMatrix.argtypes = [Int, Matrix]
+_rl.rlSetUniformMatrix.restype = None
+def rl_set_uniform_matrix(loc_index: int, mat: Matrix) -> None:
+	"""Set shader value matrix of the enabled shader"""
+	return _rl.rlSetUniformMatrix(_int(loc_index), mat)
+
+
+_rl.rlGetMatrixModelview.argtypes = _NOARGS
+_rl.rlGetMatrixModelview.restype = Matrix
+def rl_get_matrix_modelview() -> Matrix:
+	"""Get internal modelview matrix"""
+	return _rl.rlGetMatrixModelview()
+
+
+_rl.rlGetMatrixProjection.argtypes = _NOARGS
+_rl.rlGetMatrixProjection.restype = Matrix
+def rl_get_matrix_projection() -> Matrix:
+	"""Get internal projection matrix"""
+	return _rl.rlGetMatrixProjection()
+
+
+_rl.rlGetMatrixTransform.argtypes = _NOARGS
+_rl.rlGetMatrixTransform.restype = Matrix
+def rl_get_matrix_transform() -> Matrix:
+	"""Get internal accumulated transform matrix (rl_push_matrix/rl_translatef... stack)"""
+	return _rl.rlGetMatrixTransform()
+
+
+_rl.rlActiveTextureSlot.argtypes = [Int]
+_rl.rlActiveTextureSlot.restype = None
+def rl_active_texture_slot(slot: int) -> None:
+	"""Select and active a texture slot"""
+	return _rl.rlActiveTextureSlot(_int(slot))
+
+
+_rl.rlEnableTexture.argtypes = [UInt]
+_rl.rlEnableTexture.restype = None
+def rl_enable_texture(id: int) -> None:
+	"""Enable texture"""
+	return _rl.rlEnableTexture(_int(id))
+
+
+_rl.rlDisableTexture.argtypes = _NOARGS
+_rl.rlDisableTexture.restype = None
+def rl_disable_texture() -> None:
+	"""Disable texture"""
+	return _rl.rlDisableTexture()
+
+
+def _matrix_array(mat: Matrix) -> 'numpy.ndarray':
+	# Matrix fields are stored row by row (m0, m4, m8, m12, m1...): the math layout
+	import numpy as np
+	return np.frombuffer(mat, dtype=np.float32).reshape(4, 4)
+
+
+def _array_matrix(array: 'numpy.ndarray') -> Matrix:
+	import numpy as np
+	return Matrix.from_buffer_copy(np.ascontiguousarray(array, dtype=np.float32))
+
+
+# quad corners as two counter-clockwise triangles (top left, bottom left, bottom right /
+# top left, bottom right, top right), 0 for the left or top edge and 1 for the other
+_QUAD_CORNERS_X = (0, 0, 1, 0, 1, 1)
+_QUAD_CORNERS_Y = (0, 1, 1, 0, 1, 0)
+
+
+class _QuadBuffer(object):
+	# GPU vertex array of up to capacity quads (positions, texcoords, colors buffers, six vertices each)
+	# drawn with the default shader, outside of the render batch.
+
+	POSITIONS = 0
+	TEXCOORDS = 1
+	COLORS = 2
+
+	def __init__(self, capacity: int) -> None:
+		self.capacity = capacity
+		locs = rl_get_shader_locs_default()
+		self._attributes = (
+			(locs[LOC_VERTEX_POSITION], 2, RL_FLOAT, False, capacity * 6 * 8),
+			(locs[LOC_VERTEX_TEXCOORD01], 2, RL_FLOAT, False, capacity * 6 * 8),
+			(locs[LOC_VERTEX_COLOR], 4, RL_UNSIGNED_BYTE, True, capacity * 6 * 4),
+		)
+		self.vao = rl_load_vertex_array()
+		rl_enable_vertex_array(self.vao)
+		self.vbos = []
+		for location, size, data_type, normalized, length in self._attributes:
+			self.vbos.append(rl_load_vertex_buffer(None, length, True))
+			rl_set_vertex_attribute(location, size, data_type, normalized, 0, None)
+			rl_enable_vertex_attribute(location)
+		rl_disable_vertex_array()
+		if not all(self.vbos):
+			self.unload()
+			raise ValueError("Cannot create quad vertex buffers (no window?).")
+
+	def update(self, index: int, array: 'numpy.ndarray', count: int) -> None:
+		# first count quads of a C-contiguous (quads, 6, components) array into buffer index
+		rl_update_vertex_buffer(self.vbos[index], array.ctypes.data, count * array.strides[0], 0)
+
+	def draw(self, texture_id: int, count: int) -> None:
+		# whatever the batch holds was drawn before these quads
+		draw_render_batch_active()
+		locs = rl_get_shader_locs_default()
+		rl_enable_shader(rl_get_shader_id_default())
+		mvp = _matrix_array(rl_get_matrix_projection()) @ _matrix_array(rl_get_matrix_modelview()) @ \
+			_matrix_array(rl_get_matrix_transform())
+		rl_set_uniform_matrix(locs[LOC_MATRIX_MVP], _array_matrix(mvp))
+		rl_set_uniform(locs[LOC_COLOR_DIFFUSE], (Float * 4)(1.0, 1.0, 1.0, 1.0), SHADER_UNIFORM_VEC4, 1)
+		rl_set_uniform(locs[LOC_MAP_DIFFUSE], byref(Int(0)), SHADER_UNIFORM_INT, 1)
+		rl_active_texture_slot(0)
+		rl_enable_texture(texture_id)
+		if not rl_enable_vertex_array(self.vao):
+			# no VAO support (OpenGL ES 2.0): bind the attributes for this draw
+			for vbo, (location, size, data_type, normalized, _) in zip(self.vbos, self._attributes):
+				rl_enable_vertex_buffer(vbo)
+				rl_set_vertex_attribute(location, size, data_type, normalized, 0, None)
+				rl_enable_vertex_attribute(location)
+		rl_draw_vertex_array(0, count * 6)
+		rl_disable_vertex_array()
+		rl_disable_vertex_buffer()
+		rl_disable_texture()
+		rl_disable_shader()
+
+		_render_batch_frame.flushes += 1
+		_render_batch_frame.draw_calls += 1
+		_render_batch_frame.vertices += count * 6
+		_render_batch_frame.texture_binds += 1
+		_render_batch_frame.texture_ids.add(texture_id)
+
+	def unload(self) -> None:
+		for vbo in self.vbos:
+			if vbo:
+				rl_unload_vertex_buffer(vbo)
+		self.vbos = []
+		if self.vao:
+			rl_unload_vertex_array(self.vao)
+		self.vao = 0
+
+
+_quad_stream = None
+
+
+def _stream_quads(count: int) -> _QuadBuffer:
+	# shared buffer of draw_texture_quads(), grown to the next power of two
+	global _quad_stream
+	if _quad_stream is None or _quad_stream.capacity < count:
+		capacity = 1024
+		while capacity < count:
+			capacity *= 2
+		_release_quad_stream()
+		_quad_stream = _QuadBuffer(capacity)
+	return _quad_stream
+
+
+def _release_quad_stream() -> None:
+	global _quad_stream
+	if _quad_stream is not None:
+		_quad_stream.unload()
+		_quad_stream = None
+
+
+def draw_texture_quads(texture: Texture2D, source_recs: Sequence[Seq], dest_recs: Sequence[Seq],
+					   tint: Union[Color, Seq]=WHITE, tints: Optional[Sequence[Seq]]=None) -> None:
+	"""Draw many parts of a texture as axis-aligned quads, with one vertex upload and one draw call"""
+	import numpy as np
+	source = np.asarray(source_recs, dtype=np.float32).reshape(-1, 4)
+	dest = np.asarray(dest_recs, dtype=np.float32).reshape(-1, 4)
+	count = len(dest)
+	if count == 0:
+		return
+
+	# left/right and top/bottom edges, picked per corner
+	edges = np.empty((2, count, 2), dtype=np.float32)
+	edges[0, :, 0] = dest[:, 0]
+	np.add(dest[:, 0], dest[:, 2], out=edges[0, :, 1])
+	edges[1, :, 0] = dest[:, 1]
+	np.add(dest[:, 1], dest[:, 3], out=edges[1, :, 1])
+	vertices = np.empty((count, 6, 2), dtype=np.float32)
+	vertices[:, :, 0] = edges[0][:, _QUAD_CORNERS_X]
+	vertices[:, :, 1] = edges[1][:, _QUAD_CORNERS_Y]
+
+	edges[0, :, 0] = source[:, 0]
+	np.add(source[:, 0], source[:, 2], out=edges[0, :, 1])
+	edges[0] *= 1.0 / texture.width
+	edges[1, :, 0] = source[:, 1]
+	np.add(source[:, 1], source[:, 3], out=edges[1, :, 1])
+	edges[1] *= 1.0 / texture.height
+	texcoords = np.empty((count, 6, 2), dtype=np.float32)
+	texcoords[:, :, 0] = edges[0][:, _QUAD_CORNERS_X]
+	texcoords[:, :, 1] = edges[1][:, _QUAD_CORNERS_Y]
+
+	colors = np.empty((count, 6, 4), dtype=np.uint8)
+	if tints is None:
+		tint = tint if isinstance(tint, Color) else Color(*tint)
+		colors[:] = (tint.r, tint.g, tint.b, tint.a)
+	else:
+		colors[:] = np.asarray(tints, dtype=np.uint8).reshape(count, 1, 4)
+
+	stream = _stream_quads(count)
+	stream.update(_QuadBuffer.POSITIONS, vertices, count)
+	stream.update(_QuadBuffer.TEXCOORDS, texcoords, count)
+	stream.update(_QuadBuffer.COLORS, colors, count)
+	stream.draw(texture.id, count)
+
+
+
 # -----------------------------------------------------------------------------------
 # Audio Loading and Playing Functions (Module: audio)
 # -----------------------------------------------------------------------------------
 
+# Wave/Sound loading/unloading functions
+_rl.LoadWave.argtypes = [CharPtr]
+_rl.LoadWave.restype = Wave
+def load_wave(file_name: AnyStr) -> Wave:
+	"""Load wave data from file"""
+	return _rl.LoadWave(_str_in(file_name))
+
+
+_rl.LoadWaveFromMemory.argtypes = [CharPtr, VoidPtr, Int]
+_rl.LoadWaveFromMemory.restype = Wave
+def load_wave_from_memory(file_type: AnyStr, file_data: Union[bytes, bytearray, memoryview]) -> Wave:
+	"""Load wave from memory buffer, file_type refers to extension: i.e. '.wav'"""
+	address, size, owner = _pixel_buffer(file_data)
+	return _rl.LoadWaveFromMemory(_str_in(file_type), address, size)
+
+
+_rl.UnloadWave.argtypes = [Wave]
+_rl.UnloadWave.restype = None
+def unload_wave(wave: Wave) -> None:
+	"""Unload wave data"""
+	return _rl.UnloadWave(wave)
+
+
+# Music management functions
+_rl.LoadMusicStream.argtypes = [CharPtr]
+_rl.LoadMusicStream.restype = Music
+def load_music_stream(file_name: AnyStr) -> Music:
+	"""Load music stream from file"""
+	return _rl.LoadMusicStream(_str_in(file_name))
+
+
+_rl.LoadMusicStreamFromMemory.argtypes = [CharPtr, VoidPtr, Int]
+_rl.LoadMusicStreamFromMemory.restype = Music
+def load_music_stream_from_memory(file_type: AnyStr, data: Union[bytes, bytearray, memoryview]) -> Music:
+	"""Load music stream from data (streamed from it, so the buffer is kept alive by the Music)"""
+	address, size, owner = _pixel_buffer(data)
+	music = _rl.LoadMusicStreamFromMemory(_str_in(file_type), address, size)
+	if music.ctxData:
+		music._data = owner
+	return music
+
+
+_rl.UnloadMusicStream.argtypes = [Music]
+_rl.UnloadMusicStream.restype = None
+def unload_music_stream(music: Music) -> None:
+	"""Unload music stream (and release the buffer it was streamed from)"""
+	_rl.UnloadMusicStream(music)
+	# the buffer may export a mapping (AssetPack) that cannot close while it is held
+	music._data = None
+
 
 
 # -----------------------------------------------------------------------------------
@@ -0,0 +1,300 @@
+# animtexture.py
+
+#   Animated textures from GIF files
+#
+#   load_image_anim() returns every frame of a GIF stacked in one image. An
+#   AnimatedTexture uploads the frames once and plays them with the GIF frame
+#   delays, in one of two ways:
+#
+#   - atlas: all frames in one texture (a grid when a single column would
+#     exceed max_texture_size); changing frame only changes the source
+#     rectangle, so playback costs no CPU or bus traffic at all
+#   - stream: a single-frame texture refreshed with update_texture() from the
+#     frames kept in RAM, only when the displayed frame changes
+#
+#   By default the atlas is used when it fits atlas_budget (VRAM bytes) and
+#   the texture size limit, streaming otherwise, as long as the frames kept in
+#   RAM fit ram_budget (no limit by default).
+#
+#   Example:
+#
+#   sticker = load_animated_texture("resources/sticker.gif")
+#   ...
+#   sticker.update()                              # advances by get_frame_time()
+#   sticker.draw((100, 100))
+#   # hundreds of copies with their own clocks, one batched draw (atlas mode)
+#   sticker.draw_many(positions, start_times - get_time())
+#   ...
+#   sticker.unload()
+#
+#   load_gif_frames() works without a window and also returns the delays,
+#   which load_image_anim() drops.
+
+import os
+from ctypes import POINTER, byref, c_int, c_void_p, cast
+from typing import AnyStr, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import (
+    WHITE,
+    Color,
+    Image,
+    PixelFormat,
+    Rectangle,
+    Seq,
+    Vector2,
+    draw_texture_pro,
+    draw_texture_quads,
+    draw_texture_rec,
+    get_frame_time,
+    get_pixel_data_size,
+    image_format,
+    image_from_array,
+    load_image_anim,
+    load_texture_from_image,
+    mem_free,
+    unload_image,
+    unload_texture,
+    update_texture,
+    _rl,
+    _str_out,
+)
+
+__all__ = [
+    'ANIM_ATLAS',
+    'ANIM_STREAM',
+    'load_gif_frames',
+    'AnimatedTexture',
+    'load_animated_texture',
+]
+
+ANIM_ATLAS = 'atlas'
+ANIM_STREAM = 'stream'
+
+_DEFAULT_DELAY = 0.1  # seconds, GIFs without (or with zero) frame delays
+_MIN_DELAY = 0.02  # browsers treat smaller GIF delays as 0.1 s, 0.02 s is the shortest honoured
+
+# stb_image as compiled into raylib: allocations go through RL_MALLOC, so
+# pixels are released by unload_image() and delays by mem_free()
+_rl.stbi_load_gif_from_memory.argtypes = [c_void_p, c_int, POINTER(POINTER(c_int)), POINTER(c_int),
+                                          POINTER(c_int), POINTER(c_int), POINTER(c_int), c_int]
+_rl.stbi_load_gif_from_memory.restype = c_void_p
+
+
+def load_gif_frames(file_name: AnyStr) -> Tuple[Image, np.ndarray]:
+    """
+    Load all frames of a GIF, stacked vertically in one R8G8B8A8 Image, and their delays in seconds.
+
+    The image height is frame height times frame count. Other image files give
+    a single frame (load_image_anim()).
+    """
+    file_name = _str_out(file_name)
+    if os.path.splitext(file_name)[1].lower() != '.gif':
+        image, frames = load_image_anim(file_name)
+        if not image.data:
+            raise ValueError("Cannot load image '{}'.".format(file_name))
+        image_format(image, PixelFormat.UNCOMPRESSED_R8G8B8A8)
+        return image, np.full(max(frames, 1), _DEFAULT_DELAY)
+
+    with open(file_name, 'rb') as f:
+        data = f.read()
+    delays = POINTER(c_int)()
+    width, height, frames, channels = c_int(), c_int(), c_int(), c_int()
+    pixels = _rl.stbi_load_gif_from_memory(data, len(data), byref(delays), byref(width), byref(height),
+                                           byref(frames), byref(channels), 4)
+    if not pixels:
+        raise ValueError("Cannot load GIF '{}'.".format(file_name))
+    count = frames.value
+    if delays:
+        milliseconds = np.ctypeslib.as_array(delays, shape=(count,)).astype(np.float64)
+        mem_free(cast(delays, c_void_p))
+        seconds = np.where(milliseconds > 0, np.maximum(milliseconds / 1000.0, _MIN_DELAY), _DEFAULT_DELAY)
+    else:
+        seconds = np.full(count, _DEFAULT_DELAY)
+    image = Image(pixels, width.value, height.value * count, 1, PixelFormat.UNCOMPRESSED_R8G8B8A8)
+    return image, seconds
+
+
+def _atlas_grid(frames: int, width: int, height: int, max_texture_size: int) -> Optional[Tuple[int, int]]:
+    # (columns, rows) of the frame grid, None when the frames cannot fit
+    rows = min(frames, max_texture_size // height) if height <= max_texture_size else 0
+    if rows == 0:
+        return None
+    columns = -(-frames // rows)
+    if columns * width > max_texture_size:
+        return None
+    return columns, rows
+
+
+class AnimatedTexture(object):
+    """
+    Frames of an animation uploaded once (atlas or stream mode) and played with per-frame delays.
+
+    Takes over image (all frames stacked vertically, see load_gif_frames()):
+    unload() releases it. Without a mode, ValueError is raised when the
+    animation fits neither atlas_budget as an atlas nor ram_budget streamed.
+    Needs a window.
+    """
+
+    def __init__(self, image: Image, delays: Sequence[float], mode: Optional[str]=None,
+                 atlas_budget: int=16 * 1024 * 1024, max_texture_size: int=8192,
+                 ram_budget: Optional[int]=None) -> None:
+        if image.format != PixelFormat.UNCOMPRESSED_R8G8B8A8:
+            raise ValueError("Animated textures need UNCOMPRESSED_R8G8B8A8 frames, got format {}.".format(image.format))
+        delays = np.asarray(delays, dtype=np.float64)
+        count = len(delays)
+        if count == 0 or image.height % count:
+            raise ValueError("Image height {} is not a multiple of {} frames.".format(image.height, count))
+        if mode not in (None, ANIM_ATLAS, ANIM_STREAM):
+            raise ValueError("Unknown animation mode '{}', expected '{}' or '{}'.".format(mode, ANIM_ATLAS, ANIM_STREAM))
+        self.width = image.width
+        self.height = image.height // count
+        self.frame_count = count
+        self.delays = delays
+        self._ends = np.cumsum(delays)
+        self.duration = float(self._ends[-1])
+        self.time = 0.0
+        self.speed = 1.0
+        self.loop = True
+        self.playing = True
+        self.frame = 0
+
+        grid = _atlas_grid(count, self.width, self.height, max_texture_size)
+        atlas_bytes = None
+        if grid is not None:
+            columns, rows = grid
+            atlas_bytes = get_pixel_data_size(columns * self.width, rows * self.height, image.format)
+        if mode is None:
+            stream_bytes = get_pixel_data_size(image.width, image.height, image.format)
+            if atlas_bytes is not None and atlas_bytes <= atlas_budget:
+                mode = ANIM_ATLAS
+            elif ram_budget is None or stream_bytes <= ram_budget:
+                mode = ANIM_STREAM
+            else:
+                raise ValueError("{} frames of {}x{} fit neither the VRAM budget as an atlas ({} of {} bytes) "
+                                 "nor the RAM budget streamed ({} of {} bytes).".format(
+                                     count, self.width, self.height, atlas_bytes, atlas_budget, stream_bytes,
+                                     ram_budget))
+        elif mode == ANIM_ATLAS and grid is None:
+            raise ValueError("{} frames of {}x{} do not fit a {} texture.".format(
+                count, self.width, self.height, max_texture_size
+            ))
+        self.mode = mode
+
+        self._image = None  # type: Optional[Image]
+        self._frame_size = get_pixel_data_size(self.width, self.height, image.format)
+        indices = np.arange(count)
+        if mode == ANIM_ATLAS:
+            columns, rows = grid
+            self.recs = np.stack([
+                (indices // rows) * self.width, (indices % rows) * self.height,
+                np.full(count, self.width), np.full(count, self.height),
+            ], axis=1).astype(np.float32)
+            if columns == 1:
+                # the stacked frames already are a one column atlas
+                self.texture = load_texture_from_image(image)
+            else:
+                frames = image.as_array().reshape(count, self.height, self.width, 4)
+                pixels = np.zeros((rows * self.height, columns * self.width, 4), dtype=np.uint8)
+                for column in range(columns):
+                    chunk = frames[column * rows:(column + 1) * rows]
+                    pixels[:len(chunk) * self.height, column * self.width:(column + 1) * self.width] = \
+                        chunk.reshape(-1, self.width, 4)
+                self.texture = load_texture_from_image(image_from_array(pixels, copy=False))
+            unload_image(image)
+        else:
+            self.recs = np.tile(np.array([0, 0, self.width, self.height], dtype=np.float32), (count, 1))
+            self._image = image
+            self.texture = load_texture_from_image(Image(image.data, self.width, self.height, 1, image.format))
+        if self.texture.id == 0:
+            self.unload()
+            raise ValueError("Cannot upload animation frames to the GPU.")
+        self._shown = 0  # frame currently in a streamed texture
+
+    @property
+    def vram_bytes(self) -> int:
+        return get_pixel_data_size(self.texture.width, self.texture.height, self.texture.format)
+
+    @property
+    def ram_bytes(self) -> int:
+        return self._frame_size * self.frame_count if self._image is not None else 0
+
+    def frame_at(self, time: float) -> int:
+        """Frame shown at time seconds into the animation (looping when loop is set)."""
+        return int(self.frames_at(np.asarray([time]))[0])
+
+    def frames_at(self, times: np.ndarray) -> np.ndarray:
+        """Vectorized frame_at() for many clocks at once."""
+        times = np.asarray(times, dtype=np.float64)
+        times = np.mod(times, self.duration) if self.loop else np.clip(times, 0.0, self.duration)
+        return np.minimum(np.searchsorted(self._ends, times, side='right'), self.frame_count - 1)
+
+    def set_frame(self, frame: int) -> None:
+        """Show frame (streams it to the texture in stream mode)."""
+        self.frame = frame % self.frame_count
+        if self._image is not None and self.frame != self._shown:
+            update_texture(self.texture, self._image.data + self.frame * self._frame_size)
+            self._shown = self.frame
+
+    def update(self, dt: Optional[float]=None) -> int:
+        """Advance the clock by dt seconds (get_frame_time() by default), returns the frame shown."""
+        if self.playing:
+            self.time += (get_frame_time() if dt is None else dt) * self.speed
+            if not self.loop and self.time >= self.duration:
+                self.time = self.duration
+                self.playing = False
+            self.set_frame(self.frame_at(self.time))
+        return self.frame
+
+    def reset(self) -> None:
+        self.time = 0.0
+        self.playing = True
+        self.set_frame(0)
+
+    @property
+    def source_rec(self) -> Rectangle:
+        return Rectangle(*self.recs[self.frame].tolist())
+
+    def draw(self, position: Union[Vector2, Seq], tint: Union[Color, Seq]=WHITE) -> None:
+        draw_texture_rec(self.texture, self.source_rec, position, tint)
+
+    def draw_pro(self, dest_rec: Union[Rectangle, Seq], origin: Union[Vector2, Seq]=(0, 0), rotation: float=0.0,
+                 tint: Union[Color, Seq]=WHITE) -> None:
+        draw_texture_pro(self.texture, self.source_rec, dest_rec, origin, rotation, tint)
+
+    def draw_many(self, positions: np.ndarray, times: np.ndarray, scale: float=1.0,
+                  tint: Union[Color, Seq]=WHITE) -> None:
+        """
+        Draw one copy per (x, y) position, each at its own clock, in one batched submission.
+
+        Atlas mode only: streamed animations have a single frame on the GPU.
+        """
+        if self.mode != ANIM_ATLAS:
+            raise ValueError("draw_many() needs an atlas animated texture.")
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        dest = np.empty((len(positions), 4), dtype=np.float32)
+        dest[:, :2] = positions
+        dest[:, 2] = self.width * scale
+        dest[:, 3] = self.height * scale
+        draw_texture_quads(self.texture, self.recs[self.frames_at(times)], dest, tint)
+
+    def unload(self) -> None:
+        if self.texture is not None and self.texture.id:
+            unload_texture(self.texture)
+        self.texture = None
+        if self._image is not None:
+            unload_image(self._image)
+            self._image = None
+
+    def __str__(self) -> str:
+        return "(ANIMATEDTEXTURE: {}x{}, frames: {}, duration: {:.2f}s, mode: {}, frame: {})".format(
+            self.width, self.height, self.frame_count, self.duration, self.mode, self.frame
+        )
+
+
+def load_animated_texture(file_name: AnyStr, mode: Optional[str]=None, atlas_budget: int=16 * 1024 * 1024,
+                          max_texture_size: int=8192, ram_budget: Optional[int]=None) -> AnimatedTexture:
+    """Load a GIF (see load_gif_frames()) into an AnimatedTexture, needs a window."""
+    image, delays = load_gif_frames(file_name)
+    return AnimatedTexture(image, delays, mode, atlas_budget, max_texture_size, ram_budget)
@@ -0,0 +1,244 @@
+# assetpack.py
+
+#   Single-file indexed asset packs
+#
+#   Shipping thousands of small files costs one open() per asset and a lot of
+#   filesystem overhead. AssetPackBuilder concatenates files (optionally zlib
+#   compressed, only when it saves space) into one pack followed by a name index,
+#   and AssetPack maps the pack and hands entries straight to raylib's
+#   *FromMemory loaders: uncompressed entries are passed without any copy.
+#
+#   Example:
+#
+#   with AssetPackBuilder("build/assets.rlpack") as pack:
+#       pack.add_file("sprites/player.png", "resources/player.png")
+#       pack.add_directory("resources/sounds", prefix="sounds/")
+#   ...
+#   assets = AssetPack("build/assets.rlpack")
+#   player = assets.load_image("sprites/player.png")
+#   jump = assets.load_wave("sounds/jump.wav")
+#   font = assets.load_font("fonts/KAISG.ttf", 32)       # needs a window
+#   music = assets.load_music_stream("music/level1.ogg")  # needs the audio device
+#   ...
+#   assets.close()
+#
+#   File types are taken from entry name extensions. Music is streamed from the
+#   pack while it plays: unload it before closing the pack.
+#
+#   Layout: header (magic, version, entry count, index offset), entry data, then
+#   per entry: name length, offset, stored size, size, flags, crc32 and the utf-8
+#   name.
+
+import mmap
+import os
+import struct
+import zlib
+from typing import AnyStr, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import (
+    Font,
+    Image,
+    Music,
+    Wave,
+    load_font_from_memory,
+    load_image_from_memory,
+    load_music_stream_from_memory,
+    load_wave_from_memory,
+    _str_out,
+)
+
+__all__ = [
+    'AssetPackBuilder',
+    'AssetPack',
+]
+
+
+_MAGIC = b'RLPK'
+_VERSION = 1
+# magic, version, entry count, index offset
+_HEADER = struct.Struct('<4s2IQ')
+# name length, offset, stored size, size, flags, crc32
+_ENTRY = struct.Struct('<H3Q2I')
+
+_FLAG_ZLIB = 0x01
+
+
+class _PackEntry(object):
+    __slots__ = ['name', 'offset', 'stored_size', 'size', 'flags', 'crc']
+
+    def __init__(self, name: str, offset: int, stored_size: int, size: int, flags: int, crc: int) -> None:
+        self.name = name
+        self.offset = offset
+        self.stored_size = stored_size
+        self.size = size
+        self.flags = flags
+        self.crc = crc
+
+
+class AssetPackBuilder(object):
+    """Writes an asset pack, entry data is streamed to disk as it is added."""
+
+    def __init__(self, file_name: AnyStr, compress: bool=True, level: int=6) -> None:
+        self.file_name = _str_out(file_name)
+        self.compress = compress
+        self.level = level
+        self._tmp_name = '{}.tmp{}'.format(self.file_name, os.getpid())
+        self._file = open(self._tmp_name, 'wb')
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0))
+        self._entries = {}  # type: Dict[str, _PackEntry]
+
+    def add_bytes(self, name: str, data: Union[bytes, bytearray, memoryview], compress: Optional[bool]=None) -> None:
+        """Add an entry from memory (compress overrides the builder setting)."""
+        if name in self._entries:
+            raise ValueError("Entry '{}' is already in the pack.".format(name))
+        data = bytes(data)
+        stored, flags = data, 0
+        if self.compress if compress is None else compress:
+            packed = zlib.compress(data, self.level)
+            # already compressed formats (png, ogg...) rarely shrink
+            if len(packed) < len(data):
+                stored, flags = packed, _FLAG_ZLIB
+        offset = self._file.tell()
+        self._file.write(stored)
+        self._entries[name] = _PackEntry(name, offset, len(stored), len(data), flags, zlib.crc32(data))
+
+    def add_file(self, name: str, file_name: AnyStr, compress: Optional[bool]=None) -> None:
+        """Add a file under name."""
+        with open(_str_out(file_name), 'rb') as f:
+            self.add_bytes(name, f.read(), compress)
+
+    def add_directory(self, directory: AnyStr, prefix: str='', compress: Optional[bool]=None) -> List[str]:
+        """Add every file below directory, named prefix + relative path ('/' separated)."""
+        directory = _str_out(directory)
+        names = []
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                name = prefix + os.path.relpath(path, directory).replace(os.sep, '/')
+                self.add_file(name, path, compress)
+                names.append(name)
+        return names
+
+    def close(self) -> None:
+        """Write the index and move the pack in place."""
+        if self._file is None:
+            return
+        index_offset = self._file.tell()
+        for entry in self._entries.values():
+            encoded = entry.name.encode('utf-8')
+            self._file.write(_ENTRY.pack(len(encoded), entry.offset, entry.stored_size, entry.size, entry.flags, entry.crc))
+            self._file.write(encoded)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, len(self._entries), index_offset))
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_name, self.file_name)
+
+    def __enter__(self) -> 'AssetPackBuilder':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_name)
+
+
+class AssetPack(object):
+    """Memory-mapped reader of a pack written by AssetPackBuilder."""
+
+    def __init__(self, file_name: AnyStr, verify: bool=False) -> None:
+        self.file_name = _str_out(file_name)
+        self.verify = verify
+        with open(self.file_name, 'rb') as f:
+            # copy-on-write so entries can be handed to raylib as writable buffers without a copy
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, count, index_offset = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise ValueError("'{}' is not a raylibpy asset pack.".format(self.file_name))
+
+        self._entries = {}  # type: Dict[str, _PackEntry]
+        position = index_offset
+        for _ in range(count):
+            length, offset, stored_size, size, flags, crc = _ENTRY.unpack_from(self._mmap, position)
+            position += _ENTRY.size
+            name = self._mmap[position:position + length].decode('utf-8')
+            position += length
+            self._entries[name] = _PackEntry(name, offset, stored_size, size, flags, crc)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def names(self, prefix: str='') -> List[str]:
+        return [name for name in self._entries if name.startswith(prefix)]
+
+    def size(self, name: str) -> int:
+        """Uncompressed size of an entry."""
+        return self._entries[name].size
+
+    def read(self, name: str) -> Union[memoryview, bytes]:
+        """
+        Entry data: a view into the mapped pack for stored entries (valid until
+        close()), a new bytes object for compressed ones.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError("No entry '{}' in asset pack '{}'.".format(name, self.file_name))
+        data = memoryview(self._mmap)[entry.offset:entry.offset + entry.stored_size]
+        if entry.flags & _FLAG_ZLIB:
+            data = zlib.decompress(data)
+        if self.verify and zlib.crc32(data) != entry.crc:
+            raise ValueError("Entry '{}' of asset pack '{}' is corrupted.".format(name, self.file_name))
+        return data
+
+    @staticmethod
+    def _file_type(name: str) -> str:
+        return os.path.splitext(name)[1].lower()
+
+    def load_image(self, name: str) -> Image:
+        """Decode an image entry (load_image_from_memory())."""
+        image = load_image_from_memory(self._file_type(name), self.read(name))
+        if not image.data:
+            raise ValueError("Cannot load image '{}' from asset pack.".format(name))
+        return image
+
+    def load_wave(self, name: str) -> Wave:
+        """Decode a sound entry (load_wave_from_memory())."""
+        wave = load_wave_from_memory(self._file_type(name), self.read(name))
+        if not wave.data:
+            raise ValueError("Cannot load wave '{}' from asset pack.".format(name))
+        return wave
+
+    def load_font(self, name: str, font_size: int, font_chars: Optional[Sequence[int]]=None) -> Font:
+        """Load a TTF/OTF entry (load_font_from_memory()), needs a window."""
+        return load_font_from_memory(self._file_type(name), self.read(name), font_size, font_chars)
+
+    def load_music_stream(self, name: str) -> Music:
+        """Open a music entry for streaming (load_music_stream_from_memory())."""
+        return load_music_stream_from_memory(self._file_type(name), self.read(name))
+
+    def close(self) -> None:
+        """Unmap the pack; views returned by read() must be released first."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'AssetPack':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return "(ASSETPACK: {}: entries: {})".format(self.file_name, len(self._entries))
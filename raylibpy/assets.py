@@ -0,0 +1,242 @@
+# assets.py
+
+#   Reference counted asset cache with a RAM/VRAM budget
+#
+#   AssetCache loads images, textures and fonts once per (path, parameters) and
+#   hands out the same object on every later request, counting references.
+#   Memory is estimated with get_pixel_data_size() (all mipmap levels), RAM for
+#   images and VRAM for textures and font atlases. Whenever a budget is exceeded
+#   the least recently used assets nobody holds a reference to are unloaded.
+#
+#   Example:
+#
+#   assets = AssetCache(vram_budget=256 * 1024 * 1024)
+#   player = assets.texture("resources/player.png")
+#   font = assets.font("resources/KAISG.ttf", 32)
+#   ...
+#   assets.release(player)      # may be evicted later, reloaded on demand
+#   assets.release(font)
+#   print(assets.stats)
+#   ...
+#   assets.clear()              # before close_window()
+#
+#   Textures and fonts need a window (GL context), images do not.
+
+import os
+from collections import OrderedDict
+from ctypes import sizeof
+from typing import AnyStr, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from . import (
+    Font,
+    GlyphInfo,
+    Image,
+    Rectangle,
+    Texture2D,
+    get_pixel_data_size,
+    load_font,
+    load_font_ex,
+    load_image,
+    load_texture,
+    unload_font,
+    unload_image,
+    unload_texture,
+    _str_out,
+)
+
+__all__ = [
+    'AssetCacheStats',
+    'AssetCache',
+    'estimate_image_size',
+]
+
+Asset = Union[Image, Texture2D, Font]
+
+
+def estimate_image_size(width: int, height: int, pxl_format: int, mipmaps: int=1) -> int:
+    """Bytes used by pixel data of the given size and format, all mipmap levels included."""
+    size = 0
+    for _ in range(max(mipmaps, 1)):
+        size += get_pixel_data_size(width, height, pxl_format)
+        width, height = max(width // 2, 1), max(height // 2, 1)
+    return size
+
+
+class AssetCacheStats(object):
+    """Hit/miss/eviction counters and current memory estimates of an AssetCache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.ram_bytes = 0
+        self.vram_bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / float(requests) if requests else 0.0
+
+    def __str__(self) -> str:
+        return "(ASSETCACHESTATS: hits: {}, misses: {}, evictions: {}, ram: {}, vram: {})".format(
+            self.hits, self.misses, self.evictions, self.ram_bytes, self.vram_bytes
+        )
+
+
+class _Entry(object):
+    __slots__ = ['key', 'asset', 'unload', 'refs', 'ram', 'vram']
+
+    def __init__(self, key: Hashable, asset: Asset, unload: Callable[[Asset], None], ram: int, vram: int) -> None:
+        self.key = key
+        self.asset = asset
+        self.unload = unload
+        self.refs = 0
+        self.ram = ram
+        self.vram = vram
+
+
+class AssetCache(object):
+    """Deduplicating, reference counted cache of images, textures and fonts."""
+
+    def __init__(self, ram_budget: Optional[int]=None, vram_budget: Optional[int]=None) -> None:
+        self.ram_budget = ram_budget
+        self.vram_budget = vram_budget
+        self.stats = AssetCacheStats()
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, _Entry]
+        self._by_asset = {}  # type: Dict[int, _Entry]
+
+    def _acquire(self, key: Hashable, load: Callable[[], Tuple[Asset, int, int]],
+                 unload: Callable[[Asset], None]) -> Asset:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.stats.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.stats.misses += 1
+            asset, ram, vram = load()
+            entry = _Entry(key, asset, unload, ram, vram)
+            self._entries[key] = entry
+            self._by_asset[id(asset)] = entry
+            self.stats.ram_bytes += ram
+            self.stats.vram_bytes += vram
+        entry.refs += 1
+        self.trim()
+        return entry.asset
+
+    def image(self, file_name: AnyStr) -> Image:
+        """Get (loading on first use) an image, adding a reference."""
+        path = os.path.abspath(_str_out(file_name))
+
+        def load() -> Tuple[Image, int, int]:
+            image = load_image(path)
+            if not image.data:
+                raise ValueError("Cannot load image '{}'.".format(path))
+            return image, estimate_image_size(image.width, image.height, image.format, image.mipmaps), 0
+
+        return self._acquire(('image', path), load, unload_image)
+
+    def texture(self, file_name: AnyStr) -> Texture2D:
+        """Get (loading on first use) a texture, adding a reference."""
+        path = os.path.abspath(_str_out(file_name))
+
+        def load() -> Tuple[Texture2D, int, int]:
+            texture = load_texture(path)
+            if texture.id == 0:
+                raise ValueError("Cannot load texture '{}'.".format(path))
+            return texture, 0, estimate_image_size(texture.width, texture.height, texture.format, texture.mipmaps)
+
+        return self._acquire(('texture', path), load, unload_texture)
+
+    def font(self, file_name: AnyStr, font_size: Optional[int]=None) -> Font:
+        """Get (loading on first use) a font, at its default size when font_size is None, adding a reference."""
+        path = os.path.abspath(_str_out(file_name))
+
+        def load() -> Tuple[Font, int, int]:
+            font = load_font(path) if font_size is None else load_font_ex(path, font_size, 0, None)
+            if font.texture.id == 0:
+                raise ValueError("Cannot load font '{}'.".format(path))
+            texture = font.texture
+            vram = estimate_image_size(texture.width, texture.height, texture.format, texture.mipmaps)
+            return font, font.glyphCount * (sizeof(GlyphInfo) + sizeof(Rectangle)), vram
+
+        return self._acquire(('font', path, font_size), load, unload_font)
+
+    def add(self, key: Hashable, asset: Asset, unload: Callable[[Asset], None], ram: int=0, vram: int=0) -> Asset:
+        """Put an asset created elsewhere under key (one reference), or get the one already cached."""
+        return self._acquire(key, lambda: (asset, ram, vram), unload)
+
+    def retain(self, asset: Asset) -> Asset:
+        """Add a reference to a cached asset."""
+        entry = self._entry(asset)
+        entry.refs += 1
+        return asset
+
+    def release(self, asset: Asset) -> None:
+        """Drop a reference; unreferenced assets stay cached until evicted."""
+        entry = self._entry(asset)
+        if entry.refs <= 0:
+            raise ValueError("Asset {} released more often than acquired.".format(entry.key))
+        entry.refs -= 1
+        if entry.refs == 0:
+            self.trim()
+
+    def refs(self, asset: Asset) -> int:
+        return self._entry(asset).refs
+
+    def _entry(self, asset: Asset) -> _Entry:
+        entry = self._by_asset.get(id(asset))
+        if entry is None or entry.asset is not asset:
+            raise KeyError("Asset {} is not managed by this cache.".format(asset))
+        return entry
+
+    def _over_ram_budget(self) -> bool:
+        return self.ram_budget is not None and self.stats.ram_bytes > self.ram_budget
+
+    def _over_vram_budget(self) -> bool:
+        return self.vram_budget is not None and self.stats.vram_bytes > self.vram_budget
+
+    def _over_budget(self) -> bool:
+        return self._over_ram_budget() or self._over_vram_budget()
+
+    def _evict(self, entry: _Entry) -> None:
+        del self._entries[entry.key]
+        del self._by_asset[id(entry.asset)]
+        self.stats.ram_bytes -= entry.ram
+        self.stats.vram_bytes -= entry.vram
+        entry.unload(entry.asset)
+
+    def trim(self) -> int:
+        """
+        Evict unreferenced assets, least recently used first, until within budget. Returns the count.
+
+        Only assets using the memory that is over budget are evicted: images are
+        not dropped to make room in VRAM, nor textures to make room in RAM.
+        """
+        evicted = 0
+        if not self._over_budget():
+            return evicted
+        for entry in list(self._entries.values()):
+            if entry.refs == 0 and ((entry.ram > 0 and self._over_ram_budget()) or
+                                    (entry.vram > 0 and self._over_vram_budget())):
+                self._evict(entry)
+                evicted += 1
+                if not self._over_budget():
+                    break
+        self.stats.evictions += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """Unload every asset, referenced or not."""
+        for entry in list(self._entries.values()):
+            self._evict(entry)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return "(ASSETCACHE: assets: {}, ram: {}/{}, vram: {}/{})".format(
+            len(self._entries), self.stats.ram_bytes, self.ram_budget, self.stats.vram_bytes, self.vram_budget
+        )
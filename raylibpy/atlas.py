@@ -0,0 +1,346 @@
+# atlas.py
+
+#   Texture atlas builder: many images packed into a few power-of-two pages
+#
+#   Every separate Texture2D breaks the rlgl batch when drawing. build_atlas()
+#   packs images (or image files) with a MaxRects packer (best short side fit)
+#   into as few pages as possible, copies their pixels in and returns a
+#   TextureAtlas with a name -> (page, source rectangle) index. Pages are trimmed
+#   to the smallest power-of-two size that holds their content.
+#
+#   Pixels are copied exactly (through NumPy views) rather than with image_draw(),
+#   whose alpha blending rounds every channel down by one on a transparent page.
+#
+#   Example:
+#
+#   atlas = build_atlas({name: path for name, path in sprites.items()}, max_size=2048)
+#   atlas.save("build/sprites.rlatlas")
+#   ...
+#   atlas = load_atlas("build/sprites.rlatlas")     # raw pixels, no PNG decoding
+#   atlas.load_textures()                           # after init_window()
+#   atlas.draw("player_idle_0", (x, y), WHITE)
+#   ...
+#   atlas.unload()
+#
+#   Saved atlases keep the page pixels uncompressed, so reloading is a single
+#   read per page.
+
+import os
+import struct
+from ctypes import c_ubyte
+from typing import AnyStr, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    BLANK,
+    Color,
+    Image,
+    Rectangle,
+    Seq,
+    Texture2D,
+    Vector2,
+    WHITE,
+    draw_texture_rec,
+    gen_image_color,
+    get_pixel_data_size,
+    image_copy,
+    image_format,
+    image_from_image,
+    load_image,
+    load_texture_from_image,
+    mem_alloc,
+    unload_image,
+    unload_texture,
+    _str_out,
+)
+
+__all__ = [
+    'MaxRectsPacker',
+    'TextureAtlas',
+    'build_atlas',
+    'load_atlas',
+]
+
+
+def _next_pot(value: int) -> int:
+    pot = 1
+    while pot < value:
+        pot <<= 1
+    return pot
+
+
+def _blit(page: Image, image: Image, x: int, y: int) -> None:
+    # exact copy into an R8G8B8A8 page, converting the source format if needed
+    source = image
+    if image.format != page.format:
+        source = image_copy(image)
+        image_format(source, page.format)
+    try:
+        page.as_array()[y:y + source.height, x:x + source.width] = source.as_array()
+    finally:
+        if source is not image:
+            unload_image(source)
+
+
+class MaxRectsPacker(object):
+    """MaxRects bin packer (best short side fit) for one fixed size bin."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]  # type: List[Tuple[int, int, int, int]]
+        self.used = []  # type: List[Tuple[int, int, int, int]]
+
+    def find(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Best position for a width x height rectangle, None when it does not fit."""
+        best = None
+        best_score = None
+        for x, y, w, h in self.free:
+            if width <= w and height <= h:
+                score = (min(w - width, h - height), max(w - width, h - height))
+                if best_score is None or score < best_score:
+                    best, best_score = (x, y), score
+        return best
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Place a width x height rectangle, returns its position or None."""
+        position = self.find(width, height)
+        if position is None:
+            return None
+        placed = (position[0], position[1], width, height)
+        self.used.append(placed)
+
+        kept = []
+        split = []
+        for rect in self.free:
+            parts = self._split(rect, placed)
+            if parts is None:
+                kept.append(rect)
+            else:
+                split.extend(parts)
+        # Drop free rectangles contained in another one. Untouched rectangles already
+        # exclude each other and cannot lie inside a part of a split one, so only the
+        # new parts are checked: against the untouched ones in one NumPy pass, then
+        # against each other.
+        if split and kept:
+            old = np.array(kept)
+            new = np.array(split)
+            inside = ((old[None, :, 0] <= new[:, None, 0]) & (old[None, :, 1] <= new[:, None, 1]) &
+                      (old[None, :, 0] + old[None, :, 2] >= new[:, None, 0] + new[:, None, 2]) &
+                      (old[None, :, 1] + old[None, :, 3] >= new[:, None, 1] + new[:, None, 3])).any(axis=1)
+            split = [rect for rect, contained in zip(split, inside.tolist()) if not contained]
+        split.sort(key=lambda r: r[2] * r[3], reverse=True)
+        self.free = kept
+        start = len(kept)
+        for rect in split:
+            if not any(self._contains(other, rect) for other in self.free[start:]):
+                self.free.append(rect)
+        return position
+
+    @staticmethod
+    def _split(free: Tuple[int, int, int, int],
+               used: Tuple[int, int, int, int]) -> Optional[List[Tuple[int, int, int, int]]]:
+        # parts of free left around used, None when they do not intersect
+        fx, fy, fw, fh = free
+        ux, uy, uw, uh = used
+        if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+            return None
+        parts = []
+        if ux > fx:
+            parts.append((fx, fy, ux - fx, fh))
+        if ux + uw < fx + fw:
+            parts.append((ux + uw, fy, fx + fw - ux - uw, fh))
+        if uy > fy:
+            parts.append((fx, fy, fw, uy - fy))
+        if uy + uh < fy + fh:
+            parts.append((fx, uy + uh, fw, fy + fh - uy - uh))
+        return parts
+
+    @staticmethod
+    def _contains(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+        return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+                outer[0] + outer[2] >= inner[0] + inner[2] and outer[1] + outer[3] >= inner[1] + inner[3])
+
+    @property
+    def extent(self) -> Tuple[int, int]:
+        """Size of the area actually covered by placed rectangles."""
+        if not self.used:
+            return 0, 0
+        return max(x + w for x, y, w, h in self.used), max(y + h for x, y, w, h in self.used)
+
+    @property
+    def occupancy(self) -> float:
+        return sum(w * h for x, y, w, h in self.used) / float(self.width * self.height)
+
+
+class TextureAtlas(object):
+    """Packed atlas pages (Images, and Textures once loaded) plus the name -> (page, rect) index."""
+
+    def __init__(self, pages: List[Image], index: Dict[str, Tuple[int, Rectangle]]) -> None:
+        self.pages = pages
+        self.index = index
+        self.textures = []  # type: List[Texture2D]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def source(self, name: str) -> Tuple[int, Rectangle]:
+        """Page number and source rectangle of a packed image."""
+        return self.index[name]
+
+    def texture(self, name: str) -> Texture2D:
+        """Texture of the page holding a packed image (after load_textures())."""
+        return self.textures[self.index[name][0]]
+
+    @property
+    def efficiency(self) -> float:
+        """Packed pixels over total page pixels."""
+        area = sum(page.width * page.height for page in self.pages)
+        used = sum(rec.width * rec.height for page, rec in self.index.values())
+        return used / float(area) if area else 0.0
+
+    def image(self, name: str) -> Image:
+        """Copy of a packed image (unload it with unload_image())."""
+        page, rec = self.index[name]
+        return image_from_image(self.pages[page], rec)
+
+    def load_textures(self) -> List[Texture2D]:
+        """Upload every page to the GPU (needs a window)."""
+        if not self.textures:
+            self.textures = [load_texture_from_image(page) for page in self.pages]
+        return self.textures
+
+    def draw(self, name: str, position: Union[Vector2, Seq], tint: Union[Color, Seq]=WHITE) -> None:
+        """Draw a packed image at position (same as draw_texture_rec() on its page)."""
+        page, rec = self.index[name]
+        draw_texture_rec(self.textures[page], rec, position, tint)
+
+    def save(self, file_name: AnyStr) -> None:
+        """Write pages and index to a single file for load_atlas()."""
+        path = _str_out(file_name)
+        tmp_path = '{}.tmp{}'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(self.pages), len(self.index)))
+            for page in self.pages:
+                f.write(_PAGE.pack(page.width, page.height, page.format))
+            for name, (page, rec) in self.index.items():
+                encoded = name.encode('utf-8')
+                f.write(_ENTRY.pack(page, int(rec.x), int(rec.y), int(rec.width), int(rec.height), len(encoded)))
+                f.write(encoded)
+            for page in self.pages:
+                f.write((c_ubyte * get_pixel_data_size(page.width, page.height, page.format)).from_address(page.data))
+        os.replace(tmp_path, path)
+
+    def unload(self) -> None:
+        """Unload page textures and images."""
+        for texture in self.textures:
+            unload_texture(texture)
+        for page in self.pages:
+            unload_image(page)
+        self.textures = []
+        self.pages = []
+
+    def __str__(self) -> str:
+        return "(TEXTUREATLAS: images: {}, pages: {}, efficiency: {:.1%})".format(
+            len(self.index), ' '.join('{}x{}'.format(p.width, p.height) for p in self.pages), self.efficiency
+        )
+
+
+_MAGIC = b'RLAT'
+_VERSION = 1
+# magic, version, pages, entries
+_HEADER = struct.Struct('<4s3i')
+# width, height, format
+_PAGE = struct.Struct('<3i')
+# page, x, y, width, height, name length (utf-8 name follows)
+_ENTRY = struct.Struct('<6i')
+
+
+def build_atlas(images: Mapping[str, Union[Image, AnyStr]], max_size: int=2048, padding: int=1,
+                pot: bool=True) -> TextureAtlas:
+    """
+    Pack images (or image files) into max_size x max_size (or smaller) pages.
+
+    Images are placed largest first with padding pixels between them; a new page
+    is opened whenever one is full. Images passed in are left untouched, files
+    are loaded and unloaded here. Pages are R8G8B8A8 with a transparent background.
+    """
+    loaded = {}
+    sources = {}
+    try:
+        for name, image in images.items():
+            if not isinstance(image, Image):
+                image = loaded[name] = load_image(image)
+                if not image.data:
+                    raise ValueError("Cannot load image '{}' for atlas entry '{}'.".format(
+                        _str_out(images[name]), name
+                    ))
+            if image.width + padding > max_size or image.height + padding > max_size:
+                raise ValueError("Image '{}' ({}x{}) does not fit in a {} atlas page.".format(
+                    name, image.width, image.height, max_size
+                ))
+            sources[name] = image
+
+        order = sorted(sources, key=lambda n: (max(sources[n].width, sources[n].height),
+                                               sources[n].width * sources[n].height), reverse=True)
+        packers = []  # type: List[MaxRectsPacker]
+        placements = {}
+        for name in order:
+            width, height = sources[name].width + padding, sources[name].height + padding
+            for number, packer in enumerate(packers):
+                position = packer.insert(width, height)
+                if position is not None:
+                    break
+            else:
+                packers.append(MaxRectsPacker(max_size, max_size))
+                number = len(packers) - 1
+                position = packers[number].insert(width, height)
+            placements[name] = (number, position)
+
+        pages = []
+        for packer in packers:
+            width, height = packer.extent
+            if pot:
+                width, height = _next_pot(width), _next_pot(height)
+            pages.append(gen_image_color(width, height, BLANK))
+
+        index = {}
+        for name in images:
+            number, (x, y) = placements[name]
+            image = sources[name]
+            _blit(pages[number], image, x, y)
+            index[name] = (number, Rectangle(x, y, image.width, image.height))
+        return TextureAtlas(pages, index)
+    finally:
+        for image in loaded.values():
+            unload_image(image)
+
+
+def load_atlas(file_name: AnyStr) -> TextureAtlas:
+    """Load an atlas written by TextureAtlas.save()."""
+    path = _str_out(file_name)
+    with open(path, 'rb') as f:
+        magic, version, page_count, entry_count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("'{}' is not a raylibpy atlas file.".format(path))
+        layouts = [_PAGE.unpack(f.read(_PAGE.size)) for _ in range(page_count)]
+        index = {}
+        for _ in range(entry_count):
+            page, x, y, width, height, length = _ENTRY.unpack(f.read(_ENTRY.size))
+            index[f.read(length).decode('utf-8')] = (page, Rectangle(x, y, width, height))
+
+        pages = []
+        for width, height, pixel_format in layouts:
+            size = get_pixel_data_size(width, height, pixel_format)
+            # pixels go on raylib's heap so unload_image() can release them
+            data = mem_alloc(size)
+            f.readinto((c_ubyte * size).from_address(data))
+            pages.append(Image(data, width, height, 1, pixel_format))
+    return TextureAtlas(pages, index)
@@ -0,0 +1,379 @@
+# canvas.py
+
+#   Headless CPU canvas and a process-pool render service
+#
+#   raylib's Image* drawing functions rasterize on the CPU, so thumbnails, charts
+#   and share cards can be rendered on machines without a GPU or a window. Canvas
+#   wraps an Image with the drawing vocabulary of the screen API, and
+#   load_image_font() builds a Font from glyph images only (no texture), which is
+#   what image_draw_text_ex() needs when there is no GL context.
+#
+#   Example:
+#
+#   font = load_image_font("resources/KAISG.ttf", 32)
+#   with Canvas(640, 320, RAYWHITE, font) as canvas:
+#       canvas.draw_rectangle(0, 0, 640, 64, DARKBLUE)
+#       canvas.draw_text("Share card", 20, 16, 32, WHITE)
+#       canvas.draw_texture(avatar, 20, 96)
+#       canvas.export("card.png")
+#   unload_image_font(font)
+#
+#   RenderService runs a module level render(canvas, job) function over many
+#   jobs in worker processes, each one drawing onto a fresh canvas:
+#
+#   service = RenderService(render_card, 640, 320, RAYWHITE, font=("resources/KAISG.ttf", 32))
+#   results = service.run(users, target=lambda user: "cards/{}.png".format(user.id))
+#
+#   Without a window the default font is not available: draw_text() then needs
+#   a canvas font.
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AnyStr, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import (
+    BLANK,
+    WHITE,
+    Color,
+    Font,
+    Image,
+    Rectangle,
+    Seq,
+    Vector2,
+    export_image,
+    gen_image_color,
+    gen_image_font_atlas,
+    image_clear_background,
+    image_copy,
+    image_draw,
+    image_draw_circle,
+    image_draw_line,
+    image_draw_pixel,
+    image_draw_rectangle,
+    image_draw_rectangle_lines,
+    image_draw_rectangle_rec,
+    image_draw_text,
+    image_draw_text_ex,
+    is_window_ready,
+    load_font_data,
+    load_image_colors,
+    measure_text,
+    measure_text_ex,
+    mem_free,
+    unload_font_data,
+    unload_image,
+    _pool_imap,
+    _str_out,
+)
+
+__all__ = [
+    'load_image_font',
+    'unload_image_font',
+    'Canvas',
+    'RenderResult',
+    'RenderService',
+]
+
+_FONT_PADDING = 4
+_DEFAULT_FONT_SIZE = 10
+
+FontSpec = Tuple  # (file_name, font_size) or (file_name, font_size, font_chars)
+
+
+def load_image_font(file_name: AnyStr, font_size: int, font_chars: Optional[Sequence[int]]=None) -> Font:
+    """
+    Load a font for drawing into images only (no texture, works without a window).
+
+    Release it with unload_image_font(), not unload_font().
+    """
+    count = len(font_chars) if font_chars is not None else 0
+    glyphs = load_font_data(file_name, font_size, font_chars, count, False)
+    if not glyphs:
+        raise ValueError("Cannot load font '{}'.".format(_str_out(file_name)))
+    # default set is ASCII 32..126
+    count = count or 95
+    # the atlas itself is not needed, only the glyph rectangles it lays out
+    atlas, recs = gen_image_font_atlas(glyphs, font_size, count, _FONT_PADDING, 0)
+    unload_image(atlas)
+
+    font = Font()
+    font.baseSize = font_size
+    font.glyphCount = count
+    font.glyphPadding = _FONT_PADDING
+    font.recs = recs
+    font.glyphs = glyphs
+    return font
+
+
+def unload_image_font(font: Font) -> None:
+    """Unload a font created by load_image_font()."""
+    unload_font_data(font.glyphs, font.glyphCount)
+    mem_free(font.recs)
+
+
+class Canvas(object):
+    """Image with screen-like drawing functions, everything is rasterized on the CPU."""
+
+    def __init__(self, width: int, height: int, background: Union[Color, Seq]=BLANK,
+                 font: Optional[Font]=None) -> None:
+        self.image = gen_image_color(width, height, background)
+        self.font = font
+
+    @classmethod
+    def from_image(cls, image: Image, font: Optional[Font]=None, copy: bool=True) -> 'Canvas':
+        """Canvas drawing on a copy of image (or on image itself, which the canvas then owns)."""
+        canvas = cls.__new__(cls)
+        canvas.image = image_copy(image) if copy else image
+        canvas.font = font
+        return canvas
+
+    @property
+    def width(self) -> int:
+        return self.image.width
+
+    @property
+    def height(self) -> int:
+        return self.image.height
+
+    def clear_background(self, color: Union[Color, Seq]) -> None:
+        image_clear_background(self.image, color)
+
+    def draw_pixel(self, pos_x: int, pos_y: int, color: Union[Color, Seq]) -> None:
+        image_draw_pixel(self.image, pos_x, pos_y, color)
+
+    def draw_pixel_v(self, position: Union[Vector2, Seq], color: Union[Color, Seq]) -> None:
+        image_draw_pixel(self.image, position[0], position[1], color)
+
+    def draw_line(self, start_pos_x: int, start_pos_y: int, end_pos_x: int, end_pos_y: int,
+                  color: Union[Color, Seq]) -> None:
+        image_draw_line(self.image, start_pos_x, start_pos_y, end_pos_x, end_pos_y, color)
+
+    def draw_line_v(self, start_pos: Union[Vector2, Seq], end_pos: Union[Vector2, Seq],
+                    color: Union[Color, Seq]) -> None:
+        image_draw_line(self.image, start_pos[0], start_pos[1], end_pos[0], end_pos[1], color)
+
+    def draw_circle(self, center_x: int, center_y: int, radius: int, color: Union[Color, Seq]) -> None:
+        image_draw_circle(self.image, center_x, center_y, radius, color)
+
+    def draw_circle_v(self, center: Union[Vector2, Seq], radius: int, color: Union[Color, Seq]) -> None:
+        image_draw_circle(self.image, center[0], center[1], radius, color)
+
+    def draw_rectangle(self, pos_x: int, pos_y: int, width: int, height: int, color: Union[Color, Seq]) -> None:
+        image_draw_rectangle(self.image, pos_x, pos_y, width, height, color)
+
+    def draw_rectangle_v(self, position: Union[Vector2, Seq], size: Union[Vector2, Seq],
+                         color: Union[Color, Seq]) -> None:
+        image_draw_rectangle(self.image, position[0], position[1], size[0], size[1], color)
+
+    def draw_rectangle_rec(self, rec: Union[Rectangle, Seq], color: Union[Color, Seq]) -> None:
+        image_draw_rectangle_rec(self.image, rec, color)
+
+    def draw_rectangle_lines(self, pos_x: int, pos_y: int, width: int, height: int,
+                             color: Union[Color, Seq]) -> None:
+        image_draw_rectangle_lines(self.image, (pos_x, pos_y, width, height), 1, color)
+
+    def draw_rectangle_lines_ex(self, rec: Union[Rectangle, Seq], line_thick: int, color: Union[Color, Seq]) -> None:
+        image_draw_rectangle_lines(self.image, rec, line_thick, color)
+
+    def _text_font(self) -> Optional[Font]:
+        if self.font is not None:
+            return self.font
+        if not is_window_ready():
+            raise ValueError("The default font needs a window, give the canvas a font (load_image_font()).")
+        return None
+
+    def draw_text(self, text: AnyStr, pos_x: int, pos_y: int, font_size: int, color: Union[Color, Seq]) -> None:
+        """Draw text with the canvas font (default font when it has none and a window is open)."""
+        font = self._text_font()
+        if font is None:
+            image_draw_text(self.image, text, pos_x, pos_y, font_size, color)
+        else:
+            # same spacing rule as draw_text() with the default font
+            font_size = max(font_size, _DEFAULT_FONT_SIZE)
+            image_draw_text_ex(self.image, font, text, (pos_x, pos_y), font_size,
+                               font_size / _DEFAULT_FONT_SIZE, color)
+
+    def draw_text_ex(self, font: Font, text: AnyStr, position: Union[Vector2, Seq], font_size: float,
+                     spacing: float, tint: Union[Color, Seq]) -> None:
+        image_draw_text_ex(self.image, font, text, position, font_size, spacing, tint)
+
+    def measure_text(self, text: AnyStr, font_size: int) -> int:
+        """Width of draw_text() output."""
+        font = self._text_font()
+        if font is None:
+            return measure_text(text, font_size)
+        font_size = max(font_size, _DEFAULT_FONT_SIZE)
+        return int(measure_text_ex(font, text, font_size, font_size / _DEFAULT_FONT_SIZE).x)
+
+    def draw_texture(self, image: Image, pos_x: int, pos_y: int, tint: Union[Color, Seq]=WHITE) -> None:
+        """Draw a whole image at (pos_x, pos_y), blended and tinted."""
+        image_draw(self.image, image, (0, 0, image.width, image.height), (pos_x, pos_y, image.width, image.height), tint)
+
+    def draw_texture_rec(self, image: Image, source: Union[Rectangle, Seq], position: Union[Vector2, Seq],
+                         tint: Union[Color, Seq]=WHITE) -> None:
+        """Draw part of an image at position."""
+        if isinstance(source, Rectangle):
+            source = (source.x, source.y, source.width, source.height)
+        image_draw(self.image, image, source, (position[0], position[1], source[2], source[3]), tint)
+
+    def draw_texture_pro(self, image: Image, source: Union[Rectangle, Seq], dest: Union[Rectangle, Seq],
+                         tint: Union[Color, Seq]=WHITE) -> None:
+        """Draw part of an image scaled into dest (no rotation on images)."""
+        image_draw(self.image, image, source, dest, tint)
+
+    def as_array(self) -> np.ndarray:
+        """NumPy view of the canvas pixels (valid until unload())."""
+        return self.image.as_array()
+
+    def colors(self) -> np.ndarray:
+        """RGBA copy of the canvas pixels, shape (height, width, 4)."""
+        return load_image_colors(self.image)
+
+    def export(self, file_name: AnyStr) -> bool:
+        return export_image(file_name, self.image)
+
+    def unload(self) -> None:
+        if self.image is not None:
+            unload_image(self.image)
+            self.image = None
+
+    def __enter__(self) -> 'Canvas':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.unload()
+
+    def __str__(self) -> str:
+        return "(CANVAS: {}w, {}h, font: {})".format(self.width, self.height, self.font is not None)
+
+
+class RenderResult(object):
+    """Outcome of one job: output path (or RGBA pixels), time spent and error message (if any)."""
+
+    __slots__ = ['job', 'target', 'pixels', 'seconds', 'error']
+
+    def __init__(self, job: Any, target: Optional[str], pixels: Optional[np.ndarray]=None, seconds: float=0.0,
+                 error: Optional[str]=None) -> None:
+        self.job = job
+        self.target = target
+        self.pixels = pixels
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            return "(RENDERRESULT: {!r}: error: {})".format(self.job, self.error)
+        return "(RENDERRESULT: {!r} -> {}: {:.1f} ms)".format(
+            self.job, self.target or '<pixels>', self.seconds * 1000.0
+        )
+
+
+# fonts loaded by this process, kept for the life of the worker
+_fonts = {}  # type: Dict[FontSpec, Font]
+
+
+def _font(spec: Optional[FontSpec]) -> Optional[Font]:
+    if spec is None:
+        return None
+    font = _fonts.get(spec)
+    if font is None:
+        font = _fonts[spec] = load_image_font(*spec)
+    return font
+
+
+def _render(render: Callable[[Canvas, Any], None], width: int, height: int, background: Tuple[int, int, int, int],
+            font: Optional[FontSpec], job: Any, target: Optional[str]) -> RenderResult:
+    # runs in the worker processes
+    start = time.perf_counter()
+    try:
+        with Canvas(width, height, background, _font(font)) as canvas:
+            render(canvas, job)
+            if target is None:
+                return RenderResult(job, None, canvas.colors(), time.perf_counter() - start)
+            directory = os.path.dirname(target)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if not canvas.export(target):
+                raise ValueError("Cannot export image '{}'.".format(target))
+    except Exception as e:
+        return RenderResult(job, target, None, time.perf_counter() - start, '{}: {}'.format(type(e).__name__, e))
+    return RenderResult(job, target, None, time.perf_counter() - start)
+
+
+class RenderService(object):
+    """
+    Renders jobs onto fresh canvases in a process pool, no window needed.
+
+    render must be a picklable (module level) function render(canvas, job),
+    jobs must be picklable too. font is a (file_name, font_size[, font_chars])
+    tuple loaded once per worker with load_image_font() and set as canvas font.
+    """
+
+    def __init__(self, render: Callable[[Canvas, Any], None], width: int, height: int,
+                 background: Union[Color, Seq]=BLANK, font: Optional[FontSpec]=None,
+                 workers: Optional[int]=None, max_pending: Optional[int]=None) -> None:
+        self.render = render
+        self.width = width
+        self.height = height
+        if isinstance(background, Color):
+            background = (background.r, background.g, background.b, background.a)
+        self.background = tuple(background)
+        self.font = tuple(font) if font is not None else None
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max(max_pending or 2 * self.workers, 1)
+        self._executor = None  # type: Optional[ProcessPoolExecutor]
+
+    def _args(self, job: Any, target: Optional[str]) -> tuple:
+        return self.render, self.width, self.height, self.background, self.font, job, target
+
+    def imap(self, jobs: Iterable[Any], target: Optional[Callable[[Any], AnyStr]]=None) -> Iterator[RenderResult]:
+        """
+        Render jobs, yielding results as they complete (not in input order).
+
+        target(job) gives the file each image is exported to; without it the
+        results carry the RGBA pixels instead. workers=0 renders in the calling
+        process, otherwise at most max_pending jobs are in flight.
+        """
+        def target_of(job: Any) -> Optional[str]:
+            return _str_out(target(job)) if target is not None else None
+
+        if self.workers != 0 and self._executor is None:
+            # kept between calls so workers keep their fonts loaded
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        args = (self._args(job, target_of(job)) for job in jobs)
+        return _pool_imap(_render, args, self.workers, self.max_pending, self._executor)
+
+    def run(self, jobs: Sequence[Any], target: Optional[Callable[[Any], AnyStr]]=None,
+            progress: Optional[Callable[[int, int, RenderResult], None]]=None) -> List[RenderResult]:
+        """Render all jobs (see imap()), calling progress(done, total, result) after each one."""
+        total = len(jobs)
+        results = []
+        for result in self.imap(jobs, target):
+            results.append(result)
+            if progress is not None:
+                progress(len(results), total, result)
+        return results
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'RenderService':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def __str__(self) -> str:
+        return "(RENDERSERVICE: {}x{}, workers: {}, max pending: {})".format(
+            self.width, self.height, self.workers, self.max_pending
+        )
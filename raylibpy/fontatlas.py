@@ -0,0 +1,375 @@
+# fontatlas.py
+
+#   Dynamic font atlas: glyphs are rasterized the first time they are drawn
+#
+#   load_font_ex() needs the full glyph set up front, which for CJK fonts means a
+#   huge atlas and a slow startup. DynamicFontAtlas keeps the TTF file around and
+#   rasterizes missing codepoints with load_font_data() on demand, packs them
+#   into a shelf-packed atlas that grows up to max_size and, once full, evicts the
+#   least recently used shelf of glyphs.
+#
+#   Example:
+#
+#   atlas = DynamicFontAtlas("resources/KAISG.ttf", 32)
+#   ...
+#   atlas.draw_text("こんにちは", (20, 20), 32, 1, WHITE)   # inside begin_drawing()
+#   ...
+#   atlas.unload()
+#
+#   atlas.font is a regular Font (texture, recs and glyph table) holding the glyphs
+#   loaded so far, so it also works with draw_text_ex() and textlayout.layout_text()
+#   once ensure() has been called for the text.
+
+from ctypes import POINTER, c_ubyte, cast
+from typing import AnyStr, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import (
+    Color,
+    Font,
+    GlyphInfo,
+    Image,
+    Rectangle,
+    Seq,
+    Texture2D,
+    Vector2,
+    WHITE,
+    UNCOMPRESSED_GRAY_ALPHA,
+    draw_text_ex,
+    load_codepoints,
+    load_font_data,
+    load_texture_from_image,
+    measure_text_ex,
+    unload_font_data,
+    unload_texture,
+    update_texture,
+    _font_key,
+    _forget_font,
+)
+
+__all__ = [
+    'ShelfPacker',
+    'DynamicFontAtlas',
+]
+
+
+class _Shelf(object):
+    __slots__ = ['y', 'height', 'x', 'keys']
+
+    def __init__(self, y: int, height: int, x: int) -> None:
+        self.y = y
+        self.height = height
+        self.x = x
+        self.keys = []
+
+
+class ShelfPacker(object):
+    """
+    Shelf (row based) rectangle packer with least-recently-used shelf eviction.
+
+    Rectangles are identified by a hashable key. When nothing fits, the packer
+    first reports failure so the owner can grow() it; insert(..., evict=True)
+    instead frees the shelf whose newest rectangle is the oldest, never touching
+    shelves that hold a pinned key.
+
+    Every rectangle keeps padding free pixels on each side, the area edges
+    included, so samplers reaching padding pixels past a rectangle (raylib's
+    glyphPadding) only ever see empty pixels. Freed areas are listed by
+    pop_freed() for the owner to clear.
+    """
+
+    def __init__(self, width: int, height: int, padding: int=1) -> None:
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self._shelves = []  # type: List[_Shelf]
+        self._owner = {}  # type: Dict[object, _Shelf]
+        self._rects = {}  # type: Dict[object, Tuple[int, int, int, int]]
+        self._used = {}  # type: Dict[object, int]
+        self._freed = []  # type: List[Tuple[int, int, int, int]]
+        self._tick = 0
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rects
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def rect(self, key: object) -> Tuple[int, int, int, int]:
+        """Packed (x, y, width, height) of a key."""
+        return self._rects[key]
+
+    def touch(self, key: object) -> None:
+        """Mark a key as used now."""
+        self._tick += 1
+        self._used[key] = self._tick
+
+    def grow(self, width: int, height: int) -> None:
+        """Enlarge the packing area, packed rectangles keep their position."""
+        if width < self.width or height < self.height:
+            raise ValueError("ShelfPacker can only grow ({}x{} -> {}x{}).".format(self.width, self.height, width, height))
+        self.width = width
+        self.height = height
+
+    def pop_freed(self) -> List[Tuple[int, int, int, int]]:
+        """(x, y, width, height) areas freed by evictions and removals since the last call."""
+        freed, self._freed = self._freed, []
+        return freed
+
+    def _place(self, width: int, height: int) -> Optional[Tuple[int, int, _Shelf]]:
+        best = None
+        for shelf in self._shelves:
+            if shelf.height >= height and shelf.x + width <= self.width:
+                if best is None or shelf.height < best.height:
+                    best = shelf
+        if best is None:
+            top = self._shelves[-1].y + self._shelves[-1].height if self._shelves else self.padding
+            if top + height > self.height or self.padding + width > self.width:
+                return None
+            best = _Shelf(top, height, self.padding)
+            self._shelves.append(best)
+        x = best.x
+        best.x += width
+        return x, best.y, best
+
+    def _lru_shelf(self, pinned: Iterable[object]) -> Optional[_Shelf]:
+        pinned = set(pinned)
+        oldest, oldest_used = None, None
+        for shelf in self._shelves:
+            if not shelf.keys or any(key in pinned for key in shelf.keys):
+                continue
+            used = max(self._used.get(key, 0) for key in shelf.keys)
+            if oldest is None or used < oldest_used:
+                oldest, oldest_used = shelf, used
+        return oldest
+
+    def _clear(self, shelf: _Shelf) -> List[object]:
+        evicted = shelf.keys
+        for key in evicted:
+            del self._owner[key]
+            del self._rects[key]
+            self._used.pop(key, None)
+        shelf.keys = []
+        shelf.x = self.padding
+        self._freed.append((0, shelf.y, self.width, shelf.height))
+        # empty shelves at the bottom give their height back
+        while self._shelves and not self._shelves[-1].keys:
+            self._shelves.pop()
+        return evicted
+
+    def remove(self, key: object) -> None:
+        """Forget a key (its space is reclaimed when its shelf is emptied)."""
+        shelf = self._owner.pop(key)
+        shelf.keys.remove(key)
+        self._freed.append(self._rects.pop(key))
+        self._used.pop(key, None)
+        if not shelf.keys:
+            shelf.x = self.padding
+            while self._shelves and not self._shelves[-1].keys:
+                self._shelves.pop()
+
+    def insert(self, key: object, width: int, height: int, evict: bool=False,
+               pinned: Iterable[object]=()) -> Tuple[Optional[Tuple[int, int]], List[object]]:
+        """Pack a width x height rectangle, returns ((x, y) or None, evicted keys)."""
+        if key in self._rects:
+            self.remove(key)
+        padded_width = width + self.padding
+        padded_height = height + self.padding
+        evicted = []
+        placed = self._place(padded_width, padded_height)
+        while placed is None and evict:
+            shelf = self._lru_shelf(pinned)
+            if shelf is None:
+                break
+            evicted.extend(self._clear(shelf))
+            placed = self._place(padded_width, padded_height)
+        if placed is None:
+            return None, evicted
+
+        x, y, shelf = placed
+        shelf.keys.append(key)
+        self._owner[key] = shelf
+        self._rects[key] = (x, y, width, height)
+        self.touch(key)
+        return (x, y), evicted
+
+
+class DynamicFontAtlas(object):
+    """Font atlas filled with glyphs rasterized on first use."""
+
+    def __init__(self, file_name: AnyStr, font_size: int, size: int=256, max_size: int=2048,
+                 padding: int=1, sdf: bool=False) -> None:
+        self.file_name = file_name
+        self.font_size = font_size
+        self.max_size = max_size
+        self.sdf = sdf
+        self.packer = ShelfPacker(size, size, padding)
+        # GRAY_ALPHA pixels: white luminance, glyph coverage in alpha (tintable)
+        self.pixels = np.zeros((size, size, 2), dtype=np.uint8)
+        self.pixels[:, :, 0] = 255
+        self.texture = None  # type: Optional[Texture2D]
+        self.glyphs = {}  # type: Dict[int, Tuple[int, int, int]]
+        self._glyph_infos = None
+        self._recs = None
+        self._font = None  # type: Optional[Font]
+        self._font_key = None  # type: Optional[tuple]
+        self._dirty = True
+        self._resized = True
+
+    def __contains__(self, codepoint: int) -> bool:
+        return codepoint in self.glyphs
+
+    def __len__(self) -> int:
+        return len(self.glyphs)
+
+    def __str__(self) -> str:
+        return "(DYNAMICFONTATLAS: {}x{}, glyphs: {}, fontSize: {})".format(
+            self.packer.width, self.packer.height, len(self.glyphs), self.font_size
+        )
+
+    def ensure(self, text: Union[AnyStr, Sequence[int]]) -> List[int]:
+        """Make sure every codepoint of text is in the atlas, returns the codepoints."""
+        codepoints = load_codepoints(text) if isinstance(text, (str, bytes)) else list(text)
+        missing = []
+        for codepoint in codepoints:
+            if codepoint in self.glyphs:
+                self.packer.touch(codepoint)
+            elif codepoint not in missing:
+                missing.append(codepoint)
+        if missing:
+            self._rasterize(missing, pinned=codepoints)
+        return codepoints
+
+    def _grow(self) -> bool:
+        width, height = self.packer.width, self.packer.height
+        if width >= self.max_size and height >= self.max_size:
+            return False
+        # grow the shorter side first so the atlas stays close to square
+        if height < width:
+            height = min(height * 2, self.max_size)
+        else:
+            width = min(width * 2, self.max_size)
+        pixels = np.zeros((height, width, 2), dtype=np.uint8)
+        pixels[:, :, 0] = 255
+        pixels[:self.pixels.shape[0], :self.pixels.shape[1]] = self.pixels
+        self.pixels = pixels
+        self.packer.grow(width, height)
+        self._resized = True
+        return True
+
+    def _rasterize(self, codepoints: List[int], pinned: Iterable[int]) -> None:
+        chars = load_font_data(self.file_name, self.font_size, codepoints, len(codepoints), self.sdf)
+        if not chars:
+            raise ValueError("Cannot rasterize glyphs from '{}'.".format(self.file_name))
+
+        try:
+            for i, codepoint in enumerate(codepoints):
+                info = chars[i]
+                width, height = info.image.width, info.image.height
+                position, evicted = self.packer.insert(codepoint, width, height)
+                while position is None and self._grow():
+                    position, evicted = self.packer.insert(codepoint, width, height)
+                if position is None:
+                    position, evicted = self.packer.insert(codepoint, width, height, evict=True, pinned=pinned)
+                if position is None:
+                    raise ValueError("Font atlas is too small ({0}x{0}) for the glyphs of one text.".format(self.max_size))
+
+                for key in evicted:
+                    self._erase(key)
+                # evicted glyphs must not show through the padding of the new ones
+                for fx, fy, fw, fh in self.packer.pop_freed():
+                    self.pixels[fy:fy + fh, fx:fx + fw, 1] = 0
+                x, y = position
+                # glyph images are GRAYSCALE: one coverage byte per pixel
+                data = info.image.data
+                if data and width and height:
+                    bitmap = cast(data, POINTER(c_ubyte * (width * height))).contents
+                    self.pixels[y:y + height, x:x + width, 1] = np.frombuffer(bitmap, dtype=np.uint8).reshape(height, width)
+                self.glyphs[codepoint] = (info.offsetX, info.offsetY, info.advanceX)
+        finally:
+            unload_font_data(chars, len(codepoints))
+
+        self._font = None
+        self._dirty = True
+
+    def _erase(self, codepoint: int) -> None:
+        del self.glyphs[codepoint]
+        self._font = None
+        self._dirty = True
+
+    def upload(self) -> Texture2D:
+        """Send pending atlas changes to the GPU (needs an OpenGL context)."""
+        if self._resized and self.texture is not None:
+            unload_texture(self.texture)
+            self.texture = None
+        if self.texture is None:
+            self.texture = load_texture_from_image(self.image)
+        elif self._dirty:
+            update_texture(self.texture, self.pixels.ctypes.data)
+        self._dirty = False
+        self._resized = False
+        self._font = None
+        return self.texture
+
+    @property
+    def image(self) -> Image:
+        """CPU side atlas as an Image (shares memory with self.pixels)."""
+        height, width = self.pixels.shape[:2]
+        return Image(self.pixels.ctypes.data, width, height, 1, UNCOMPRESSED_GRAY_ALPHA)
+
+    @property
+    def font(self) -> Font:
+        """Font made of the glyphs currently in the atlas."""
+        if self._dirty or self._resized or self.texture is None:
+            self.upload()
+        if self._font is None:
+            codepoints = sorted(self.glyphs)
+            self._glyph_infos = (GlyphInfo * len(codepoints))()
+            self._recs = (Rectangle * len(codepoints))()
+            for i, codepoint in enumerate(codepoints):
+                x, y, width, height = self.packer.rect(codepoint)
+                offset_x, offset_y, advance_x = self.glyphs[codepoint]
+                info = self._glyph_infos[i]
+                info.value = codepoint
+                info.offsetX = offset_x
+                info.offsetY = offset_y
+                info.advanceX = advance_x
+                self._recs[i] = Rectangle(float(x), float(y), float(width), float(height))
+            font = Font()
+            font.texture = self.texture
+            font.baseSize = self.font_size
+            font.glyphCount = len(codepoints)
+            font.glyphPadding = self.packer.padding
+            font.glyphs = self._glyph_infos
+            font.recs = self._recs
+            # measurements and glyph tables of the replaced font may not match the new one
+            if self._font_key is not None:
+                _forget_font(self._font_key)
+            self._font = font
+            self._font_key = _font_key(font)
+        return self._font
+
+    def measure_text(self, text: AnyStr, font_size: float, spacing: float) -> Vector2:
+        """Measure text, rasterizing its glyphs first."""
+        self.ensure(text)
+        return measure_text_ex(self.font, text, font_size, spacing)
+
+    def draw_text(self, text: AnyStr, position: Union[Vector2, Seq], font_size: float, spacing: float,
+                  tint: Union[Color, Seq]=WHITE) -> None:
+        """Draw text, rasterizing its glyphs first."""
+        self.ensure(text)
+        draw_text_ex(self.font, text, position, font_size, spacing, tint)
+
+    def unload(self) -> None:
+        """Unload the atlas texture (glyphs and recs are owned by Python, not raylib)."""
+        if self.texture is not None:
+            unload_texture(self.texture)
+            self.texture = None
+        if self._font_key is not None:
+            _forget_font(self._font_key)
+            self._font_key = None
+        self._font = None
+        self._glyph_infos = None
+        self._recs = None
+        self._resized = True
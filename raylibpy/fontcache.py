@@ -0,0 +1,174 @@
+# fontcache.py
+
+#   Persistent on-disk cache of rasterized font atlases
+#
+#   Rasterizing a TTF with load_font_data() + gen_image_font_atlas() takes hundreds
+#   of milliseconds at large sizes. load_font_cached() stores the resulting atlas
+#   pixels and glyph metrics in a cache file keyed by a hash of the font file,
+#   the size, the codepoint set and the SDF flag, and later rebuilds the Font from
+#   that file without touching the TTF rasterizer.
+#
+#   Example:
+#
+#   font = load_font_cached("resources/KAISG.ttf", 48)
+#   ...
+#   unload_font(font)
+#
+#   Cached fonts own their memory exactly like load_font_ex() ones (glyphs and
+#   recs are allocated with mem_alloc()), so unload_font() is the right way to
+#   release them. They carry no glyph images, so they are meant for drawing on
+#   screen rather than for image_draw_text_ex().
+
+import hashlib
+import os
+import struct
+from ctypes import addressof, c_ubyte, cast, memset, sizeof
+from pathlib import Path
+from typing import AnyStr, Optional, Sequence, Union
+
+from . import (
+    Font,
+    GlyphInfo,
+    GlyphInfoPtr,
+    Image,
+    Rectangle,
+    RectanglePtr,
+    gen_image_font_atlas,
+    get_pixel_data_size,
+    load_font_data,
+    load_texture_from_image,
+    mem_alloc,
+    unload_image,
+    _str_out,
+)
+
+__all__ = [
+    'FONT_CACHE_DIR',
+    'font_cache_key',
+    'load_font_cached',
+    'clear_font_cache',
+]
+
+
+if 'RAYLIBPY_CACHE_DIR' in os.environ:
+    FONT_CACHE_DIR = Path(os.environ['RAYLIBPY_CACHE_DIR']) / 'fonts'
+else:
+    FONT_CACHE_DIR = Path.home() / '.cache' / 'raylibpy' / 'fonts'
+
+_MAGIC = b'RLFC'
+_VERSION = 1
+_ATLAS_PADDING = 2
+_DEFAULT_CHARS = tuple(range(32, 127))
+
+# magic, version, atlas width, height, format, baseSize, glyphCount
+_HEADER = struct.Struct('<4s6i')
+# value, rec (x, y, width, height), offsetX, offsetY, advanceX
+_GLYPH = struct.Struct('<i4f3i')
+
+
+def font_cache_key(file_name: AnyStr, font_size: int, font_chars: Optional[Sequence[int]]=None, sdf: bool=False) -> str:
+    """Cache key of a rasterized font: hash of file contents and rasterization parameters."""
+    digest = hashlib.sha1()
+    with open(_str_out(file_name), 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    codepoints = _DEFAULT_CHARS if font_chars is None else tuple(font_chars)
+    digest.update(struct.pack('<3i', _VERSION, int(font_size), int(bool(sdf))))
+    digest.update(struct.pack('<{}i'.format(len(codepoints)), *codepoints))
+    return digest.hexdigest()
+
+
+def _write_cache(path: Path, atlas: Image, font_size: int, glyphs: GlyphInfoPtr, recs: RectanglePtr, count: int) -> None:
+    size = get_pixel_data_size(atlas.width, atlas.height, atlas.format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp{}'.format(os.getpid()))
+    with open(str(tmp_path), 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, atlas.width, atlas.height, atlas.format, font_size, count))
+        for i in range(count):
+            info = glyphs[i]
+            rec = recs[i]
+            f.write(_GLYPH.pack(info.value, rec.x, rec.y, rec.width, rec.height, info.offsetX, info.offsetY, info.advanceX))
+        f.write((c_ubyte * size).from_address(atlas.data))
+    # readers never see a half written file
+    os.replace(str(tmp_path), str(path))
+
+
+def _read_cache(path: Path) -> Optional[Font]:
+    try:
+        with open(str(path), 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, width, height, pixel_format, base_size, count = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION or count < 0:
+                return None
+            table = f.read(_GLYPH.size * count)
+            # the atlas is read straight into the buffer the Image points at, no copies
+            size = get_pixel_data_size(width, height, pixel_format)
+            pixels = bytearray(size)
+            if len(table) != _GLYPH.size * count or f.readinto(pixels) != size or f.read(1):
+                return None
+    except OSError:
+        return None
+
+    # glyphs and recs go on raylib's heap so unload_font() can release them
+    glyphs = cast(mem_alloc(sizeof(GlyphInfo) * count), GlyphInfoPtr)
+    memset(glyphs, 0, sizeof(GlyphInfo) * count)
+    recs = cast(mem_alloc(sizeof(Rectangle) * count), RectanglePtr)
+    for i, glyph in enumerate(_GLYPH.iter_unpack(table)):
+        value, x, y, w, h, offset_x, offset_y, advance_x = glyph
+        recs[i] = Rectangle(x, y, w, h)
+        info = glyphs[i]
+        info.value = value
+        info.offsetX = offset_x
+        info.offsetY = offset_y
+        info.advanceX = advance_x
+
+    atlas = Image(addressof((c_ubyte * size).from_buffer(pixels)), width, height, 1, pixel_format)
+
+    font = Font()
+    font.texture = load_texture_from_image(atlas)
+    font.baseSize = base_size
+    font.glyphCount = count
+    font.glyphPadding = _ATLAS_PADDING
+    font.recs = recs
+    font.glyphs = glyphs
+    return font
+
+
+def load_font_cached(file_name: AnyStr, font_size: int, font_chars: Optional[Sequence[int]]=None, sdf: bool=False,
+                     cache_dir: Optional[Union[str, Path]]=None) -> Font:
+    """Load a font, reusing the rasterized atlas from a previous run when available."""
+    cache_dir = FONT_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    path = cache_dir / (font_cache_key(file_name, font_size, font_chars, sdf) + '.rlfc')
+    font = _read_cache(path)
+    if font is not None:
+        return font
+
+    codepoints = _DEFAULT_CHARS if font_chars is None else tuple(font_chars)
+    count = len(codepoints)
+    glyphs = load_font_data(file_name, font_size, codepoints, count, sdf)
+    if not glyphs:
+        raise ValueError("Cannot rasterize font '{}'.".format(_str_out(file_name)))
+    atlas, recs = gen_image_font_atlas(glyphs, font_size, count, _ATLAS_PADDING, 0)
+    _write_cache(path, atlas, font_size, glyphs, recs, count)
+
+    font = Font()
+    font.texture = load_texture_from_image(atlas)
+    font.baseSize = font_size
+    font.glyphCount = count
+    font.glyphPadding = _ATLAS_PADDING
+    font.recs = recs
+    font.glyphs = glyphs
+    unload_image(atlas)
+    return font
+
+
+def clear_font_cache(cache_dir: Optional[Union[str, Path]]=None) -> int:
+    """Delete cached font atlases, returns the number of files removed."""
+    cache_dir = FONT_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    removed = 0
+    for path in cache_dir.glob('*.rlfc'):
+        path.unlink()
+        removed += 1
+    return removed
@@ -0,0 +1,272 @@
+# gifrecorder.py
+
+#   Background screen recording to animated GIF
+#
+#   take_screenshot() encodes a PNG on the calling thread and stalls the frame.
+#   GifRecorder only copies pixels on the calling thread: captured frames are
+#   (optionally downscaled and) copied into a preallocated ring of pixel
+#   buffers, and a background thread feeds them to the msf_gif encoder bundled
+#   in raylib, which writes the GIF to disk as it goes.
+#
+#   Example:
+#
+#   recorder = GifRecorder("capture.gif", scale=2, every=2)   # half size, every other frame
+#   while not window_should_close():
+#       begin_drawing()
+#       ...
+#       end_drawing()
+#       recorder.capture()
+#   recorder.close()
+#
+#   add_frame() takes pixels from an Image or a NumPy array instead of the
+#   screen, so recordings can also be produced without a window. Frames arriving
+#   while every ring slot is still waiting for the encoder are dropped, the game
+#   loop never waits. Frame delays come from capture times (or the timestamps
+#   given), rounded to the 1/100 s GIF resolution without drifting.
+
+import threading
+import time
+from ctypes import CFUNCTYPE, POINTER, Structure, byref, c_int, c_int16, c_size_t, c_uint32, c_void_p, string_at
+from queue import Queue
+from typing import AnyStr, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    Image,
+    PixelFormat,
+    load_image_from_screen,
+    unload_image,
+    _rl,
+    _str_out,
+)
+
+__all__ = [
+    'GifRecorder',
+]
+
+
+# msf_gif 2.2 as compiled into raylib 4.0
+class _MsfCookedFrame(Structure):
+    _fields_ = [
+        ('pixels', POINTER(c_uint32)),
+        ('depth', c_int),
+        ('count', c_int),
+        ('rbits', c_int),
+        ('gbits', c_int),
+        ('bbits', c_int),
+    ]
+
+
+_MsfGifFileWriteFunc = CFUNCTYPE(c_size_t, c_void_p, c_size_t, c_size_t, c_void_p)
+
+
+class _MsfGifState(Structure):
+    _fields_ = [
+        ('fileWriteFunc', _MsfGifFileWriteFunc),
+        ('fileWriteData', c_void_p),
+        ('previousFrame', _MsfCookedFrame),
+        ('currentFrame', _MsfCookedFrame),
+        ('lzwMem', POINTER(c_int16)),
+        ('listHead', c_void_p),
+        ('listTail', c_void_p),
+        ('width', c_int),
+        ('height', c_int),
+        ('customAllocatorContext', c_void_p),
+        ('framesSubmitted', c_int),
+    ]
+
+
+_rl.msf_gif_begin_to_file.argtypes = [POINTER(_MsfGifState), c_int, c_int, _MsfGifFileWriteFunc, c_void_p]
+_rl.msf_gif_begin_to_file.restype = c_int
+_rl.msf_gif_frame_to_file.argtypes = [POINTER(_MsfGifState), c_void_p, c_int, c_int, c_int]
+_rl.msf_gif_frame_to_file.restype = c_int
+_rl.msf_gif_end_to_file.argtypes = [POINTER(_MsfGifState)]
+_rl.msf_gif_end_to_file.restype = c_int
+
+_DEFAULT_DELAY = 0.1  # seconds, for a single frame recording
+
+
+class GifRecorder(object):
+    """
+    Records frames to an animated GIF, encoding on a background thread.
+
+    scale keeps every scale-th pixel in both directions, every keeps one frame
+    out of every calls to capture()/add_frame(), slots is the number of
+    preallocated frame buffers and bit_depth (1-16) the color depth msf_gif
+    quantizes to. width and height are those of the captured frames (before
+    scaling) and default to the size of the first one.
+    """
+
+    def __init__(self, file_name: AnyStr, width: Optional[int]=None, height: Optional[int]=None, scale: int=1,
+                 every: int=1, slots: int=8, bit_depth: int=16) -> None:
+        if scale < 1 or every < 1 or slots < 1 or not 1 <= bit_depth <= 16:
+            raise ValueError("Invalid recorder settings: scale {}, every {}, slots {}, bit depth {}.".format(
+                scale, every, slots, bit_depth
+            ))
+        self.file_name = _str_out(file_name)
+        self.scale = scale
+        self.every = every
+        self.slots = slots
+        self.bit_depth = bit_depth
+        self.width = width
+        self.height = height
+        self.calls = 0
+        self.captured = 0
+        self.dropped = 0
+        self.encoded = 0
+        self.error = None  # type: Optional[BaseException]
+        self._file = open(self.file_name, 'wb')
+        self._ring = None  # type: Optional[np.ndarray]
+        self._free = Queue()
+        self._filled = Queue()
+        self._thread = None  # type: Optional[threading.Thread]
+        if width is not None and height is not None:
+            self._start(width, height)
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        """Size of the encoded frames (after scaling)."""
+        return -(-self.width // self.scale), -(-self.height // self.scale)
+
+    def _start(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        frame_width, frame_height = self.frame_size
+        self._ring = np.empty((self.slots, frame_height, frame_width, 4), dtype=np.uint8)
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._thread = threading.Thread(target=self._encode, name='raylibpy-gif', daemon=True)
+        self._thread.start()
+
+    def _encode(self) -> None:
+        # encoder thread: msf_gif releases the GIL while quantizing and compressing
+        frame_width, frame_height = self.frame_size
+        state = _MsfGifState()
+
+        def write(buffer: int, size: int, count: int, stream: int) -> int:
+            try:
+                self._file.write(string_at(buffer, size * count))
+            except Exception as e:
+                self.error = e
+                return 0
+            return count
+
+        writer = _MsfGifFileWriteFunc(write)
+        started = _rl.msf_gif_begin_to_file(byref(state), frame_width, frame_height, writer, None)
+        if not started:
+            self.error = MemoryError("Cannot start GIF encoder for '{}'.".format(self.file_name))
+        start = None
+        written = 0  # centiseconds already given to encoded frames
+        held = None  # the delay of a frame is known once the next one arrives
+        while True:
+            item = self._filled.get()
+            if held is not None:
+                slot, timestamp = held
+                end = item[1] if item is not None else timestamp + (
+                    (timestamp - start) / self.encoded if self.encoded else _DEFAULT_DELAY
+                )
+                delay = max(int(round((end - start) * 100.0)) - written, 1)
+                if self.error is None:
+                    pixels = self._ring[slot]
+                    if _rl.msf_gif_frame_to_file(byref(state), pixels.ctypes.data, delay, self.bit_depth,
+                                                 pixels.strides[0]):
+                        written += delay
+                        self.encoded += 1
+                    elif self.error is None:
+                        self.error = MemoryError("GIF encoder failed on frame {}.".format(self.encoded))
+                self._free.put(slot)
+            if item is None:
+                break
+            if start is None:
+                start = item[1]
+            held = item
+        if started:
+            _rl.msf_gif_end_to_file(byref(state))
+
+    def _should_capture(self) -> bool:
+        self.calls += 1
+        return (self.calls - 1) % self.every == 0
+
+    def add_frame(self, pixels: Union[Image, np.ndarray], timestamp: Optional[float]=None) -> bool:
+        """
+        Queue a frame (UNCOMPRESSED_R8G8B8A8 Image or (height, width, 4) uint8 array).
+
+        timestamp is in seconds (time.perf_counter() by default). Returns False
+        when the frame was skipped or dropped.
+        """
+        if not self._should_capture():
+            return False
+        return self._add(pixels, time.perf_counter() if timestamp is None else timestamp)
+
+    def capture(self, timestamp: Optional[float]=None) -> bool:
+        """Queue the current screen contents (call after end_drawing()), see add_frame()."""
+        if not self._should_capture():
+            return False
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        if self._ring is not None and self._free.empty():
+            # skip the screen read too
+            self.dropped += 1
+            return False
+        image = load_image_from_screen()
+        try:
+            return self._add(image, timestamp)
+        finally:
+            unload_image(image)
+
+    def _add(self, pixels: Union[Image, np.ndarray], timestamp: float) -> bool:
+        if self._file is None:
+            raise ValueError("GIF recorder for '{}' is closed.".format(self.file_name))
+        if isinstance(pixels, Image):
+            if pixels.format != PixelFormat.UNCOMPRESSED_R8G8B8A8:
+                raise ValueError("GIF frames must be UNCOMPRESSED_R8G8B8A8, got format {}.".format(pixels.format))
+            pixels = pixels.as_array()
+        if pixels.ndim != 3 or pixels.shape[2] != 4 or pixels.dtype != np.uint8:
+            raise ValueError("GIF frames must be (height, width, 4) uint8 arrays, got {} {}.".format(
+                pixels.shape, pixels.dtype
+            ))
+        if self._ring is None:
+            self._start(pixels.shape[1], pixels.shape[0])
+        elif pixels.shape[:2] != (self.height, self.width):
+            raise ValueError("Frame is {}x{}, the recording is {}x{}.".format(
+                pixels.shape[1], pixels.shape[0], self.width, self.height
+            ))
+        if self._free.empty():
+            self.dropped += 1
+            return False
+        slot = self._free.get()
+        np.copyto(self._ring[slot], pixels[::self.scale, ::self.scale])
+        self._filled.put((slot, timestamp))
+        self.captured += 1
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Frames captured but not encoded yet."""
+        return self.captured - self.encoded
+
+    def close(self) -> None:
+        """Encode the remaining frames and finish the file (raises if encoding or writing failed)."""
+        if self._file is None:
+            return
+        if self._thread is not None:
+            self._filled.put(None)
+            self._thread.join()
+            self._thread = None
+        self._file.close()
+        self._file = None
+        self._ring = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> 'GifRecorder':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return "(GIFRECORDER: {}: {}x{} / {}, every {}: captured: {}, dropped: {}, encoded: {})".format(
+            self.file_name, self.width, self.height, self.scale, self.every,
+            self.captured, self.dropped, self.encoded
+        )
@@ -0,0 +1,204 @@
+# imagecache.py
+
+#   Disk cache of processed images
+#
+#   Startup code often runs the same load_image() -> image_resize() ->
+#   image_format() -> image_mipmaps() chain on the same files every time.
+#   load_image_cached() stores the resulting pixel data (all mipmap levels, raw)
+#   with its metadata under a key of source path and processing recipe, so later
+#   runs read the finished pixels back and skip both decoding and processing.
+#
+#   Example:
+#
+#   recipe = ImagePipeline().resize(512, 512).format(UNCOMPRESSED_R5G6B5).mipmaps()
+#   image = load_image_cached("resources/parrots.png", recipe)
+#   texture = load_texture_from_image(image)
+#   unload_image(image)
+#
+#   Entries remember size, mtime and SHA-1 of their source: an entry is used
+#   as-is while size and mtime are unchanged, rehashed when they differ and
+#   rebuilt when the contents changed. The cache directory is kept under
+#   max_bytes by deleting the least recently used entries.
+
+import hashlib
+import os
+import struct
+from ctypes import c_ubyte
+from pathlib import Path
+from typing import AnyStr, Optional, Sequence, Union
+
+from . import (
+    Image,
+    get_pixel_data_size,
+    load_image,
+    mem_alloc,
+    unload_image,
+    _str_out,
+)
+from .pipeline import ImagePipeline, Operation, apply_operations
+
+__all__ = [
+    'IMAGE_CACHE_DIR',
+    'IMAGE_CACHE_MAX_BYTES',
+    'image_cache_key',
+    'load_image_cached',
+    'trim_image_cache',
+    'clear_image_cache',
+]
+
+
+if 'RAYLIBPY_CACHE_DIR' in os.environ:
+    IMAGE_CACHE_DIR = Path(os.environ['RAYLIBPY_CACHE_DIR']) / 'images'
+else:
+    IMAGE_CACHE_DIR = Path.home() / '.cache' / 'raylibpy' / 'images'
+
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_MAGIC = b'RLIC'
+_VERSION = 1
+
+# magic, version, width, height, mipmaps, format, data size, source size, source mtime (ns), source sha1
+_HEADER = struct.Struct('<4s5iQqq20s')
+
+Recipe = Union[ImagePipeline, Sequence[Operation], None]
+
+
+def _operations(recipe: Recipe) -> Sequence[Operation]:
+    if recipe is None:
+        return ()
+    return recipe.operations if isinstance(recipe, ImagePipeline) else recipe
+
+
+def _recipe_text(operations: Sequence[Operation]) -> str:
+    steps = []
+    for operation, args in operations:
+        if not isinstance(operation, str):
+            operation = '{}.{}'.format(operation.__module__, operation.__qualname__)
+        steps.append('{}{!r}'.format(operation, tuple(args)))
+    return ';'.join(steps)
+
+
+def image_cache_key(file_name: AnyStr, recipe: Recipe=None) -> str:
+    """Cache key of a processed image: hash of the absolute source path and the recipe."""
+    digest = hashlib.sha1()
+    digest.update(os.path.abspath(_str_out(file_name)).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(_recipe_text(_operations(recipe)).encode('utf-8'))
+    digest.update(struct.pack('<i', _VERSION))
+    return digest.hexdigest()
+
+
+def _file_sha1(path: str) -> bytes:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _mipmaps_size(width: int, height: int, pixel_format: int, mipmaps: int) -> int:
+    size = 0
+    for _ in range(max(mipmaps, 1)):
+        size += get_pixel_data_size(width, height, pixel_format)
+        width, height = max(width // 2, 1), max(height // 2, 1)
+    return size
+
+
+def _read_entry(path: Path, source: str, stat: os.stat_result) -> Optional[Image]:
+    # None for missing, damaged or stale entries (the caller overwrites them)
+    try:
+        f = open(str(path), 'rb')
+    except OSError:
+        return None
+    with f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            return None
+        magic, version, width, height, mipmaps, pixel_format, size, source_size, source_mtime, sha1 = \
+            _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or size != _mipmaps_size(width, height, pixel_format, mipmaps):
+            return None
+        touched = source_size != stat.st_size or source_mtime != stat.st_mtime_ns
+        if touched and _file_sha1(source) != sha1:
+            return None
+
+        # pixels go on raylib's heap so unload_image() can release them
+        image = Image(mem_alloc(size), width, height, mipmaps, pixel_format)
+        if f.readinto((c_ubyte * size).from_address(image.data)) != size:
+            unload_image(image)
+            return None
+    if touched:
+        # same contents, new mtime: remember it to skip hashing next time
+        with open(str(path), 'r+b') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, width, height, mipmaps, pixel_format, size,
+                                 stat.st_size, stat.st_mtime_ns, sha1))
+    # mark as recently used for trim_image_cache()
+    os.utime(str(path))
+    return image
+
+
+def _write_entry(path: Path, image: Image, source: str, stat: os.stat_result) -> None:
+    size = _mipmaps_size(image.width, image.height, image.format, image.mipmaps)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp{}'.format(os.getpid()))
+    with open(str(tmp_path), 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, image.width, image.height, image.mipmaps, image.format, size,
+                             stat.st_size, stat.st_mtime_ns, _file_sha1(source)))
+        f.write((c_ubyte * size).from_address(image.data))
+    # readers never see a half written file
+    os.replace(str(tmp_path), str(path))
+
+
+def load_image_cached(file_name: AnyStr, recipe: Recipe=None, cache_dir: Optional[Union[str, Path]]=None,
+                      max_bytes: Optional[int]=IMAGE_CACHE_MAX_BYTES) -> Image:
+    """Load and process an image, reusing the processed pixels of a previous run when valid."""
+    cache_dir = IMAGE_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    source = _str_out(file_name)
+    operations = _operations(recipe)
+    stat = os.stat(source)
+    path = cache_dir / (image_cache_key(source, operations) + '.rlic')
+
+    image = _read_entry(path, source, stat)
+    if image is not None:
+        return image
+
+    image = load_image(source)
+    if not image.data:
+        raise ValueError("Cannot load image '{}'.".format(source))
+    apply_operations(image, operations)
+    _write_entry(path, image, source, stat)
+    if max_bytes is not None:
+        trim_image_cache(max_bytes, cache_dir)
+    return image
+
+
+def trim_image_cache(max_bytes: int, cache_dir: Optional[Union[str, Path]]=None) -> int:
+    """Delete least recently used entries until the cache fits in max_bytes, returns the number removed."""
+    cache_dir = IMAGE_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    entries = []
+    total = 0
+    for path in cache_dir.glob('*.rlic'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total += stat.st_size
+
+    removed = 0
+    entries.sort()
+    for mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_image_cache(cache_dir: Optional[Union[str, Path]]=None) -> int:
+    """Delete every cached image, returns the number of files removed."""
+    return trim_image_cache(0, cache_dir)
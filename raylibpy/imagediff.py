@@ -0,0 +1,371 @@
+# imagediff.py
+
+#   Image comparison for visual regression tests
+#
+#   Rendered scenes are compared against golden files with vectorized NumPy
+#   code working directly on the image pixels (zero-copy for the 8 bit and 32 bit
+#   float uncompressed formats): a per-pixel diff with tolerance, a heatmap
+#   Image of where they differ, an SSIM score for "how similar" and a DCT
+#   perceptual hash for cheap "changed or not" screening of stored renders.
+#   compare_images() runs all of it over many file pairs in a process pool.
+#
+#   Example:
+#
+#   diff = image_diff(golden, actual, tolerance=2)
+#   if diff.changed:
+#       heat = diff.heatmap(actual)
+#       export_image("failures/scene1_diff.png", heat)
+#       unload_image(heat)
+#   print(image_ssim(golden, actual), hash_distance(image_phash(golden), image_phash(actual)))
+#
+#   for result in compare_images(zip(goldens, renders), tolerance=2, heatmap_dir="failures"):
+#       if not result.ok or result.changed:
+#           print(result)
+#
+#   Functions take Images or (height, width, channels) arrays of equal size;
+#   images in packed 16 bit or compressed formats, and pairs of images with
+#   different layouts, are converted to 8 bit RGBA first. Tolerances and deltas
+#   are in the units of the pixels: 0-255 for 8 bit data, 0.0-1.0 for floats.
+
+import os
+import time
+from typing import AnyStr, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    Image,
+    export_image,
+    image_from_array,
+    load_image,
+    load_image_colors,
+    unload_image,
+    _PIXEL_LAYOUTS,
+    _pool_imap,
+    _str_out,
+)
+
+__all__ = [
+    'ImageDiff',
+    'image_diff',
+    'image_ssim',
+    'image_phash',
+    'hash_distance',
+    'CompareResult',
+    'compare_images',
+]
+
+Pixels = Union[Image, np.ndarray]
+
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _pixels(pixels: Pixels, rgba: bool=False) -> np.ndarray:
+    if isinstance(pixels, Image):
+        layout = _PIXEL_LAYOUTS.get(pixels.format)
+        # packed 16 bit pixels have no per channel view
+        if rgba or layout is None or layout[0] == 'uint16':
+            return load_image_colors(pixels)
+        return pixels.as_array()
+    if pixels.ndim == 2:
+        return pixels[:, :, None]
+    return pixels
+
+
+def _pair(a: Pixels, b: Pixels) -> Tuple[np.ndarray, np.ndarray]:
+    pixels_a, pixels_b = _pixels(a), _pixels(b)
+    if pixels_a.shape != pixels_b.shape or pixels_a.dtype != pixels_b.dtype:
+        # e.g. an R8G8B8 golden against an R8G8B8A8 render: compare both as RGBA
+        if isinstance(a, Image):
+            pixels_a = _pixels(a, True)
+        if isinstance(b, Image):
+            pixels_b = _pixels(b, True)
+    if pixels_a.shape != pixels_b.shape:
+        raise ValueError("Cannot compare images of shape {} and {}.".format(pixels_a.shape, pixels_b.shape))
+    return pixels_a, pixels_b
+
+
+def _value_range(dtype: np.dtype) -> float:
+    # value of a full intensity channel
+    if np.issubdtype(dtype, np.floating):
+        return 1.0
+    if dtype == np.uint16:
+        return 65535.0
+    return 255.0
+
+
+def _luminance(pixels: np.ndarray) -> np.ndarray:
+    # in 0-255 units whatever the pixel type, the SSIM constants assume that range
+    if pixels.shape[2] >= 3:
+        values = np.dot(pixels[:, :, :3].astype(np.float32), _LUMA)
+    else:
+        values = pixels[:, :, 0].astype(np.float32)
+    value_range = _value_range(pixels.dtype)
+    if value_range != 255.0:
+        values *= 255.0 / value_range
+    return values
+
+
+class ImageDiff(object):
+    """Per-pixel difference of two images: largest channel delta and the pixels beyond tolerance."""
+
+    __slots__ = ['delta', 'mask', 'tolerance']
+
+    def __init__(self, delta: np.ndarray, mask: np.ndarray, tolerance: Union[int, float]) -> None:
+        self.delta = delta
+        self.mask = mask
+        self.tolerance = tolerance
+
+    @property
+    def changed(self) -> int:
+        """Number of pixels differing by more than the tolerance."""
+        return int(np.count_nonzero(self.mask))
+
+    @property
+    def changed_ratio(self) -> float:
+        return self.changed / float(self.mask.size) if self.mask.size else 0.0
+
+    @property
+    def max_delta(self) -> Union[int, float]:
+        return self.delta.max().item() if self.delta.size else 0
+
+    @property
+    def mean_delta(self) -> float:
+        return float(self.delta.mean()) if self.delta.size else 0.0
+
+    @property
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """(x, y, width, height) around the changed pixels, None when nothing changed."""
+        rows = np.flatnonzero(self.mask.any(axis=1))
+        if not rows.size:
+            return None
+        columns = np.flatnonzero(self.mask.any(axis=0))
+        return int(columns[0]), int(rows[0]), int(columns[-1] - columns[0] + 1), int(rows[-1] - rows[0] + 1)
+
+    def heatmap(self, background: Optional[Pixels]=None) -> Image:
+        """
+        Changed pixels colored black-red-yellow-white by delta, as a new RGBA Image.
+
+        Unchanged pixels are transparent, or a dimmed grayscale copy of
+        background when given. Release the image with unload_image().
+        """
+        height, width = self.delta.shape
+        heat = np.zeros((height, width, 4), dtype=np.uint8)
+        if background is not None:
+            gray = (_luminance(_pixels(background)) * 0.35).astype(np.uint8)
+            heat[:, :, 0] = heat[:, :, 1] = heat[:, :, 2] = gray
+            heat[:, :, 3] = 255
+        t = self.delta[self.mask].astype(np.float32) * (3.0 / _value_range(self.delta.dtype))
+        ramp = np.empty((t.size, 4), dtype=np.uint8)
+        for channel in range(3):
+            ramp[:, channel] = np.clip((t - channel) * 255.0, 0, 255)
+        # even the smallest change past tolerance stays visible
+        ramp[:, 0] = np.maximum(ramp[:, 0], 96)
+        ramp[:, 3] = 255
+        heat[self.mask] = ramp
+        return image_from_array(heat)
+
+    def __str__(self) -> str:
+        return "(IMAGEDIFF: changed: {} ({:.3%}), max delta: {}, mean delta: {:.3f}, tolerance: {})".format(
+            self.changed, self.changed_ratio, self.max_delta, self.mean_delta, self.tolerance
+        )
+
+
+def image_diff(a: Pixels, b: Pixels, tolerance: Union[int, float]=0, alpha: bool=True) -> ImageDiff:
+    """Compare two images pixel by pixel, channels may differ by up to tolerance (alpha ignored with alpha=False)."""
+    a, b = _pair(a, b)
+    if not alpha and a.shape[2] == 4:
+        a, b = a[:, :, :3], b[:, :, :3]
+    dtype = np.result_type(a.dtype, b.dtype)
+    if np.issubdtype(dtype, np.floating):
+        delta = np.abs(a.astype(np.float64) - b).max(axis=2).astype(dtype)
+    else:
+        delta = np.abs(a.astype(np.int64) - b).max(axis=2)
+        if a.dtype == b.dtype:
+            # the difference of two values of one type fits that type
+            delta = delta.astype(dtype)
+    return ImageDiff(delta, delta > tolerance, tolerance)
+
+
+def _box_mean(values: np.ndarray, size: int) -> np.ndarray:
+    # mean over every size x size window ('valid' positions) from an integral image
+    integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0, dtype=np.float64), axis=1, out=integral[1:, 1:])
+    sums = integral[size:, size:] - integral[:-size, size:] - integral[size:, :-size] + integral[:-size, :-size]
+    return sums / float(size * size)
+
+
+def image_ssim(a: Pixels, b: Pixels, window: int=7, full: bool=False) -> Union[float, Tuple[float, np.ndarray]]:
+    """
+    Structural similarity of the luminance of two images (1.0 when identical).
+
+    Statistics are taken over window x window boxes; full=True also returns the
+    per-window SSIM map.
+    """
+    a, b = _pair(a, b)
+    x, y = _luminance(a), _luminance(b)
+    window = max(1, min(window, x.shape[0], x.shape[1]))
+    mu_x, mu_y = _box_mean(x, window), _box_mean(y, window)
+    var_x = _box_mean(x * x, window) - mu_x * mu_x
+    var_y = _box_mean(y * y, window) - mu_y * mu_y
+    cov = _box_mean(x * y, window) - mu_x * mu_y
+    ssim = ((2.0 * mu_x * mu_y + _SSIM_C1) * (2.0 * cov + _SSIM_C2)) / \
+           ((mu_x * mu_x + mu_y * mu_y + _SSIM_C1) * (var_x + var_y + _SSIM_C2))
+    score = float(ssim.mean())
+    return (score, ssim) if full else score
+
+
+_dct_matrices = {}
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    matrix = _dct_matrices.get(size)
+    if matrix is None:
+        k = np.arange(size)[:, None]
+        n = np.arange(size)[None, :]
+        matrix = np.cos(np.pi * (2 * n + 1) * k / (2.0 * size))
+        matrix[0] *= np.sqrt(1.0 / size)
+        matrix[1:] *= np.sqrt(2.0 / size)
+        _dct_matrices[size] = matrix
+    return matrix
+
+
+def _area_resize(values: np.ndarray, size: int) -> np.ndarray:
+    # mean of the source pixels falling into each of size x size cells
+    height, width = values.shape
+    if height < size or width < size:
+        values = np.repeat(np.repeat(values, -(-size // height), axis=0), -(-size // width), axis=1)
+        height, width = values.shape
+    rows = np.minimum((np.arange(size) * height) // size, height - 1)
+    columns = np.minimum((np.arange(size) * width) // size, width - 1)
+    sums = np.add.reduceat(np.add.reduceat(values, rows, axis=0), columns, axis=1)
+    counts = np.diff(np.append(rows, height))[:, None] * np.diff(np.append(columns, width))[None, :]
+    return sums / counts
+
+
+def image_phash(image: Pixels, hash_size: int=8) -> int:
+    """
+    Perceptual hash (DCT of the downscaled luminance) as a hash_size**2 bit integer.
+
+    Similar looking images get hashes a small hash_distance() apart, so stored
+    hashes tell quickly whether a render visibly changed.
+    """
+    size = hash_size * 4
+    pixels = _luminance(_pixels(image)).astype(np.float64)
+    small = _area_resize(pixels, size)
+    dct = _dct_matrix(size)
+    low = (dct @ small @ dct.T)[:hash_size, :hash_size].ravel()
+    # median without the DC term, which only tracks overall brightness
+    bits = low > np.median(low[1:])
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def hash_distance(a: int, b: int) -> int:
+    """Number of differing bits of two image_phash() values."""
+    return bin(a ^ b).count('1')
+
+
+class CompareResult(object):
+    """Outcome of comparing one pair of files, error holds the message when it could not be done."""
+
+    __slots__ = ['golden', 'actual', 'changed', 'changed_ratio', 'max_delta', 'ssim', 'hash_distance', 'heatmap',
+                 'seconds', 'error']
+
+    def __init__(self, golden: str, actual: str, changed: int=0, changed_ratio: float=0.0, max_delta: int=0,
+                 ssim: float=1.0, hash_distance: int=0, heatmap: Optional[str]=None, seconds: float=0.0,
+                 error: Optional[str]=None) -> None:
+        self.golden = golden
+        self.actual = actual
+        self.changed = changed
+        self.changed_ratio = changed_ratio
+        self.max_delta = max_delta
+        self.ssim = ssim
+        self.hash_distance = hash_distance
+        self.heatmap = heatmap
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            return "(COMPARERESULT: {} vs {}: error: {})".format(self.golden, self.actual, self.error)
+        return "(COMPARERESULT: {} vs {}: changed: {} ({:.3%}), max delta: {}, ssim: {:.4f}, hash distance: {})".format(
+            self.golden, self.actual, self.changed, self.changed_ratio, self.max_delta, self.ssim, self.hash_distance
+        )
+
+
+def _compare(golden: str, actual: str, tolerance: int, heatmap: Optional[str]) -> CompareResult:
+    # runs in the worker processes
+    start = time.perf_counter()
+    images = []
+    try:
+        for file_name in (golden, actual):
+            image = load_image(file_name)
+            if not image.data:
+                raise ValueError("Cannot load image '{}'.".format(file_name))
+            images.append(image)
+        diff = image_diff(images[0], images[1], tolerance)
+        result = CompareResult(golden, actual, diff.changed, diff.changed_ratio, diff.max_delta)
+        if result.changed:
+            result.ssim = image_ssim(images[0], images[1])
+            result.hash_distance = hash_distance(image_phash(images[0]), image_phash(images[1]))
+            if heatmap is not None:
+                directory = os.path.dirname(heatmap)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                heat = diff.heatmap(images[1])
+                try:
+                    if not export_image(heatmap, heat):
+                        raise ValueError("Cannot export image '{}'.".format(heatmap))
+                finally:
+                    unload_image(heat)
+                result.heatmap = heatmap
+    except Exception as e:
+        result = CompareResult(golden, actual, error='{}: {}'.format(type(e).__name__, e))
+    finally:
+        for image in images:
+            unload_image(image)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def compare_images(pairs: Iterable[Tuple[AnyStr, AnyStr]], tolerance: int=0, heatmap_dir: Optional[AnyStr]=None,
+                   workers: Optional[int]=None, max_pending: Optional[int]=None,
+                   root: Optional[AnyStr]=None) -> Iterator[CompareResult]:
+    """
+    Compare (golden, actual) file pairs, yielding results as they complete (not in input order).
+
+    SSIM and hash distance are only computed for pairs that changed, and a
+    heatmap '<actual name>_diff.png' is written to heatmap_dir for them when
+    given, keeping the path of actual relative to root when root is given
+    (the base name for files outside root). Two
+    different actual files that would share a heatmap raise ValueError before
+    the second pair is compared. workers=0 compares in the calling process; by
+    default a pool of os.cpu_count() processes is used with at most max_pending
+    (2 * workers) pairs in flight.
+    """
+    heatmap_dir = _str_out(heatmap_dir) if heatmap_dir is not None else None
+    root = _str_out(root) if root is not None else None
+    heatmaps = {}
+
+    def heatmap_of(actual: str) -> Optional[str]:
+        if heatmap_dir is None:
+            return None
+        relative = os.path.relpath(actual, root) if root is not None else os.path.basename(actual)
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            # outside root: never write outside heatmap_dir
+            relative = os.path.basename(actual)
+        heatmap = os.path.join(heatmap_dir, os.path.splitext(relative)[0] + '_diff.png')
+        first = heatmaps.setdefault(os.path.normcase(os.path.abspath(heatmap)), actual)
+        if os.path.abspath(first) != os.path.abspath(actual):
+            raise ValueError("{} and {} would both have their heatmap written to {}".format(first, actual, heatmap))
+        return heatmap
+
+    jobs = ((golden, actual, tolerance, heatmap_of(actual))
+            for golden, actual in ((_str_out(golden), _str_out(actual)) for golden, actual in pairs))
+    return _pool_imap(_compare, jobs, workers, max_pending)
@@ -0,0 +1,175 @@
+# loader.py
+
+#   Asynchronous asset loading: decode in worker threads, upload on the GL thread
+#
+#   Decoding files (load_image(), load_image_from_memory(), load_wave()) does not
+#   touch OpenGL, and ctypes releases the GIL while raylib works, so AsyncLoader
+#   runs it in a thread pool and returns concurrent.futures.Future objects.
+#   Textures also need a GPU upload, which must happen on the thread owning the
+#   GL context: decoded images are queued and pump(), called once per frame,
+#   uploads them until its time budget is spent.
+#
+#   Example:
+#
+#   loader = AsyncLoader(workers=4)
+#   background = loader.load_texture("resources/parrots.png")
+#   music_wave = loader.load_wave("resources/level1.wav")
+#   ...
+#   while not window_should_close():
+#       loader.pump(2.0)                    # at most ~2 ms of uploads per frame
+#       if background.done():
+#           draw_texture(background.result(), 0, 0, WHITE)
+#   ...
+#   loader.shutdown()
+#
+#   Image and wave futures never need pump(), so they work without a window.
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AnyStr, Callable, Union
+
+from . import (
+    Image,
+    Wave,
+    load_image,
+    load_image_from_memory,
+    load_texture_from_image,
+    load_wave,
+    load_wave_from_memory,
+    unload_image,
+    _str_out,
+)
+
+__all__ = [
+    'AsyncLoader',
+]
+
+FileData = Union[bytes, bytearray, memoryview]
+
+
+def _checked_image(image: Image, source: str) -> Image:
+    if not image.data:
+        raise ValueError("Cannot load image '{}'.".format(source))
+    return image
+
+
+def _checked_wave(wave: Wave, source: str) -> Wave:
+    if not wave.data:
+        raise ValueError("Cannot load wave '{}'.".format(source))
+    return wave
+
+
+class AsyncLoader(object):
+    """Thread pool for asset decoding plus a per-frame, time budgeted GPU upload queue."""
+
+    def __init__(self, workers: int=4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='raylibpy-loader')
+        self._uploads = deque()  # decoded images waiting for load_texture_from_image()
+        self.uploaded = 0
+
+    def _submit(self, func: Callable, *args) -> Future:
+        return self._executor.submit(func, *args)
+
+    def load_image(self, file_name: AnyStr) -> Future:
+        """Decode an image file in the background, the future holds an Image."""
+        source = _str_out(file_name)
+        return self._submit(lambda: _checked_image(load_image(source), source))
+
+    def load_image_from_memory(self, file_type: AnyStr, file_data: FileData) -> Future:
+        """Decode an in-memory image file ('.png', ...) in the background."""
+        return self._submit(lambda: _checked_image(load_image_from_memory(file_type, file_data), '<memory>'))
+
+    def load_wave(self, file_name: AnyStr) -> Future:
+        """Decode a sound file in the background, the future holds a Wave."""
+        source = _str_out(file_name)
+        return self._submit(lambda: _checked_wave(load_wave(source), source))
+
+    def load_wave_from_memory(self, file_type: AnyStr, file_data: FileData) -> Future:
+        """Decode an in-memory sound file ('.wav', '.ogg', ...) in the background."""
+        return self._submit(lambda: _checked_wave(load_wave_from_memory(file_type, file_data), '<memory>'))
+
+    def _queue_upload(self, decoded: Future, owned: bool) -> Future:
+        # owned images were decoded here and are unloaded once uploaded
+        texture = Future()
+
+        def queue(done: Future) -> None:
+            if texture.cancelled():
+                if owned and not done.cancelled() and done.exception() is None:
+                    unload_image(done.result())
+            elif done.cancelled():
+                texture.cancel()
+            elif done.exception() is not None:
+                texture.set_exception(done.exception())
+            else:
+                self._uploads.append((done.result(), texture, owned))
+
+        decoded.add_done_callback(queue)
+        return texture
+
+    def load_texture(self, file_name: AnyStr) -> Future:
+        """Decode in the background and upload during pump(), the future holds a Texture2D."""
+        return self._queue_upload(self.load_image(file_name), True)
+
+    def load_texture_from_memory(self, file_type: AnyStr, file_data: FileData) -> Future:
+        """Same as load_texture() for an in-memory image file."""
+        return self._queue_upload(self.load_image_from_memory(file_type, file_data), True)
+
+    def load_texture_from_image(self, image: Union[Image, Future]) -> Future:
+        """Queue an image (or a future of one) for upload, the image stays owned by the caller."""
+        if not isinstance(image, Future):
+            done = Future()
+            done.set_result(image)
+            image = done
+        return self._queue_upload(image, False)
+
+    @property
+    def pending_uploads(self) -> int:
+        return len(self._uploads)
+
+    def pump(self, budget_ms: float=2.0) -> int:
+        """
+        Upload queued images to the GPU for about budget_ms milliseconds.
+
+        Must be called from the thread that owns the window. At least one image
+        is uploaded per call so the queue always drains, and images decoded by
+        the loader are unloaded afterwards. Returns the upload count.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        count = 0
+        while self._uploads:
+            image, future, owned = self._uploads.popleft()
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                texture = load_texture_from_image(image)
+                if texture.id == 0:
+                    future.set_exception(ValueError("Cannot upload image {} to the GPU.".format(image)))
+                else:
+                    future.set_result(texture)
+            finally:
+                if owned:
+                    unload_image(image)
+            count += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.uploaded += count
+        return count
+
+    def shutdown(self, wait: bool=True) -> None:
+        """Stop the worker threads and drop queued uploads (their images are unloaded)."""
+        self._executor.shutdown(wait=wait)
+        while self._uploads:
+            image, future, owned = self._uploads.popleft()
+            future.cancel()
+            if owned:
+                unload_image(image)
+
+    def __enter__(self) -> 'AsyncLoader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def __str__(self) -> str:
+        return "(ASYNCLOADER: pending uploads: {}, uploaded: {})".format(len(self._uploads), self.uploaded)
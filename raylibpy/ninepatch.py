@@ -0,0 +1,274 @@
+# ninepatch.py
+
+#   Cached nine-patch rendering for GUI panels
+#
+#   draw_texture_npatch() lays out the nine (or three) quads of a patch on
+#   every call. Panels rarely change size, so npatch_layout() computes the
+#   quads of an (NPatchInfo, width, height) once and caches them, and a
+#   NinePatchBatch keeps the widgets of one texture with their cached
+#   layouts and submits all their quads in one draw_texture_quads() call.
+#   Moving a widget only shifts its quads; the layout is computed again only
+#   when it is resized to a size not seen before.
+#
+#   Example:
+#
+#   frame = NPatchInfo(Rectangle(0, 0, 64, 64), 12, 12, 12, 12, NPT_9PATCH)
+#   panels = NinePatchBatch(load_texture("resources/ninepatch_button.png"))
+#   dialog = panels.add(frame, (100, 80, 320, 200))
+#   button = panels.add(frame, (120, 230, 120, 40), tint=SKYBLUE)
+#   ...
+#   panels.move(dialog, x, y)            # dragging: no layout work
+#   panels.resize(dialog, w, h)          # one cache lookup (or layout) for this widget
+#   panels.draw()
+#
+#   Layouts follow DrawTextureNPatch() of raylib 4.0 (borders shrink
+#   proportionally when the destination is smaller than them), without origin
+#   or rotation: the quads are axis-aligned.
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from . import (
+    WHITE,
+    Color,
+    NPatchInfo,
+    NPT_3PATCH_HORIZONTAL,
+    NPT_3PATCH_VERTICAL,
+    Rectangle,
+    Seq,
+    Texture2D,
+    draw_texture_quads,
+)
+
+__all__ = [
+    'npatch_layout',
+    'npatch_layout_cache_info',
+    'clear_npatch_layout_cache',
+    'draw_texture_npatch_cached',
+    'NinePatchBatch',
+]
+
+_LayoutKey = Tuple[float, float, float, float, int, int, int, int, int, float, float]
+_Layout = Tuple[Tuple[Tuple[float, float, float, float], ...], Tuple[Tuple[float, float, float, float], ...]]
+
+_MAX_LAYOUTS = 4096
+_layouts = OrderedDict()  # type: OrderedDict[_LayoutKey, _Layout]
+_layout_hits = 0
+_layout_misses = 0
+
+
+def _patch_key(npatch_info: NPatchInfo) -> Tuple[float, float, float, float, int, int, int, int, int]:
+    rec = npatch_info.sourceRec
+    return (rec.x, rec.y, rec.width, rec.height, npatch_info.left, npatch_info.top, npatch_info.right,
+            npatch_info.bottom, npatch_info.type)
+
+
+def _compute_layout(key: _LayoutKey) -> _Layout:
+    sx, sy, sw, sh, left, top, right, bottom, layout, width, height = key
+    # as DrawTextureNPatch(): a negative source size starts from the far edge and
+    # keeps its sign in the texture coordinates
+    if sw < 0:
+        sx -= sw
+    if sh < 0:
+        sy -= sh
+    width = width if int(width) > 0 else 0.0
+    height = height if int(height) > 0 else 0.0
+    if layout == NPT_3PATCH_HORIZONTAL:
+        height = abs(sh)
+    elif layout == NPT_3PATCH_VERTICAL:
+        width = abs(sw)
+    draw_center = draw_middle = True
+    left, top, right, bottom = float(left), float(top), float(right), float(bottom)
+    if width <= left + right and layout != NPT_3PATCH_VERTICAL:
+        draw_center = False
+        left = left / (left + right) * width if left + right else 0.0
+        right = width - left
+    if height <= top + bottom and layout != NPT_3PATCH_HORIZONTAL:
+        draw_middle = False
+        top = top / (top + bottom) * height if top + bottom else 0.0
+        bottom = height - top
+
+    # (dest start, dest end, source start, source end) of the columns and rows
+    if layout == NPT_3PATCH_VERTICAL:
+        columns = [(0.0, width, sx, sx + sw)]
+    else:
+        columns = [(0.0, left, sx, sx + left)]
+        if draw_center:
+            columns.append((left, width - right, sx + left, sx + sw - right))
+        columns.append((width - right, width, sx + sw - right, sx + sw))
+    if layout == NPT_3PATCH_HORIZONTAL:
+        rows = [(0.0, height, sy, sy + sh)]
+    else:
+        rows = [(0.0, top, sy, sy + top)]
+        if draw_middle:
+            rows.append((top, height - bottom, sy + top, sy + sh - bottom))
+        rows.append((height - bottom, height, sy + sh - bottom, sy + sh))
+
+    source, dest = [], []
+    for y0, y1, v0, v1 in rows:
+        for x0, x1, u0, u1 in columns:
+            if x1 > x0 and y1 > y0:
+                source.append((u0, v0, u1 - u0, v1 - v0))
+                dest.append((x0, y0, x1 - x0, y1 - y0))
+    return tuple(source), tuple(dest)
+
+
+def npatch_layout(npatch_info: NPatchInfo, width: float, height: float) -> _Layout:
+    """
+    Quads of npatch_info stretched to width x height: (source recs, dest recs relative to the top left corner).
+
+    Layouts are cached (least recently used ones dropped past 4096).
+    """
+    global _layout_hits, _layout_misses
+    key = _patch_key(npatch_info) + (float(width), float(height))
+    layout = _layouts.get(key)
+    if layout is not None:
+        _layouts.move_to_end(key)
+        _layout_hits += 1
+        return layout
+    _layout_misses += 1
+    layout = _compute_layout(key)
+    _layouts[key] = layout
+    if len(_layouts) > _MAX_LAYOUTS:
+        _layouts.popitem(last=False)
+    return layout
+
+
+def npatch_layout_cache_info() -> Dict[str, int]:
+    return {'hits': _layout_hits, 'misses': _layout_misses, 'size': len(_layouts)}
+
+
+def clear_npatch_layout_cache() -> None:
+    global _layout_hits, _layout_misses
+    _layouts.clear()
+    _layout_hits = _layout_misses = 0
+
+
+def _offset(dest: Sequence[Tuple[float, float, float, float]], x: float, y: float) -> List[Tuple[float, float, float, float]]:
+    return [(x + dx, y + dy, dw, dh) for dx, dy, dw, dh in dest]
+
+
+def _rec_tuple(rec: Union[Rectangle, Seq]) -> Tuple[float, float, float, float]:
+    if isinstance(rec, Rectangle):
+        return rec.x, rec.y, rec.width, rec.height
+    return float(rec[0]), float(rec[1]), float(rec[2]), float(rec[3])
+
+
+def _rgba(color: Union[Color, Seq]) -> Tuple[int, int, int, int]:
+    if isinstance(color, Color):
+        return color.r, color.g, color.b, color.a
+    return (tuple(int(c) for c in color) + (255,))[:4]
+
+
+def draw_texture_npatch_cached(texture: Texture2D, npatch_info: NPatchInfo, dest_rec: Union[Rectangle, Seq],
+                               tint: Union[Color, Seq]=WHITE) -> None:
+    """draw_texture_npatch() without origin and rotation, with the layout taken from the cache."""
+    x, y, width, height = _rec_tuple(dest_rec)
+    source, dest = npatch_layout(npatch_info, width, height)
+    draw_texture_quads(texture, source, _offset(dest, x, y), Color(*_rgba(tint)))
+
+
+class _Widget(object):
+    __slots__ = ('npatch', 'x', 'y', 'width', 'height', 'tint', 'layout')
+
+    def __init__(self, npatch: NPatchInfo, rec: Tuple[float, float, float, float],
+                 tint: Tuple[int, int, int, int]) -> None:
+        self.npatch = npatch
+        self.x, self.y, self.width, self.height = rec
+        self.tint = tint
+        self.layout = npatch_layout(npatch, self.width, self.height)
+
+
+class NinePatchBatch(object):
+    """Nine-patch widgets sharing a texture, drawn in one batched submission from cached layouts."""
+
+    def __init__(self, texture: Texture2D) -> None:
+        self.texture = texture
+        self._widgets = {}  # type: Dict[int, _Widget]
+        self._next = 0
+        self._quads = None  # type: Optional[Tuple[list, list, Color, Optional[list]]]
+        self.rebuilds = 0
+
+    def add(self, npatch_info: NPatchInfo, dest_rec: Union[Rectangle, Seq], tint: Union[Color, Seq]=WHITE) -> int:
+        """Add a widget, returns its handle. Widgets are drawn in the order added."""
+        handle = self._next
+        self._next += 1
+        self._widgets[handle] = _Widget(npatch_info, _rec_tuple(dest_rec), _rgba(tint))
+        self._quads = None
+        return handle
+
+    def remove(self, handle: int) -> None:
+        del self._widgets[handle]
+        self._quads = None
+
+    def clear(self) -> None:
+        self._widgets.clear()
+        self._quads = None
+
+    def move(self, handle: int, x: float, y: float) -> None:
+        widget = self._widgets[handle]
+        if (widget.x, widget.y) != (x, y):
+            widget.x, widget.y = x, y
+            self._quads = None
+
+    def resize(self, handle: int, width: float, height: float) -> None:
+        """Change a widget size, the only change that needs a (cached) layout."""
+        widget = self._widgets[handle]
+        if (widget.width, widget.height) != (width, height):
+            widget.width, widget.height = width, height
+            widget.layout = npatch_layout(widget.npatch, width, height)
+            self._quads = None
+
+    def set_rec(self, handle: int, dest_rec: Union[Rectangle, Seq]) -> None:
+        x, y, width, height = _rec_tuple(dest_rec)
+        self.move(handle, x, y)
+        self.resize(handle, width, height)
+
+    def set_tint(self, handle: int, tint: Union[Color, Seq]) -> None:
+        widget = self._widgets[handle]
+        tint = _rgba(tint)
+        if widget.tint != tint:
+            widget.tint = tint
+            self._quads = None
+
+    def set_npatch(self, handle: int, npatch_info: NPatchInfo) -> None:
+        widget = self._widgets[handle]
+        widget.npatch = npatch_info
+        widget.layout = npatch_layout(npatch_info, widget.width, widget.height)
+        self._quads = None
+
+    def rec(self, handle: int) -> Rectangle:
+        widget = self._widgets[handle]
+        return Rectangle(widget.x, widget.y, widget.width, widget.height)
+
+    def _build(self) -> Tuple[list, list, Color, Optional[list]]:
+        source, dest, tints = [], [], []
+        for widget in self._widgets.values():
+            widget_source, widget_dest = widget.layout
+            source.extend(widget_source)
+            dest.extend(_offset(widget_dest, widget.x, widget.y))
+            tints.extend([widget.tint] * len(widget_source))
+        self.rebuilds += 1
+        if len(set(tints)) <= 1:
+            return source, dest, Color(*tints[0]) if tints else WHITE, None
+        return source, dest, WHITE, tints
+
+    def draw(self) -> None:
+        """Draw all widgets; the quad lists are rebuilt only after a change."""
+        if self._quads is None:
+            self._quads = self._build()
+        source, dest, tint, tints = self._quads
+        if source:
+            draw_texture_quads(self.texture, source, dest, tint, tints)
+
+    @property
+    def quad_count(self) -> int:
+        return sum(len(widget.layout[0]) for widget in self._widgets.values())
+
+    def __len__(self) -> int:
+        return len(self._widgets)
+
+    def __str__(self) -> str:
+        return "(NINEPATCHBATCH: texture: {}, widgets: {}, quads: {})".format(
+            self.texture.id, len(self._widgets), self.quad_count
+        )
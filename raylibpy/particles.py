@@ -0,0 +1,466 @@
+# particles.py
+
+#   Particle emitters with vectorized updates
+#
+#   A ParticleEmitter stores its particles as structure-of-arrays NumPy buffers
+#   (position, velocity, age, life, size, rotation, color), live particles
+#   packed at the front. update() spawns, ages, applies forces and evaluates
+#   the size and color over life curves for all of them in a few array
+#   operations; dead particles are replaced by live ones from the tail, so
+#   the cost of removal follows the number of deaths, not the particle count.
+#
+#   draw() builds the vertices of all live particles with NumPy and sends
+#   them to the GPU as one vertex buffer update and one draw call per
+#   emitter, rendered with raylib's default shader: no per-particle (or
+#   per-vertex) Python calls at all.
+#
+#   Example:
+#
+#   smoke = ParticleEmitter(load_texture("resources/smoke.png"), capacity=20000, rate=2000,
+#                           lifetime=(1.5, 3.0), speed=(20, 60), angle=(250, 290),
+#                           size=(16, 96), color=[fade(GRAY, 0.8), fade(DARKGRAY, 0.0)],
+#                           acceleration=(0, -20), drag=0.5, spin=(-90, 90))
+#   smoke.forces.append(wind((30, 0)))
+#   ...
+#   smoke.position = get_mouse_position()
+#   smoke.update(get_frame_time())
+#   begin_drawing()
+#   smoke.draw()
+#   end_drawing()
+#
+#   Curves map the normalized age (0 at birth, 1 at death) to a value: a
+#   constant, a sequence of evenly spaced keys, or a Curve with explicit key
+#   times. Forces are callables taking the live (n, 2) positions and
+#   velocities and returning (n, 2) accelerations, see attractor(), vortex()
+#   and wind().
+
+import math
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import (
+    BLEND_ALPHA,
+    WHITE,
+    BlendMode,
+    Color,
+    Rectangle,
+    Seq,
+    Texture2D,
+    Vector2,
+    begin_blend_mode,
+    end_blend_mode,
+    rl_get_texture_id_default,
+    _QuadBuffer,
+)
+
+__all__ = [
+    'Curve',
+    'attractor',
+    'vortex',
+    'wind',
+    'ParticleEmitter',
+    'ParticleSystem',
+]
+
+Force = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+_CURVE_SAMPLES = 256
+
+# two triangles per quad, counter-clockwise on screen like the rlgl batch quads:
+# top left, bottom left, bottom right / top left, bottom right, top right
+_CORNER_X = np.array([-0.5, -0.5, 0.5, -0.5, 0.5, 0.5], dtype=np.float32)
+_CORNER_Y = np.array([-0.5, 0.5, 0.5, -0.5, 0.5, -0.5], dtype=np.float32)
+_CORNER_U = np.array([0, 0, 1, 0, 1, 1], dtype=np.float32)
+_CORNER_V = np.array([0, 1, 1, 0, 1, 0], dtype=np.float32)
+# interleaved x, y of the six corners, and the same corners turned by 90 degrees
+_CORNERS = np.stack([_CORNER_X, _CORNER_Y], axis=1).reshape(12)
+_CORNERS_TURNED = np.stack([-_CORNER_Y, _CORNER_X], axis=1).reshape(12)
+
+
+def _rgba(color: Union[Color, Seq]) -> Tuple[int, int, int, int]:
+    if isinstance(color, Color):
+        return color.r, color.g, color.b, color.a
+    return (tuple(int(c) for c in color) + (255,))[:4]
+
+
+class Curve(object):
+    """
+    Piecewise linear function of the normalized particle age, sampled into a lookup table.
+
+    keys are (time, value) pairs with time in 0..1; values are numbers or colors.
+    """
+
+    def __init__(self, keys: Sequence[Tuple[float, Union[float, Color, Seq]]]) -> None:
+        if not keys:
+            raise ValueError("A curve needs at least one key.")
+        keys = sorted(keys, key=lambda key: key[0])
+        times = np.array([key[0] for key in keys], dtype=np.float64)
+        first = keys[0][1]
+        self.is_color = isinstance(first, Color) or isinstance(first, (tuple, list))
+        if self.is_color:
+            values = np.array([_rgba(key[1]) for key in keys], dtype=np.float64)
+        else:
+            values = np.array([[float(key[1])] for key in keys], dtype=np.float64)
+        samples = np.linspace(0.0, 1.0, _CURVE_SAMPLES)
+        table = np.stack([np.interp(samples, times, values[:, i]) for i in range(values.shape[1])], axis=1)
+        self.keys = keys
+        self.constant = len(keys) == 1
+        if self.is_color:
+            self.table = np.clip(np.rint(table), 0, 255).astype(np.uint8)
+            # one RGBA color per 32-bit element: gathers four times fewer elements
+            self._lookup = self.table.view(np.uint32).reshape(_CURVE_SAMPLES)
+        else:
+            self.table = table[:, 0].astype(np.float32)
+            self._lookup = self.table
+
+    @classmethod
+    def of(cls, value: Union['Curve', float, Color, Seq], color: bool) -> 'Curve':
+        """Curve from a constant, a sequence of evenly spaced keys, or a Curve."""
+        if isinstance(value, Curve):
+            return value
+        if isinstance(value, Color) or not isinstance(value, (tuple, list)):
+            return cls([(0.0, value)])
+        if color and not isinstance(value[0], (Color, tuple, list)):
+            return cls([(0.0, value)])
+        if len(value) == 1:
+            return cls([(0.0, value[0])])
+        return cls([(i / (len(value) - 1), v) for i, v in enumerate(value)])
+
+    def sample(self, t: np.ndarray) -> np.ndarray:
+        index = (np.clip(t, 0.0, 1.0) * (_CURVE_SAMPLES - 1) + 0.5).astype(np.intp)
+        return self.table[index]
+
+    def _sample_into(self, index: np.ndarray, out: np.ndarray) -> None:
+        # out: float32 values, or colors viewed as uint32
+        if self.constant:
+            out[:] = self._lookup[0]
+        else:
+            np.take(self._lookup, index, out=out)
+
+    def __str__(self) -> str:
+        return "(CURVE: {} keys, {})".format(len(self.keys), 'color' if self.is_color else 'scalar')
+
+
+def attractor(center: Union[Vector2, Seq], strength: float, min_distance: float=8.0) -> Force:
+    """Force pulling particles towards center (negative strength pushes), falling off with distance squared."""
+    cx, cy = float(center[0]), float(center[1])
+
+    def force(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+        delta = np.array([cx, cy], dtype=np.float32) - position
+        distance2 = np.maximum(np.einsum('ij,ij->i', delta, delta), min_distance * min_distance)
+        return delta * (strength / (distance2 * np.sqrt(distance2)))[:, None]
+
+    return force
+
+
+def vortex(center: Union[Vector2, Seq], strength: float) -> Force:
+    """Force turning particles around center (counter-clockwise on screen for positive strength)."""
+    cx, cy = float(center[0]), float(center[1])
+
+    def force(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+        out = np.empty_like(position)
+        out[:, 0] = (position[:, 1] - cy) * strength
+        out[:, 1] = (cx - position[:, 0]) * strength
+        return out
+
+    return force
+
+
+def wind(velocity: Union[Vector2, Seq], strength: float=1.0) -> Force:
+    """Force dragging particles towards a wind velocity."""
+    wx, wy = float(velocity[0]), float(velocity[1])
+
+    def force(position: np.ndarray, particle_velocity: np.ndarray) -> np.ndarray:
+        return (np.array([wx, wy], dtype=np.float32) - particle_velocity) * strength
+
+    return force
+
+
+def _span(value: Union[float, Seq]) -> Tuple[float, float]:
+    if isinstance(value, (tuple, list)):
+        return float(value[0]), float(value[1])
+    return float(value), float(value)
+
+
+class ParticleEmitter(object):
+    """
+    Up to capacity particles of one texture, spawned at rate per second (plus emit() bursts).
+
+    Ranges (lifetime, speed, angle in degrees, rotation, spin in degrees per
+    second, scale) are (low, high) pairs drawn uniformly per particle, or
+    single values. size (pixels) and color follow their curves over each
+    particle life; scale multiplies size per particle. Particles spawn within
+    radius of position. Needs a window to draw, not to update.
+    """
+
+    def __init__(self, texture: Optional[Texture2D]=None, capacity: int=10000, rate: float=0.0,
+                 position: Union[Vector2, Seq]=(0, 0), radius: float=0.0, lifetime: Union[float, Seq]=1.0,
+                 speed: Union[float, Seq]=(50, 100), angle: Union[float, Seq]=(0, 360),
+                 size: Union[Curve, float, Seq]=16.0, color: Union[Curve, Color, Seq]=WHITE,
+                 scale: Union[float, Seq]=1.0, rotation: Union[float, Seq]=0.0, spin: Union[float, Seq]=0.0,
+                 acceleration: Union[Vector2, Seq]=(0, 0), drag: float=0.0,
+                 source_rec: Optional[Union[Rectangle, Seq]]=None,
+                 blend_mode: Union[int, BlendMode]=BLEND_ALPHA, seed: Optional[int]=None) -> None:
+        if capacity <= 0:
+            raise ValueError("Particle emitter capacity must be positive, got {}.".format(capacity))
+        self._texture = texture
+        self.capacity = capacity
+        self.rate = rate
+        self.position = (float(position[0]), float(position[1]))
+        self.radius = radius
+        self.lifetime = _span(lifetime)
+        self.speed = _span(speed)
+        self.angle = _span(angle)
+        self.size = Curve.of(size, color=False)
+        self.color = Curve.of(color, color=True)
+        self.scale = _span(scale)
+        self.rotation = _span(rotation)
+        self.spin = _span(spin)
+        self.acceleration = (float(acceleration[0]), float(acceleration[1]))
+        self.drag = drag
+        self.forces = []  # type: List[Force]
+        self.blend_mode = blend_mode
+        self.active = True
+        self.count = 0
+        self.spawned = 0
+        self.dropped = 0
+        self._carry = 0.0
+        self._random = np.random.default_rng(seed)
+
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.ages = np.zeros(capacity, dtype=np.float32)
+        self.lives = np.ones(capacity, dtype=np.float32)
+        self.scales = np.ones(capacity, dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.rotations = np.zeros(capacity, dtype=np.float32)
+        self.spins = np.zeros(capacity, dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)
+        self._per_particle = ('positions', 'velocities', 'ages', 'lives', 'scales', 'rotations', 'spins')
+
+        self._vertices = np.zeros((capacity, 6, 2), dtype=np.float32)
+        self._vertex_colors = np.zeros((capacity, 6, 4), dtype=np.uint8)
+        self._offsets = np.zeros((capacity, 6), dtype=np.float64)
+        self._texcoords = None  # type: Optional[np.ndarray]
+        self._source = None  # type: Optional[Tuple[float, float, float, float]]
+        self._buffer = None  # type: Optional[_QuadBuffer]
+        self._texcoords_uploaded = False
+        self.source_rec = source_rec
+
+    @property
+    def texture(self) -> Optional[Texture2D]:
+        return self._texture
+
+    @texture.setter
+    def texture(self, texture: Optional[Texture2D]) -> None:
+        # texture coordinates depend on the texture size
+        self._texture = texture
+        self._texcoords_uploaded = False
+
+    @property
+    def source_rec(self) -> Optional[Rectangle]:
+        return None if self._source is None else Rectangle(*self._source)
+
+    @source_rec.setter
+    def source_rec(self, source_rec: Optional[Union[Rectangle, Seq]]) -> None:
+        self._source = None if source_rec is None else tuple(float(v) for v in (
+            (source_rec.x, source_rec.y, source_rec.width, source_rec.height)
+            if isinstance(source_rec, Rectangle) else source_rec
+        ))
+        self._texcoords_uploaded = False
+
+    @property
+    def rotates(self) -> bool:
+        return self.rotation != (0.0, 0.0) or self.spin != (0.0, 0.0)
+
+    def emit(self, count: int, position: Optional[Union[Vector2, Seq]]=None) -> int:
+        """Spawn count particles (at position, by default the emitter's), returns how many fit."""
+        fit = min(count, self.capacity - self.count)
+        self.dropped += count - fit
+        if fit <= 0:
+            return 0
+        start, end = self.count, self.count + fit
+        random = self._random
+        x, y = self.position if position is None else (float(position[0]), float(position[1]))
+        if self.radius > 0:
+            distance = self.radius * np.sqrt(random.random(fit, dtype=np.float32))
+            direction = random.random(fit, dtype=np.float32) * (2.0 * math.pi)
+            self.positions[start:end, 0] = x + distance * np.cos(direction)
+            self.positions[start:end, 1] = y + distance * np.sin(direction)
+        else:
+            self.positions[start:end] = (x, y)
+        angle = np.radians(random.uniform(self.angle[0], self.angle[1], fit))
+        speed = random.uniform(self.speed[0], self.speed[1], fit)
+        self.velocities[start:end, 0] = speed * np.cos(angle)
+        self.velocities[start:end, 1] = speed * np.sin(angle)
+        self.ages[start:end] = 0.0
+        self.lives[start:end] = np.maximum(random.uniform(self.lifetime[0], self.lifetime[1], fit), 1e-6)
+        self.scales[start:end] = random.uniform(self.scale[0], self.scale[1], fit)
+        self.rotations[start:end] = random.uniform(self.rotation[0], self.rotation[1], fit)
+        self.spins[start:end] = random.uniform(self.spin[0], self.spin[1], fit)
+        self.count = end
+        self.spawned += fit
+        self._evaluate(start, end)
+        return fit
+
+    def _remove_dead(self) -> None:
+        n = self.count
+        dead = self.ages[:n] >= self.lives[:n]
+        if not dead.any():
+            return
+        alive = n - int(np.count_nonzero(dead))
+        # fill the holes below the new count with the live particles above it
+        holes = np.flatnonzero(dead[:alive])
+        movers = alive + np.flatnonzero(~dead[alive:])
+        for name in self._per_particle:
+            array = getattr(self, name)
+            array[holes] = array[movers]
+        self.count = alive
+
+    def _evaluate(self, start: int, end: int) -> None:
+        # live particles have 0 <= age < life, no clipping needed
+        t = self.ages[start:end] / self.lives[start:end]
+        t *= _CURVE_SAMPLES - 1
+        t += 0.5
+        index = t.astype(np.intp)
+        sizes = self.sizes[start:end]
+        self.size._sample_into(index, sizes)
+        sizes *= self.scales[start:end]
+        self.color._sample_into(index, self.colors.view(np.uint32)[start:end, 0])
+
+    def update(self, dt: float) -> None:
+        """Spawn, age, move and recolor all particles by dt seconds."""
+        if self.active and self.rate > 0:
+            self._carry += self.rate * dt
+            spawn = int(self._carry)
+            self._carry -= spawn
+            if spawn:
+                self.emit(spawn)
+        n = self.count
+        if not n:
+            return
+        self.ages[:n] += dt
+        self._remove_dead()
+        n = self.count
+        if not n:
+            return
+        velocities = self.velocities[:n]
+        positions = self.positions[:n]
+        ax, ay = self.acceleration
+        if ax or ay:
+            velocities += (ax * dt, ay * dt)
+        for force in self.forces:
+            velocities += force(positions, velocities) * np.float32(dt)
+        if self.drag:
+            velocities *= np.float32(math.exp(-self.drag * dt))
+        positions += velocities * np.float32(dt)
+        if self.rotates:
+            self.rotations[:n] += self.spins[:n] * np.float32(dt)
+        self._evaluate(0, n)
+
+    def clear(self) -> None:
+        self.count = 0
+        self._carry = 0.0
+
+    def build_vertices(self) -> int:
+        """Fill the vertex arrays of the live particles (done by draw()), returns the particle count."""
+        n = self.count
+        if not n:
+            return 0
+        vertices = self._vertices.reshape(self.capacity, 12)[:n]
+        if self.rotates:
+            angle = np.radians(self.rotations[:n])
+            np.multiply((np.cos(angle) * self.sizes[:n])[:, None], _CORNERS, out=vertices)
+            vertices += (np.sin(angle) * self.sizes[:n])[:, None] * _CORNERS_TURNED
+        else:
+            np.multiply(self.sizes[:n, None], _CORNERS, out=vertices)
+        # each (x, y) pair viewed as one 8 byte element broadcasts to the six corners in one pass
+        offsets = self._offsets[:n]
+        offsets[:] = self.positions[:n].view(np.float64)
+        vertices += offsets.view(np.float32)
+        self._vertex_colors.view(np.uint32).reshape(self.capacity, 6)[:n] = self.colors[:n].view(np.uint32)
+        return n
+
+    def _texture_coords(self, texture: Optional[Texture2D]) -> np.ndarray:
+        if self._source is None or texture is None:
+            u0, v0, u1, v1 = 0.0, 0.0, 1.0, 1.0
+        else:
+            sx, sy, sw, sh = self._source
+            u0, v0 = sx / texture.width, sy / texture.height
+            u1, v1 = (sx + sw) / texture.width, (sy + sh) / texture.height
+        texcoords = np.empty((self.capacity, 6, 2), dtype=np.float32)
+        texcoords[:, :, 0] = u0 + _CORNER_U * (u1 - u0)
+        texcoords[:, :, 1] = v0 + _CORNER_V * (v1 - v0)
+        return texcoords
+
+    def draw(self) -> None:
+        """Draw all live particles with one vertex upload and one draw call (needs a window)."""
+        n = self.build_vertices()
+        if not n:
+            return
+        if self._buffer is None:
+            self._buffer = _QuadBuffer(self.capacity)
+        if not self._texcoords_uploaded:
+            self._texcoords = self._texture_coords(self.texture)
+            self._buffer.update(_QuadBuffer.TEXCOORDS, self._texcoords, self.capacity)
+            self._texcoords_uploaded = True
+        self._buffer.update(_QuadBuffer.POSITIONS, self._vertices, n)
+        self._buffer.update(_QuadBuffer.COLORS, self._vertex_colors, n)
+        texture_id = self.texture.id if self.texture is not None else rl_get_texture_id_default()
+        if self.blend_mode != BLEND_ALPHA:
+            begin_blend_mode(self.blend_mode)
+        self._buffer.draw(texture_id, n)
+        if self.blend_mode != BLEND_ALPHA:
+            end_blend_mode()
+
+    def unload(self) -> None:
+        """Release the GPU vertex buffers (the texture is left to the caller)."""
+        if self._buffer is not None:
+            self._buffer.unload()
+            self._buffer = None
+        self._texcoords_uploaded = False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __str__(self) -> str:
+        return "(PARTICLEEMITTER: particles: {}/{}, rate: {}/s, position: {})".format(
+            self.count, self.capacity, self.rate, self.position
+        )
+
+
+class ParticleSystem(object):
+    """Emitters updated and drawn together, in the order added."""
+
+    def __init__(self, emitters: Optional[Sequence[ParticleEmitter]]=None) -> None:
+        self.emitters = list(emitters or [])
+
+    def add(self, emitter: ParticleEmitter) -> ParticleEmitter:
+        self.emitters.append(emitter)
+        return emitter
+
+    def remove(self, emitter: ParticleEmitter) -> None:
+        self.emitters.remove(emitter)
+
+    def update(self, dt: float) -> None:
+        for emitter in self.emitters:
+            emitter.update(dt)
+
+    def draw(self) -> None:
+        for emitter in self.emitters:
+            emitter.draw()
+
+    def unload(self) -> None:
+        for emitter in self.emitters:
+            emitter.unload()
+
+    @property
+    def count(self) -> int:
+        return sum(emitter.count for emitter in self.emitters)
+
+    def __len__(self) -> int:
+        return len(self.emitters)
+
+    def __str__(self) -> str:
+        return "(PARTICLESYSTEM: emitters: {}, particles: {})".format(len(self.emitters), self.count)
@@ -0,0 +1,222 @@
+# pipeline.py
+
+#   Parallel batch image processing for offline asset builds
+#
+#   An ImagePipeline is a declared chain of image operations (resize, format,
+#   dither, alpha crop...) that is run over a list of files in a process pool.
+#   Every worker loads one image, applies the chain, exports the result and
+#   unloads it before taking the next file, and no more than max_pending files
+#   are in flight at any time, so memory stays bounded however long the list is.
+#   Nothing here needs a window or a GL context.
+#
+#   Example:
+#
+#   pipeline = ImagePipeline().alpha_crop(0.0).resize(128, 128).format(UNCOMPRESSED_R5G6B5)
+#   results = pipeline.run(glob.glob("sprites/*.png"), "build/sprites",
+#                          progress=lambda done, total, result: print(done, total, result))
+#
+#   Operations are stored by name and resolved again inside the workers, custom
+#   steps added with apply() must be picklable (module level functions).
+
+import os
+import sys
+import time
+from typing import AnyStr, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import (
+    Color,
+    Image,
+    PixelFormat,
+    Rectangle,
+    Seq,
+    _pool_imap,
+    _str_out,
+)
+
+__all__ = [
+    'PipelineResult',
+    'ImagePipeline',
+    'apply_operations',
+]
+
+
+class PipelineResult(object):
+    """Outcome of one file: output path, final size, time spent and error message (if any)."""
+
+    __slots__ = ['source', 'target', 'width', 'height', 'seconds', 'error']
+
+    def __init__(self, source: str, target: str, width: int=0, height: int=0, seconds: float=0.0,
+                 error: Optional[str]=None) -> None:
+        self.source = source
+        self.target = target
+        self.width = width
+        self.height = height
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            return "(PIPELINERESULT: {}: error: {})".format(self.source, self.error)
+        return "(PIPELINERESULT: {} -> {}: {}x{} in {:.3f}s)".format(
+            self.source, self.target, self.width, self.height, self.seconds
+        )
+
+
+Operation = Tuple[Union[str, Callable], tuple]
+
+
+def apply_operations(image: Image, operations: Sequence[Operation]) -> None:
+    """Apply a list of (function name or function, args) steps to image, in place."""
+    rl = sys.modules[__package__]
+    for operation, args in operations:
+        func = getattr(rl, operation) if isinstance(operation, str) else operation
+        func(image, *args)
+
+
+def _process(operations: Sequence[Operation], source: str, target: str) -> PipelineResult:
+    # Runs inside the worker processes: one image alive at a time
+    rl = sys.modules[__package__]
+
+    start = time.perf_counter()
+    image = rl.load_image(source)
+    if not image.data:
+        return PipelineResult(source, target, error="cannot load image")
+    try:
+        apply_operations(image, operations)
+        directory = os.path.dirname(target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not rl.export_image(target, image):
+            return PipelineResult(source, target, image.width, image.height, error="cannot export image")
+        return PipelineResult(source, target, image.width, image.height, time.perf_counter() - start)
+    except Exception as e:
+        return PipelineResult(source, target, error="{}: {}".format(type(e).__name__, e))
+    finally:
+        rl.unload_image(image)
+
+
+class ImagePipeline(object):
+    """Chain of image operations applied to every file of a batch."""
+
+    def __init__(self) -> None:
+        self.operations = []  # type: List[Operation]
+
+    def _add(self, operation: Union[str, Callable], *args) -> 'ImagePipeline':
+        self.operations.append((operation, args))
+        return self
+
+    def apply(self, func: Callable, *args) -> 'ImagePipeline':
+        """Add a custom step, called as func(image, *args) and expected to modify image in place."""
+        return self._add(func, *args)
+
+    def format(self, new_format: Union[int, PixelFormat]) -> 'ImagePipeline':
+        return self._add('image_format', int(new_format))
+
+    def resize(self, new_width: int, new_height: int) -> 'ImagePipeline':
+        return self._add('image_resize', int(new_width), int(new_height))
+
+    def resize_nn(self, new_width: int, new_height: int) -> 'ImagePipeline':
+        return self._add('image_resize_nn', int(new_width), int(new_height))
+
+    def resize_canvas(self, new_width: int, new_height: int, offset_x: int, offset_y: int,
+                      color: Union[Color, Seq]) -> 'ImagePipeline':
+        return self._add('image_resize_canvas', int(new_width), int(new_height), int(offset_x), int(offset_y), tuple(color))
+
+    def crop(self, crop: Union[Rectangle, Seq]) -> 'ImagePipeline':
+        return self._add('image_crop', tuple(crop))
+
+    def alpha_crop(self, threshold: float) -> 'ImagePipeline':
+        return self._add('image_alpha_crop', float(threshold))
+
+    def alpha_clear(self, color: Union[Color, Seq], threshold: float) -> 'ImagePipeline':
+        return self._add('image_alpha_clear', tuple(color), float(threshold))
+
+    def alpha_premultiply(self) -> 'ImagePipeline':
+        return self._add('image_alpha_premultiply')
+
+    def dither(self, r_bpp: int, g_bpp: int, b_bpp: int, a_bpp: int) -> 'ImagePipeline':
+        return self._add('image_dither', int(r_bpp), int(g_bpp), int(b_bpp), int(a_bpp))
+
+    def to_pot(self, fill_color: Union[Color, Seq]) -> 'ImagePipeline':
+        return self._add('image_to_pot', tuple(fill_color))
+
+    def flip_vertical(self) -> 'ImagePipeline':
+        return self._add('image_flip_vertical')
+
+    def flip_horizontal(self) -> 'ImagePipeline':
+        return self._add('image_flip_horizontal')
+
+    def mipmaps(self) -> 'ImagePipeline':
+        return self._add('image_mipmaps')
+
+    def process_image(self, image: Image) -> Image:
+        """Run the pipeline over an already loaded image, in place."""
+        apply_operations(image, self.operations)
+        return image
+
+    def process_file(self, source: AnyStr, target: AnyStr) -> PipelineResult:
+        """Run the pipeline over a single file in the calling process."""
+        return _process(self.operations, _str_out(source), _str_out(target))
+
+    def imap(self, files: Iterable[AnyStr], output_dir: AnyStr, extension: Optional[str]='.png',
+             root: Optional[AnyStr]=None, workers: Optional[int]=None,
+             max_pending: Optional[int]=None) -> Iterator[PipelineResult]:
+        """
+        Process files, yielding results as they complete (not in input order).
+
+        Outputs keep their path relative to root (or only their file name when no
+        root is given) below output_dir, with the extension replaced unless it is
+        None. Two different sources that would be written to the same output raise
+        ValueError before the second one is processed; pass root to keep their
+        directories apart. workers=0 processes everything in the calling process;
+        by default a pool of os.cpu_count() processes is used with at most
+        max_pending (2 * workers) files in flight.
+        """
+        output_dir = _str_out(output_dir)
+        root = _str_out(root) if root is not None else None
+        targets = {}
+
+        def target_of(source: str) -> str:
+            relative = os.path.relpath(source, root) if root is not None else os.path.basename(source)
+            if extension is not None:
+                relative = os.path.splitext(relative)[0] + extension
+            target = os.path.join(output_dir, relative)
+            key = os.path.normcase(os.path.abspath(target))
+            first = targets.setdefault(key, source)
+            if os.path.abspath(first) != os.path.abspath(source):
+                raise ValueError("{} and {} would both be written to {}".format(first, source, target))
+            return target
+
+        sources = (_str_out(file_name) for file_name in files)
+        jobs = ((self.operations, source, target_of(source)) for source in sources)
+        return _pool_imap(_process, jobs, workers, max_pending)
+
+    def run(self, files: Sequence[AnyStr], output_dir: AnyStr, extension: Optional[str]='.png',
+            root: Optional[AnyStr]=None, workers: Optional[int]=None, max_pending: Optional[int]=None,
+            progress: Optional[Callable[[int, int, PipelineResult], None]]=None) -> List[PipelineResult]:
+        """Process all files (see imap()), calling progress(done, total, result) after each one."""
+        total = len(files)
+        results = []
+        for result in self.imap(files, output_dir, extension, root, workers, max_pending):
+            results.append(result)
+            if progress is not None:
+                progress(len(results), total, result)
+        return results
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def __str__(self) -> str:
+        names = [op if isinstance(op, str) else getattr(op, '__name__', repr(op)) for op, args in self.operations]
+        return "(IMAGEPIPELINE: {})".format(' -> '.join(names))
@@ -0,0 +1,136 @@
+# rawimage.py
+
+#   Memory-mapped RAW images
+#
+#   load_image_raw() reads the whole file into a fresh allocation. For very large
+#   raw textures or heightmaps MappedImage maps the file instead: pixels are only
+#   paged in by the OS when they are touched, the file stays shared between
+#   processes, and tiles can be cut out (or uploaded to a texture) on demand.
+#
+#   Example:
+#
+#   terrain = MappedImage("resources/terrain_16k.raw", 16384, 16384, UNCOMPRESSED_R32, header_size=0)
+#   tile = terrain.tile_image((4096, 8192, 512, 512))      # regular Image, unload_image() it
+#   terrain.upload_tile(texture, (4096, 8192, 512, 512))   # update_texture_rec() from the map
+#   heights = terrain.array[::16, ::16]                     # NumPy view, no copy
+#   ...
+#   terrain.close()
+#
+#   The file is mapped copy-on-write: writing to array or image changes the
+#   pixels seen by this process only, the file on disk is never modified.
+
+import mmap
+from ctypes import addressof, c_ubyte, memmove
+from typing import AnyStr, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    Image,
+    PixelFormat,
+    Rectangle,
+    Seq,
+    Texture2D,
+    get_pixel_data_size,
+    mem_alloc,
+    update_texture_rec,
+    _PIXEL_LAYOUTS,
+    _str_out,
+)
+
+__all__ = [
+    'MappedImage',
+    'load_image_raw_mapped',
+]
+
+
+class MappedImage(object):
+    """RAW image file mapped into memory, viewed as a NumPy array and as an Image."""
+
+    def __init__(self, file_name: AnyStr, width: int, height: int, pxl_format: Union[int, PixelFormat],
+                 header_size: int=0) -> None:
+        layout = _PIXEL_LAYOUTS.get(pxl_format)
+        if layout is None:
+            raise ValueError("Pixel format {} cannot be mapped (compressed or unknown).".format(int(pxl_format)))
+        self.file_name = _str_out(file_name)
+        self.width = width
+        self.height = height
+        self.format = int(pxl_format)
+        self.header_size = header_size
+        size = get_pixel_data_size(width, height, pxl_format)
+
+        with open(self.file_name, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(self._mmap) < header_size + size:
+            self._mmap.close()
+            raise ValueError("'{}' holds {} bytes, {}x{} format {} after a {} byte header needs {}.".format(
+                self.file_name, len(self._mmap), width, height, self.format, header_size, header_size + size
+            ))
+
+        dtype, channels = layout
+        self.array = np.frombuffer(self._mmap, dtype=dtype, count=width * height * channels,
+                                   offset=header_size).reshape(height, width, channels)
+        self._pixels = (c_ubyte * size).from_buffer(self._mmap, header_size)
+
+    @property
+    def image(self) -> Image:
+        """Image pointing into the mapping: valid until close(), never unload_image() it."""
+        return Image(addressof(self._pixels), self.width, self.height, 1, self.format)
+
+    def _rect(self, rec: Union[Rectangle, Seq]) -> Tuple[int, int, int, int]:
+        if isinstance(rec, Rectangle):
+            rec = (rec.x, rec.y, rec.width, rec.height)
+        x, y, width, height = (int(v) for v in rec)
+        if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > self.width or y + height > self.height:
+            raise ValueError("Tile {} is outside of the {}x{} image.".format((x, y, width, height), self.width, self.height))
+        return x, y, width, height
+
+    def tile_array(self, rec: Union[Rectangle, Seq]) -> np.ndarray:
+        """NumPy view of a tile (not contiguous, nothing is read until it is used)."""
+        x, y, width, height = self._rect(rec)
+        return self.array[y:y + height, x:x + width]
+
+    def tile_image(self, rec: Union[Rectangle, Seq]) -> Image:
+        """Copy a tile into a new Image (owned by raylib, release it with unload_image())."""
+        x, y, width, height = self._rect(rec)
+        pitch = get_pixel_data_size(self.width, 1, self.format)
+        row_size = get_pixel_data_size(width, 1, self.format)
+        offset = addressof(self._pixels) + y * pitch + get_pixel_data_size(x, 1, self.format)
+        data = mem_alloc(row_size * height)
+        for row in range(height):
+            memmove(data + row * row_size, offset + row * pitch, row_size)
+        return Image(data, width, height, 1, self.format)
+
+    def upload_tile(self, texture: Texture2D, rec: Union[Rectangle, Seq],
+                    position: Optional[Seq]=None) -> None:
+        """Copy a tile into texture at position (defaults to (0, 0)) with update_texture_rec()."""
+        x, y, width, height = self._rect(rec)
+        dest_x, dest_y = (0, 0) if position is None else position
+        tile = np.ascontiguousarray(self.array[y:y + height, x:x + width])
+        update_texture_rec(texture, Rectangle(dest_x, dest_y, width, height), tile)
+
+    def close(self) -> None:
+        """Unmap the file (NumPy views taken from array must be released first)."""
+        if self._mmap is None:
+            return
+        self.array = None
+        self._pixels = None
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self) -> 'MappedImage':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return "(MAPPEDIMAGE: {}: {}w, {}h, format: {}, header: {})".format(
+            self.file_name, self.width, self.height, self.format, self.header_size
+        )
+
+
+def load_image_raw_mapped(file_name: AnyStr, width: int, height: int, img_format: Union[int, PixelFormat],
+                          header_size: int=0) -> MappedImage:
+    """Map a RAW image file instead of reading it (see load_image_raw())."""
+    return MappedImage(file_name, width, height, img_format, header_size)
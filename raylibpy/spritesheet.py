@@ -0,0 +1,274 @@
+# spritesheet.py
+
+#   Sprite-sheet animation for many entities
+#
+#   A SpriteSheet holds the source rectangles of every frame of a texture in
+#   one contiguous array (from a regular grid or from a TextureAtlas) and the
+#   named animations playing through them. A SpriteAnimator keeps any number
+#   of animated entities as NumPy arrays (animation, clock, speed, position,
+#   scale, flip): update() advances all their frames in a handful of
+#   vectorized operations and draw() submits them with draw_texture_quads().
+#
+#   Example:
+#
+#   scarfy = load_texture("resources/scarfy.png")
+#   sheet = SpriteSheet.from_grid(scarfy, 128, 128)
+#   run = sheet.add_animation("run", range(6), fps=12)
+#   sprites = SpriteAnimator(sheet, anchor=(0.5, 1.0))
+#   for x in range(0, 800, 40):
+#       sprites.add(run, (x, 300), time=random.random())
+#   ...
+#   sprites.update(get_frame_time())
+#   sprites.draw()
+#
+#   Frames are indices into SpriteSheet.recs; flipped entities are drawn with
+#   a mirrored source rectangle (right edge first, negative width).
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from . import (
+    WHITE,
+    Color,
+    Seq,
+    Texture2D,
+    Vector2,
+    draw_texture_quads,
+)
+from .atlas import TextureAtlas
+
+__all__ = [
+    'grid_frames',
+    'SpriteSheet',
+    'SpriteAnimator',
+]
+
+
+def grid_frames(texture_width: int, texture_height: int, frame_width: int, frame_height: int, margin: int=0,
+                spacing: int=0, count: Optional[int]=None) -> np.ndarray:
+    """Source rectangles (count, 4) of the cells of a regular grid, row by row."""
+    columns = (texture_width - 2 * margin + spacing) // (frame_width + spacing)
+    rows = (texture_height - 2 * margin + spacing) // (frame_height + spacing)
+    total = max(columns, 0) * max(rows, 0)
+    count = total if count is None else count
+    if count > total or count <= 0:
+        raise ValueError("A {}x{} texture holds {} frames of {}x{}, {} requested.".format(
+            texture_width, texture_height, total, frame_width, frame_height, count
+        ))
+    cells = np.arange(count)
+    recs = np.empty((count, 4), dtype=np.float32)
+    recs[:, 0] = margin + (cells % columns) * (frame_width + spacing)
+    recs[:, 1] = margin + (cells // columns) * (frame_height + spacing)
+    recs[:, 2] = frame_width
+    recs[:, 3] = frame_height
+    return recs
+
+
+class SpriteSheet(object):
+    """Texture, frame rectangles and named animations (frame index sequences played at a fixed rate)."""
+
+    def __init__(self, texture: Texture2D, recs: Union[np.ndarray, Sequence[Seq]],
+                 names: Optional[Dict[str, int]]=None) -> None:
+        self.texture = texture
+        self.recs = np.ascontiguousarray(recs, dtype=np.float32).reshape(-1, 4)
+        self.names = names or {}  # frame name -> frame index
+        self.animations = {}  # type: Dict[str, int]
+        self._frames = []  # type: List[np.ndarray]
+        self._fps = []  # type: List[float]
+        self._loop = []  # type: List[bool]
+        self._tables = None
+
+    @classmethod
+    def from_grid(cls, texture: Texture2D, frame_width: int, frame_height: int, margin: int=0, spacing: int=0,
+                  count: Optional[int]=None) -> 'SpriteSheet':
+        """Sheet of a texture cut in a regular grid of frames."""
+        return cls(texture, grid_frames(texture.width, texture.height, frame_width, frame_height, margin, spacing,
+                                        count))
+
+    @classmethod
+    def from_atlas(cls, atlas: TextureAtlas, names: Sequence[str]) -> 'SpriteSheet':
+        """Sheet of images packed in a TextureAtlas (all on one page, textures loaded)."""
+        pages = {atlas.source(name)[0] for name in names}
+        if len(pages) != 1:
+            raise ValueError("Sprite sheet frames must share one atlas page, got pages {}.".format(sorted(pages)))
+        recs = [(rec.x, rec.y, rec.width, rec.height) for rec in (atlas.source(name)[1] for name in names)]
+        return cls(atlas.texture(names[0]), recs, {name: i for i, name in enumerate(names)})
+
+    def add_animation(self, name: str, frames: Sequence[Union[int, str]], fps: float=12.0, loop: bool=True) -> int:
+        """Register an animation (frame indices or frame names), returns its id."""
+        indices = np.array([self.names[frame] if isinstance(frame, str) else frame for frame in frames],
+                           dtype=np.int32)
+        if not len(indices) or indices.min() < 0 or indices.max() >= len(self.recs):
+            raise ValueError("Animation '{}' needs frames within 0..{}.".format(name, len(self.recs) - 1))
+        if fps <= 0:
+            raise ValueError("Animation '{}' needs a positive fps, got {}.".format(name, fps))
+        self.animations[name] = len(self._frames)
+        self._frames.append(indices)
+        self._fps.append(float(fps))
+        self._loop.append(bool(loop))
+        self._tables = None
+        return self.animations[name]
+
+    def animation(self, name: str) -> int:
+        return self.animations[name]
+
+    def tables(self):
+        """(frame table, offsets, lengths, fps, loop) arrays of all animations, rebuilt after add_animation()."""
+        if self._tables is None:
+            lengths = np.array([len(frames) for frames in self._frames], dtype=np.int32)
+            offsets = np.zeros(len(lengths), dtype=np.int32)
+            np.cumsum(lengths[:-1], out=offsets[1:])
+            table = np.concatenate(self._frames) if self._frames else np.zeros(0, dtype=np.int32)
+            self._tables = (table, offsets, lengths, np.array(self._fps, dtype=np.float64),
+                            np.array(self._loop, dtype=bool))
+        return self._tables
+
+    def __len__(self) -> int:
+        return len(self.recs)
+
+    def __str__(self) -> str:
+        return "(SPRITESHEET: texture: {}, frames: {}, animations: {})".format(
+            self.texture.id, len(self.recs), len(self._frames)
+        )
+
+
+class SpriteAnimator(object):
+    """
+    Structure-of-arrays store of animated sprites drawn from one SpriteSheet.
+
+    Entities keep the index add() returned until remove(). anchor is the point
+    of the frame (0..1 in both directions) placed at an entity position.
+    """
+
+    def __init__(self, sheet: SpriteSheet, capacity: int=1024, anchor: Seq=(0.0, 0.0)) -> None:
+        self.sheet = sheet
+        self.anchor = (float(anchor[0]), float(anchor[1]))
+        self._size = 0  # slots in use, active or free
+        self._free = []  # type: List[int]
+        self._active_cache = None  # type: Optional[np.ndarray]
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity: int) -> None:
+        def grow(name: str, shape: tuple, dtype, fill=0) -> None:
+            array = np.full(shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:len(old)] = old
+            setattr(self, name, array)
+
+        grow('active', (capacity,), bool, False)
+        grow('animation', (capacity,), np.int32)
+        grow('time', (capacity,), np.float64)
+        grow('speed', (capacity,), np.float32, 1.0)
+        grow('position', (capacity, 2), np.float32)
+        grow('scale', (capacity,), np.float32, 1.0)
+        grow('flip_x', (capacity,), bool, False)
+        grow('frame', (capacity,), np.int32)
+        self.capacity = capacity
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Indices of the live entities."""
+        if self._active_cache is None:
+            self._active_cache = np.flatnonzero(self.active[:self._size])
+        return self._active_cache
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def add(self, animation: Union[int, str], position: Union[Vector2, Seq], scale: float=1.0, speed: float=1.0,
+            flip_x: bool=False, time: float=0.0) -> int:
+        """Add an entity playing animation from time seconds, returns its index."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._allocate(self.capacity * 2)
+            index = self._size
+            self._size += 1
+        self.active[index] = True
+        self.animation[index] = self.sheet.animation(animation) if isinstance(animation, str) else animation
+        self.time[index] = time
+        self.speed[index] = speed
+        self.position[index] = (position[0], position[1])
+        self.scale[index] = scale
+        self.flip_x[index] = flip_x
+        self._active_cache = None
+        self._update_frames(np.array([index]))
+        return index
+
+    def remove(self, index: int) -> None:
+        if not self.active[index]:
+            raise KeyError("Sprite {} is not alive.".format(index))
+        self.active[index] = False
+        self._free.append(index)
+        self._active_cache = None
+
+    def clear(self) -> None:
+        self.active[:] = False
+        self._size = 0
+        self._free = []
+        self._active_cache = None
+
+    def play(self, index: int, animation: Union[int, str], restart: bool=True) -> None:
+        """Switch an entity to another animation (from its start unless restart is False)."""
+        self.animation[index] = self.sheet.animation(animation) if isinstance(animation, str) else animation
+        if restart:
+            self.time[index] = 0.0
+        self._update_frames(np.array([index]))
+
+    def _local_frames(self, indices: np.ndarray):
+        table, offsets, lengths, fps, loop = self.sheet.tables()
+        animation = self.animation[indices]
+        length = lengths[animation]
+        local = (self.time[indices] * fps[animation]).astype(np.int64)
+        return table, offsets[animation], local, length, loop[animation]
+
+    def _update_frames(self, indices: np.ndarray) -> None:
+        table, offset, local, length, loop = self._local_frames(indices)
+        local = np.where(loop, local % length, np.clip(local, 0, length - 1))
+        self.frame[indices] = table[offset + local]
+
+    def update(self, dt: float) -> None:
+        """Advance every clock by dt seconds (times their speed) and pick the frames to show."""
+        indices = self.indices
+        if not len(indices):
+            return
+        self.time[indices] += dt * self.speed[indices]
+        self._update_frames(indices)
+
+    def finished(self) -> np.ndarray:
+        """Indices of the entities whose non-looping animation played to the end."""
+        indices = self.indices
+        table, offset, local, length, loop = self._local_frames(indices)
+        return indices[~loop & (local >= length)]
+
+    def source_recs(self, indices: Optional[np.ndarray]=None) -> np.ndarray:
+        indices = self.indices if indices is None else indices
+        recs = self.sheet.recs[self.frame[indices]]
+        # draw_texture_quads() samples from x to x + width: mirror by starting at the right edge
+        flip = self.flip_x[indices]
+        recs[flip, 0] += recs[flip, 2]
+        recs[flip, 2] *= -1
+        return recs
+
+    def dest_recs(self, indices: Optional[np.ndarray]=None) -> np.ndarray:
+        indices = self.indices if indices is None else indices
+        size = np.abs(self.sheet.recs[self.frame[indices], 2:]) * self.scale[indices, None]
+        dest = np.empty((len(indices), 4), dtype=np.float32)
+        dest[:, 0] = self.position[indices, 0] - size[:, 0] * self.anchor[0]
+        dest[:, 1] = self.position[indices, 1] - size[:, 1] * self.anchor[1]
+        dest[:, 2:] = size
+        return dest
+
+    def draw(self, tint: Union[Color, Seq]=WHITE, tints: Optional[np.ndarray]=None) -> None:
+        """Draw every entity in one batched submission (tints: one RGBA row per entity in indices order)."""
+        indices = self.indices
+        if len(indices):
+            draw_texture_quads(self.sheet.texture, self.source_recs(indices), self.dest_recs(indices), tint, tints)
+
+    def __str__(self) -> str:
+        return "(SPRITEANIMATOR: sprites: {}, capacity: {}, animations: {})".format(
+            len(self), self.capacity, len(self.sheet.animations)
+        )
@@ -0,0 +1,256 @@
+# textlayout.py
+
+#   Multi-line text layout computed on the Python side
+#
+#   Glyph metrics of a Font (recs, glyph offsets and advanceX) are read once
+#   into NumPy tables. Line breaking, word wrapping, alignment and glyph placement
+#   are then done with array operations instead of one MeasureTextEx() call per
+#   string, and the resulting quads are drawn in a single batched submission.
+#
+#   Example:
+#
+#   layout = layout_text(font, "Some long tooltip text...", 20, 1, max_width=300, align=ALIGN_CENTER)
+#   draw_text_layout(layout, (10, 10), WHITE)
+#
+#   Metrics follow DrawTextEx(): advance is advanceX (or rec.width when zero)
+#   scaled by font_size / baseSize plus spacing, and lines are 1.5 baseSize apart.
+#   Glyph quads include glyphPadding on every side, so padded glyph edges are not
+#   clipped.
+
+from typing import AnyStr, List, Optional, Tuple, Union
+
+import numpy as np
+
+from . import (
+    Color,
+    Font,
+    Rectangle,
+    Seq,
+    Vector2,
+    WHITE,
+    draw_texture_quads,
+    _font_key,
+    _glyph_tables,
+    _vec2,
+)
+
+__all__ = [
+    'ALIGN_LEFT',
+    'ALIGN_CENTER',
+    'ALIGN_RIGHT',
+    'GlyphTable',
+    'TextLayout',
+    'get_glyph_table',
+    'clear_glyph_tables',
+    'layout_text',
+    'draw_text_layout',
+]
+
+
+ALIGN_LEFT = 0
+ALIGN_CENTER = 1
+ALIGN_RIGHT = 2
+
+_ALIGN_FACTOR = {ALIGN_LEFT: 0.0, ALIGN_CENTER: 0.5, ALIGN_RIGHT: 1.0}
+
+_BLANKS = (ord(' '), ord('\t'), ord('\n'))
+
+
+class GlyphTable(object):
+    """Glyph metrics of a Font as NumPy arrays, indexed like font.glyphs."""
+
+    def __init__(self, font: Font) -> None:
+        count = font.glyphCount
+        self.base_size = font.baseSize
+        self.padding = font.glyphPadding
+        self.codepoints = np.empty(count, dtype=np.int64)
+        self.recs = np.empty((count, 4), dtype=np.float32)
+        self.offsets = np.empty((count, 2), dtype=np.float32)
+        self.advances = np.empty(count, dtype=np.float32)
+
+        for i in range(count):
+            info = font.glyphs[i]
+            rec = font.recs[i]
+            self.codepoints[i] = info.value
+            self.recs[i] = (rec.x, rec.y, rec.width, rec.height)
+            self.offsets[i] = (info.offsetX, info.offsetY)
+            # DrawTextEx() falls back to the glyph width for fonts without advanceX
+            self.advances[i] = info.advanceX if info.advanceX != 0 else rec.width
+
+        self._order = np.argsort(self.codepoints, kind='stable')
+        self._sorted = self.codepoints[self._order]
+        fallback = np.nonzero(self.codepoints == ord('?'))[0]
+        self._fallback = int(fallback[0]) if len(fallback) else 0
+
+    def indices(self, codepoints: np.ndarray) -> np.ndarray:
+        """Glyph index for every codepoint, '?' (or the first glyph) when missing."""
+        if len(self._sorted) == 0:
+            return np.zeros(len(codepoints), dtype=np.int64)
+        pos = np.searchsorted(self._sorted, codepoints)
+        pos = np.minimum(pos, len(self._sorted) - 1)
+        found = self._sorted[pos] == codepoints
+        return np.where(found, self._order[pos], self._fallback)
+
+    def __str__(self) -> str:
+        return "(GLYPHTABLE: baseSize: {}, glyphCount: {})".format(self.base_size, len(self.codepoints))
+
+
+def get_glyph_table(font: Font) -> GlyphTable:
+    """Get (and cache) the glyph metrics table of a font."""
+    key = _font_key(font)
+    table = _glyph_tables.get(key)
+    if table is None:
+        table = _glyph_tables[key] = GlyphTable(font)
+    return table
+
+
+def clear_glyph_tables() -> None:
+    """Forget cached glyph tables (unload_font() and close_window() already do)."""
+    _glyph_tables.clear()
+
+
+class TextLayout(object):
+    """Result of layout_text(): per-glyph quads, line ranges and block size."""
+
+    def __init__(self, font: Font, font_size: float, glyphs: np.ndarray, codepoints: np.ndarray,
+                 positions: np.ndarray, source_recs: np.ndarray, dest_recs: np.ndarray,
+                 lines: List[Tuple[int, int]], line_widths: np.ndarray, width: float, height: float) -> None:
+        self.font = font
+        self.font_size = font_size
+        self.glyphs = glyphs
+        self.codepoints = codepoints
+        self.positions = positions
+        self.source_recs = source_recs
+        self.dest_recs = dest_recs
+        self.lines = lines
+        self.line_widths = line_widths
+        self.width = width
+        self.height = height
+        self.visible = ~np.isin(codepoints, _BLANKS)
+
+    @property
+    def bounds(self) -> Rectangle:
+        """Size of the laid out block relative to its origin."""
+        return Rectangle(0.0, 0.0, self.width, self.height)
+
+    def glyph_bounds(self) -> np.ndarray:
+        """(n, 4) array of drawn glyph rectangles (blanks excluded)."""
+        return self.dest_recs[self.visible]
+
+    def __len__(self) -> int:
+        return len(self.glyphs)
+
+    def __str__(self) -> str:
+        return "(TEXTLAYOUT: glyphs: {}, lines: {}, size: {}x{})".format(
+            len(self.glyphs), len(self.lines), self.width, self.height
+        )
+
+
+def _break_lines(cum: np.ndarray, blank: np.ndarray, max_width: Optional[float],
+                 spacing: float) -> List[Tuple[int, int, int]]:
+    # Greedy wrapping of one paragraph. cum[i] is the pen position before glyph i.
+    # Every line is returned as (start, content_end, next_start): blanks between
+    # content_end and next_start are swallowed by the line break.
+    count = len(cum) - 1
+    lines = []
+    start = 0
+    while True:
+        if max_width is None:
+            end = count
+        else:
+            # furthest glyph end that still fits, the last spacing does not count
+            end = int(np.searchsorted(cum, cum[start] + max_width + spacing, side='right')) - 1
+            end = min(max(end, start + 1), count)
+            if end < count and not blank[end]:
+                # break at the last blank after some content: leading blanks are indentation
+                content = start
+                while content < end and blank[content]:
+                    content += 1
+                inner = np.nonzero(blank[content + 1:end])[0]
+                if len(inner):
+                    end = content + 1 + int(inner[-1])
+
+        next_start = end
+        while next_start < count and blank[next_start]:
+            next_start += 1
+        content_end = end
+        while content_end > start and blank[content_end - 1]:
+            content_end -= 1
+
+        lines.append((start, content_end, next_start))
+        start = next_start
+        if start >= count:
+            return lines
+
+
+def layout_text(font: Font, text: AnyStr, font_size: float, spacing: float, max_width: Optional[float]=None,
+                align: int=ALIGN_LEFT, line_spacing: Optional[float]=None) -> TextLayout:
+    """Break text into (optionally wrapped) lines and place every glyph."""
+    table = get_glyph_table(font)
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'ignore')
+
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    glyphs = table.indices(codepoints)
+    count = len(codepoints)
+    scale = font_size / table.base_size
+    if line_spacing is None:
+        line_spacing = float(int((table.base_size + table.base_size // 2) * scale))
+
+    newline = codepoints == ord('\n')
+    blank = np.isin(codepoints, _BLANKS)
+    advances = table.advances[glyphs] * scale + spacing
+    advances[newline] = 0.0
+
+    pen_x = np.zeros(count, dtype=np.float32)
+    line_of = np.zeros(count, dtype=np.int64)
+    lines = []
+    widths = []
+
+    breaks = np.nonzero(newline)[0]
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [count]))
+    for para_start, para_end in zip(starts.tolist(), ends.tolist()):
+        cum = np.zeros(para_end - para_start + 1, dtype=np.float64)
+        np.cumsum(advances[para_start:para_end], out=cum[1:])
+        for start, content_end, next_start in _break_lines(cum, blank[para_start:para_end], max_width, spacing):
+            lo, hi = para_start + start, para_start + next_start
+            pen_x[lo:hi] = cum[start:next_start] - cum[start]
+            line_of[lo:hi] = len(lines)
+            lines.append((lo, hi))
+            widths.append(max(cum[content_end] - cum[start] - spacing, 0.0) if content_end > start else 0.0)
+        if para_end < count:
+            # the '\n' itself stays (invisible) at the end of the last line
+            pen_x[para_end] = cum[-1] - cum[lines[-1][0] - para_start]
+            line_of[para_end] = len(lines) - 1
+            lines[-1] = (lines[-1][0], para_end + 1)
+
+    line_widths = np.array(widths, dtype=np.float32)
+    block_width = float(max_width) if max_width is not None else float(line_widths.max(initial=0.0))
+    line_offsets = (block_width - line_widths) * _ALIGN_FACTOR[align]
+
+    positions = np.empty((count, 2), dtype=np.float32)
+    positions[:, 0] = pen_x + line_offsets[line_of]
+    positions[:, 1] = line_of * line_spacing
+
+    # glyphs are drawn with their padding around them, like DrawTextCodepoint() does
+    source_recs = table.recs[glyphs]
+    source_recs[:, :2] -= table.padding
+    source_recs[:, 2:] += 2 * table.padding
+    dest_recs = np.empty((count, 4), dtype=np.float32)
+    dest_recs[:, :2] = positions + (table.offsets[glyphs] - table.padding) * scale
+    dest_recs[:, 2:] = source_recs[:, 2:] * scale
+
+    height = (len(lines) - 1) * line_spacing + font_size
+    return TextLayout(font, font_size, glyphs, codepoints, positions, source_recs, dest_recs,
+                      lines, line_widths, block_width, float(height))
+
+
+def draw_text_layout(layout: TextLayout, position: Union[Vector2, Seq], tint: Union[Color, Seq]=WHITE) -> None:
+    """Draw a laid out text block with its top-left corner at position."""
+    position = _vec2(position)
+    visible = layout.visible
+    dest_recs = layout.dest_recs[visible]
+    dest_recs[:, 0] += position.x
+    dest_recs[:, 1] += position.y
+    draw_texture_quads(layout.font.texture, layout.source_recs[visible], dest_recs, tint)
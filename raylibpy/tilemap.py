@@ -0,0 +1,266 @@
+# tilemap.py
+
+#   Chunked tile maps
+#
+#   A TileMap keeps its tile ids in a NumPy grid (-1 for no tile) and draws it
+#   in square chunks of chunk_size tiles, each pre-rendered once into a
+#   RenderTexture2D. A frame then costs one textured quad per chunk in view
+#   instead of one draw_texture_rec() per tile. Editing tiles marks the
+#   chunks they fall in dirty and only those are rendered again. At most
+#   max_chunks render textures are kept, the least recently drawn ones are
+#   unloaded first, so VRAM stays bounded whatever the map size.
+#
+#   Example:
+#
+#   tiles = load_texture("resources/tileset.png")
+#   level = TileMap(tiles, 16, 16, 4096, 4096)
+#   level.tiles[:] = terrain                 # any int grid of tile ids
+#   level.set_tile(10, 12, 7)                # marks one chunk dirty
+#   level.fill(0, 0, 64, 2, 3)
+#   ...
+#   begin_drawing()
+#   level.update(camera)                     # (re)render chunks in view, outside of 2D mode
+#   begin_mode2d(camera)
+#   level.draw(camera)
+#   end_mode2d()
+#   end_drawing()
+#
+#   update() has to run outside of begin_mode2d(): texture mode resets the
+#   transformation. Chunks in view that are not rendered yet (over the
+#   max_chunks budget, or with update() skipped or capped by max_renders) are
+#   drawn tile by tile from the tileset instead, all of them in one
+#   draw_texture_quads() submission. Writing the tiles array directly needs a
+#   mark_dirty() of the region afterwards.
+
+import math
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from . import (
+    BLANK,
+    WHITE,
+    Camera2D,
+    Color,
+    RenderTexture2D,
+    Seq,
+    Texture2D,
+    begin_texture_mode,
+    clear_background,
+    draw_texture_quads,
+    end_texture_mode,
+    get_pixel_data_size,
+    get_screen_height,
+    get_screen_width,
+    load_render_texture,
+    unload_render_texture,
+)
+from .spritesheet import grid_frames
+
+__all__ = [
+    'EMPTY_TILE',
+    'TileMap',
+]
+
+EMPTY_TILE = -1
+
+# load_render_texture() attaches a 24 bit depth renderbuffer, stored as 32 bits by drivers
+_DEPTH_BYTES_PER_PIXEL = 4
+
+
+class TileMap(object):
+    """
+    Grid of tile ids drawn from a tileset texture through cached chunk render textures.
+
+    Tile ids index tile_recs, by default the cells of the tileset cut in
+    tile_width x tile_height pieces row by row (see grid_frames()).
+    """
+
+    def __init__(self, tileset: Texture2D, tile_width: int, tile_height: int, width: int, height: int,
+                 chunk_size: int=32, max_chunks: int=64, tile_recs: Optional[np.ndarray]=None, margin: int=0,
+                 spacing: int=0, dtype=np.int16) -> None:
+        if width <= 0 or height <= 0 or chunk_size <= 0:
+            raise ValueError("Tile map needs a positive size and chunk size, got {}x{} (chunk {}).".format(
+                width, height, chunk_size
+            ))
+        self.tileset = tileset
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.max_chunks = max(max_chunks, 0)
+        if tile_recs is None:
+            tile_recs = grid_frames(tileset.width, tileset.height, tile_width, tile_height, margin, spacing)
+        self.tile_recs = np.ascontiguousarray(tile_recs, dtype=np.float32).reshape(-1, 4)
+        self.tiles = np.full((height, width), EMPTY_TILE, dtype=dtype)
+        self.columns = -(-width // chunk_size)
+        self.rows = -(-height // chunk_size)
+        self._chunks = OrderedDict()  # type: OrderedDict[Tuple[int, int], RenderTexture2D]
+        self._dirty = set()  # type: Set[Tuple[int, int]]
+        self.rendered = 0
+        self.evicted = 0
+
+    def tile(self, x: int, y: int) -> int:
+        return int(self.tiles[y, x])
+
+    def set_tile(self, x: int, y: int, tile: int) -> None:
+        if self.tiles[y, x] != tile:
+            self.tiles[y, x] = tile
+            key = (x // self.chunk_size, y // self.chunk_size)
+            if key in self._chunks:
+                self._dirty.add(key)
+
+    def fill(self, x: int, y: int, width: int, height: int, tile: int) -> None:
+        self.tiles[y:y + height, x:x + width] = tile
+        self.mark_dirty(x, y, width, height)
+
+    def set_region(self, x: int, y: int, tiles: np.ndarray) -> None:
+        """Copy a 2D array of tile ids with its top left corner at tile (x, y)."""
+        tiles = np.asarray(tiles)
+        self.tiles[y:y + tiles.shape[0], x:x + tiles.shape[1]] = tiles
+        self.mark_dirty(x, y, tiles.shape[1], tiles.shape[0])
+
+    def mark_dirty(self, x: int=0, y: int=0, width: Optional[int]=None, height: Optional[int]=None) -> None:
+        """Render the chunks over a tile region again when next in view (the whole map by default)."""
+        width = self.width - x if width is None else width
+        height = self.height - y if height is None else height
+        x0, y0 = max(x, 0) // self.chunk_size, max(y, 0) // self.chunk_size
+        x1 = min(x + width - 1, self.width - 1) // self.chunk_size
+        y1 = min(y + height - 1, self.height - 1) // self.chunk_size
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                if (cx, cy) in self._chunks:
+                    self._dirty.add((cx, cy))
+
+    def world_to_tile(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.tile_width)), int(math.floor(y / self.tile_height))
+
+    def view_rect(self, camera: Camera2D, screen_width: Optional[int]=None,
+                  screen_height: Optional[int]=None) -> Tuple[float, float, float, float]:
+        """World space bounds (x, y, width, height) of the screen seen through camera."""
+        screen_width = get_screen_width() if screen_width is None else screen_width
+        screen_height = get_screen_height() if screen_height is None else screen_height
+        zoom = camera.zoom or 1.0
+        angle = math.radians(-camera.rotation)
+        cos, sin = math.cos(angle), math.sin(angle)
+        xs, ys = [], []
+        for sx, sy in ((0, 0), (screen_width, 0), (0, screen_height), (screen_width, screen_height)):
+            dx = (sx - camera.offset.x) / zoom
+            dy = (sy - camera.offset.y) / zoom
+            xs.append(camera.target.x + dx * cos - dy * sin)
+            ys.append(camera.target.y + dx * sin + dy * cos)
+        return min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)
+
+    def visible_chunks(self, camera: Camera2D, screen_width: Optional[int]=None,
+                       screen_height: Optional[int]=None) -> List[Tuple[int, int]]:
+        """(column, row) of the chunks intersecting the camera view."""
+        x, y, width, height = self.view_rect(camera, screen_width, screen_height)
+        chunk_width = self.chunk_size * self.tile_width
+        chunk_height = self.chunk_size * self.tile_height
+        x0 = max(int(math.floor(x / chunk_width)), 0)
+        y0 = max(int(math.floor(y / chunk_height)), 0)
+        x1 = min(int(math.floor((x + width) / chunk_width)), self.columns - 1)
+        y1 = min(int(math.floor((y + height) / chunk_height)), self.rows - 1)
+        return [(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def _chunk_quads(self, cx: int, cy: int, dx: float, dy: float) -> Tuple[np.ndarray, np.ndarray]:
+        # source and dest rectangles of the tiles of a chunk, dest offset by (dx, dy)
+        size = self.chunk_size
+        block = self.tiles[cy * size:(cy + 1) * size, cx * size:(cx + 1) * size]
+        ys, xs = np.nonzero((block >= 0) & (block < len(self.tile_recs)))
+        source = self.tile_recs[block[ys, xs]]
+        dest = np.empty((len(xs), 4), dtype=np.float32)
+        dest[:, 0] = dx + xs * self.tile_width
+        dest[:, 1] = dy + ys * self.tile_height
+        dest[:, 2] = self.tile_width
+        dest[:, 3] = self.tile_height
+        return source, dest
+
+    def _render_chunk(self, key: Tuple[int, int]) -> RenderTexture2D:
+        target = self._chunks.get(key)
+        if target is None:
+            while len(self._chunks) >= self.max_chunks:
+                old_key, old = self._chunks.popitem(last=False)
+                self._dirty.discard(old_key)
+                unload_render_texture(old)
+                self.evicted += 1
+            target = load_render_texture(self.chunk_size * self.tile_width, self.chunk_size * self.tile_height)
+            self._chunks[key] = target
+        begin_texture_mode(target)
+        clear_background(BLANK)
+        draw_texture_quads(self.tileset, *self._chunk_quads(key[0], key[1], 0.0, 0.0))
+        end_texture_mode()
+        self._dirty.discard(key)
+        self.rendered += 1
+        return target
+
+    def update(self, camera: Camera2D, screen_width: Optional[int]=None, screen_height: Optional[int]=None,
+               max_renders: Optional[int]=None) -> int:
+        """
+        Render the chunks in view that are missing or dirty, returns how many were rendered.
+
+        Call outside of begin_mode2d(). max_renders caps the work of one frame,
+        the chunks left are drawn tile by tile until rendered.
+        """
+        rendered = 0
+        visible = self.visible_chunks(camera, screen_width, screen_height)[:self.max_chunks]
+        for key in visible:
+            # keep the chunks in view out of the eviction order
+            if key in self._chunks:
+                self._chunks.move_to_end(key)
+        for key in visible:
+            if max_renders is not None and rendered >= max_renders:
+                break
+            if key not in self._chunks or key in self._dirty:
+                self._render_chunk(key)
+                rendered += 1
+        return rendered
+
+    def draw(self, camera: Camera2D, tint: Union[Color, Seq]=WHITE, screen_width: Optional[int]=None,
+             screen_height: Optional[int]=None) -> None:
+        """Draw the chunks in view, inside begin_mode2d(camera)."""
+        chunk_width = self.chunk_size * self.tile_width
+        chunk_height = self.chunk_size * self.tile_height
+        sources, dests = [], []
+        for cx, cy in self.visible_chunks(camera, screen_width, screen_height):
+            key = (cx, cy)
+            x, y = cx * chunk_width, cy * chunk_height
+            target = self._chunks.get(key)
+            if target is None or key in self._dirty:
+                source, dest = self._chunk_quads(cx, cy, x, y)
+                sources.append(source)
+                dests.append(dest)
+                continue
+            self._chunks.move_to_end(key)
+            # render textures are stored bottom up
+            draw_texture_quads(target.texture, [(0, chunk_height, chunk_width, -chunk_height)],
+                               [(x, y, chunk_width, chunk_height)], tint)
+        if sources:
+            # chunks not rendered yet: their tiles all come from the tileset, one submission
+            draw_texture_quads(self.tileset, np.concatenate(sources), np.concatenate(dests), tint=tint)
+
+    def chunks(self) -> Iterator[Tuple[int, int]]:
+        """Chunks currently held in render textures, least recently drawn first."""
+        return iter(list(self._chunks))
+
+    @property
+    def vram_bytes(self) -> int:
+        """Estimated VRAM of the chunk render textures, color textures and depth renderbuffers."""
+        return sum(get_pixel_data_size(t.texture.width, t.texture.height, t.texture.format) +
+                   (t.depth.width * t.depth.height * _DEPTH_BYTES_PER_PIXEL if t.depth.id else 0)
+                   for t in self._chunks.values())
+
+    def unload(self) -> None:
+        """Release the chunk render textures (the tileset is left to the caller)."""
+        for target in self._chunks.values():
+            unload_render_texture(target)
+        self._chunks.clear()
+        self._dirty.clear()
+
+    def __str__(self) -> str:
+        return "(TILEMAP: {}x{} tiles of {}x{}, chunks: {}/{} cached, {} dirty)".format(
+            self.width, self.height, self.tile_width, self.tile_height, len(self._chunks), self.max_chunks,
+            len(self._dirty)
+        )
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import raylibpy.animtexture as animtexture
+from raylibpy import Texture2D, image_from_array
+from raylibpy.animtexture import ANIM_ATLAS, ANIM_STREAM, AnimatedTexture
+
+
+@pytest.fixture(autouse=True)
+def gpu(monkeypatch):
+    # no window: textures only get a size
+    def upload(image):
+        texture = Texture2D()
+        texture.id = 1
+        texture.width, texture.height, texture.mipmaps, texture.format = \
+            image.width, image.height, 1, image.format
+        return texture
+
+    monkeypatch.setattr(animtexture, 'load_texture_from_image', upload)
+    monkeypatch.setattr(animtexture, 'unload_texture', lambda texture: None)
+
+
+def _frames(count, width=16, height=8):
+    pixels = np.zeros((count * height, width, 4), dtype=np.uint8)
+    for frame in range(count):
+        pixels[frame * height:(frame + 1) * height] = frame
+    return image_from_array(pixels)
+
+
+def test_mode_follows_the_budgets():
+    frame_bytes = 16 * 8 * 4
+    anim = AnimatedTexture(_frames(4), [0.1] * 4)
+    assert anim.mode == ANIM_ATLAS and anim.ram_bytes == 0 and anim.vram_bytes == 4 * frame_bytes
+    anim.unload()
+
+    anim = AnimatedTexture(_frames(4), [0.1] * 4, atlas_budget=frame_bytes, ram_budget=4 * frame_bytes)
+    assert anim.mode == ANIM_STREAM and anim.ram_bytes == 4 * frame_bytes and anim.vram_bytes == frame_bytes
+    anim.unload()
+
+    image = _frames(4)
+    with pytest.raises(ValueError):
+        AnimatedTexture(image, [0.1] * 4, atlas_budget=frame_bytes, ram_budget=3 * frame_bytes)
+    # an explicit mode is not held to the budgets
+    anim = AnimatedTexture(image, [0.1] * 4, ANIM_STREAM, atlas_budget=frame_bytes, ram_budget=frame_bytes)
+    assert anim.mode == ANIM_STREAM
+    anim.unload()
+
+
+def test_atlas_grid_and_frame_clock():
+    anim = AnimatedTexture(_frames(5), [0.1, 0.2, 0.1, 0.1, 0.5], max_texture_size=32)
+    # 5 frames of 16x8 do not fit one 32 pixel column: 2 columns of 4
+    assert (anim.texture.width, anim.texture.height) == (32, 32)
+    assert anim.recs[:, :2].tolist() == [[0, 0], [0, 8], [0, 16], [0, 24], [16, 0]]
+    assert anim.frames_at(np.array([0.0, 0.15, 0.35, 0.99, 1.05])).tolist() == [0, 1, 2, 4, 0]
+    anim.loop = False
+    assert anim.frame_at(2.0) == 4
+    anim.unload()
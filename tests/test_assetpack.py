@@ -0,0 +1,80 @@
+import io
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from raylibpy import load_image, unload_image, unload_music_stream
+from raylibpy.assetpack import AssetPack, AssetPackBuilder
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+
+def test_entries_round_trip(tmp_path):
+    text = b'level data ' * 100
+    with AssetPackBuilder(tmp_path / 'assets.rlpack') as builder:
+        builder.add_bytes('levels/1.txt', text)
+        builder.add_bytes('raw.bin', os.urandom(256))
+        builder.add_file('sprites/cat.png', os.path.join(RESOURCES, 'cat.png'))
+        with pytest.raises(ValueError):
+            builder.add_bytes('raw.bin', b'again')
+
+    with AssetPack(tmp_path / 'assets.rlpack', verify=True) as pack:
+        assert sorted(pack) == ['levels/1.txt', 'raw.bin', 'sprites/cat.png']
+        assert pack.names('sprites/') == ['sprites/cat.png']
+        # compressible data is stored compressed, random data as is (read without a copy)
+        assert pack.read('levels/1.txt') == text and pack.size('levels/1.txt') == len(text)
+        assert isinstance(pack.read('raw.bin'), memoryview)
+        with pytest.raises(KeyError):
+            pack.read('missing')
+
+        image = pack.load_image('sprites/cat.png')
+        expected = load_image(os.path.join(RESOURCES, 'cat.png'))
+        assert np.array_equal(image.as_array(), expected.as_array())
+        unload_image(image)
+        unload_image(expected)
+
+
+def test_corruption_is_detected(tmp_path):
+    path = tmp_path / 'assets.rlpack'
+    with AssetPackBuilder(path, compress=False) as builder:
+        builder.add_bytes('data', b'0123456789')
+    data = bytearray(path.read_bytes())
+    data[data.index(b'0123')] = ord('X')
+    path.write_bytes(bytes(data))
+    with AssetPack(path) as pack:
+        assert bytes(pack.read('data')) == b'X123456789'
+    with AssetPack(path, verify=True) as pack:
+        with pytest.raises(ValueError):
+            pack.read('data')
+
+    path.write_bytes(b'NOPE' + bytes(data[4:]))
+    with pytest.raises(ValueError):
+        AssetPack(path)
+
+
+def test_failed_build_leaves_nothing(tmp_path):
+    with pytest.raises(RuntimeError):
+        with AssetPackBuilder(tmp_path / 'assets.rlpack') as builder:
+            builder.add_bytes('data', b'data')
+            raise RuntimeError
+    assert os.listdir(tmp_path) == []
+
+
+def test_music_releases_the_pack_when_unloaded(tmp_path):
+    sound = io.BytesIO()
+    with wave.open(sound, 'wb') as out:
+        out.setnchannels(2)
+        out.setsampwidth(2)
+        out.setframerate(22050)
+        out.writeframes(os.urandom(2000 * 4))
+    with AssetPackBuilder(tmp_path / 'assets.rlpack', compress=False) as builder:
+        builder.add_bytes('music/loop.wav', sound.getvalue())
+
+    pack = AssetPack(tmp_path / 'assets.rlpack')
+    # no audio device here: the stream cannot play but its decoder reads the pack
+    music = pack.load_music_stream('music/loop.wav')
+    assert music.ctxData and music.frameCount == 2000
+    unload_music_stream(music)
+    pack.close()
@@ -0,0 +1,54 @@
+import pytest
+
+from raylibpy.assets import AssetCache
+
+
+class _Asset(object):
+    pass
+
+
+def _add(cache, unloaded, key, ram=0, vram=0):
+    return cache.add(key, _Asset(), lambda asset: unloaded.append(key), ram, vram)
+
+
+def test_assets_are_shared_and_counted():
+    unloaded = []
+    cache = AssetCache()
+    first = _add(cache, unloaded, 'a', ram=10)
+    assert _add(cache, unloaded, 'a', ram=10) is first
+    assert cache.refs(first) == 2 and cache.stats.hits == 1 and cache.stats.misses == 1
+    cache.release(first)
+    cache.release(first)
+    with pytest.raises(ValueError):
+        cache.release(first)
+    with pytest.raises(KeyError):
+        cache.release(_Asset())
+    cache.clear()
+    assert unloaded == ['a'] and len(cache) == 0
+
+
+def test_trim_evicts_least_recently_used_unreferenced():
+    unloaded = []
+    cache = AssetCache(ram_budget=100)
+    for key in 'abc':
+        cache.release(_add(cache, unloaded, key, ram=40))
+    assert unloaded == ['a']
+    held = _add(cache, unloaded, 'b', ram=40)
+    cache.release(_add(cache, unloaded, 'd', ram=40))
+    # 'b' is referenced, 'c' is the oldest one that is not
+    assert unloaded == ['a', 'c'] and 'b' in cache
+    assert cache.stats.ram_bytes == 80 and cache.stats.evictions == 2
+    cache.release(held)
+
+
+def test_trim_only_evicts_the_memory_over_budget():
+    unloaded = []
+    cache = AssetCache(ram_budget=100, vram_budget=100)
+    cache.release(_add(cache, unloaded, 'image', ram=60))
+    cache.release(_add(cache, unloaded, 'texture', vram=60))
+    cache.release(_add(cache, unloaded, 'font', ram=10, vram=60))
+    # VRAM is over budget: the older image stays, the texture goes
+    assert unloaded == ['texture']
+    cache.release(_add(cache, unloaded, 'big image', ram=50))
+    assert unloaded == ['texture', 'image']
+    assert (cache.stats.ram_bytes, cache.stats.vram_bytes) == (60, 60)
@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+from raylibpy import Color, gen_image_color, unload_image
+from raylibpy.atlas import MaxRectsPacker, build_atlas, load_atlas
+
+
+def _overlap(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def test_packer_places_rects_inside_without_overlap():
+    rng = random.Random(3)
+    packer = MaxRectsPacker(256, 256)
+    for _ in range(300):
+        packer.insert(rng.randint(4, 24), rng.randint(4, 24))
+    assert 0.8 < packer.occupancy <= 1.0
+    for i, a in enumerate(packer.used):
+        assert a[0] >= 0 and a[1] >= 0 and a[0] + a[2] <= 256 and a[1] + a[3] <= 256
+        for b in packer.used[i + 1:]:
+            assert not _overlap(a, b)
+    # free rectangles never overlap a placed one, nor contain each other
+    for rect in packer.free:
+        assert not any(_overlap(rect, used) for used in packer.used)
+        assert not any(other != rect and MaxRectsPacker._contains(other, rect) for other in packer.free)
+
+
+def test_packer_reports_full_bin():
+    packer = MaxRectsPacker(32, 32)
+    assert packer.insert(32, 20) == (0, 0)
+    assert packer.insert(16, 16) is None
+    assert packer.insert(32, 12) == (0, 20)
+    assert packer.free == []
+
+
+@pytest.fixture
+def images():
+    rng = random.Random(5)
+    images = {'sprite{}'.format(i): gen_image_color(rng.randint(4, 40), rng.randint(4, 40),
+                                                    Color(rng.randrange(256), i, 7, 255)) for i in range(60)}
+    yield images
+    for image in images.values():
+        unload_image(image)
+
+
+def test_build_save_and_load(tmp_path, images):
+    atlas = build_atlas(images, max_size=128)
+    assert len(atlas) == 60 and len(atlas.pages) > 1
+    for page in atlas.pages:
+        assert page.width & (page.width - 1) == 0 and page.height & (page.height - 1) == 0
+    for name, image in images.items():
+        page, rec = atlas.source(name)
+        x, y, width, height = int(rec.x), int(rec.y), int(rec.width), int(rec.height)
+        assert (width, height) == (image.width, image.height)
+        assert np.array_equal(atlas.pages[page].as_array()[y:y + height, x:x + width], image.as_array())
+
+    atlas.save(tmp_path / 'sprites.rlatlas')
+    loaded = load_atlas(tmp_path / 'sprites.rlatlas')
+    assert {name: (page, rec.x, rec.y, rec.width, rec.height) for name, (page, rec) in loaded.index.items()} == \
+        {name: (page, rec.x, rec.y, rec.width, rec.height) for name, (page, rec) in atlas.index.items()}
+    for page, other in zip(atlas.pages, loaded.pages):
+        assert np.array_equal(page.as_array(), other.as_array())
+    loaded.unload()
+    atlas.unload()
+
+
+def test_image_too_large_for_a_page():
+    image = gen_image_color(64, 8, Color(1, 2, 3, 255))
+    try:
+        with pytest.raises(ValueError):
+            build_atlas({'wide': image}, max_size=64)
+    finally:
+        unload_image(image)
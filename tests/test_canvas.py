@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pytest
+
+from raylibpy import Color, image_from_array, load_image, unload_image
+from raylibpy.canvas import Canvas, RenderService, load_image_font, unload_image_font
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+BLACK, WHITE = Color(0, 0, 0, 255), Color(255, 255, 255, 255)
+RED, GREEN, BLUE = Color(255, 0, 0, 255), Color(0, 255, 0, 255), Color(0, 0, 255, 255)
+
+
+@pytest.fixture(scope='module')
+def font():
+    font = load_image_font(os.path.join(RESOURCES, 'KAISG.ttf'), 20)
+    yield font
+    unload_image_font(font)
+
+
+def _mask(canvas, channel):
+    return canvas.colors()[:, :, channel] == 255
+
+
+def test_primitives():
+    with Canvas(12, 10, BLACK) as canvas:
+        canvas.draw_rectangle(2, 3, 4, 2, RED)
+        expected = np.zeros((10, 12), dtype=bool)
+        expected[3:5, 2:6] = True
+        assert np.array_equal(_mask(canvas, 0), expected)
+
+        canvas.clear_background(BLACK)
+        canvas.draw_line(1, 1, 6, 1, RED)
+        canvas.draw_pixel_v((9, 8), RED)
+        expected[:] = False
+        expected[1, 1:7] = expected[8, 9] = True
+        assert np.array_equal(_mask(canvas, 0), expected)
+
+        canvas.draw_rectangle_lines(0, 0, 12, 10, GREEN)
+        green = _mask(canvas, 1)
+        assert green[[0, -1]].all() and green[:, [0, -1]].all() and not green[1:-1, 1:-1].any()
+
+        canvas.clear_background(BLACK)
+        canvas.draw_circle_v((6, 5), 3, BLUE)
+        ys, xs = np.nonzero(_mask(canvas, 2))
+        # every pixel lies on the circle, its extremes included
+        assert (np.abs(np.hypot(xs - 6, ys - 5) - 3) < 1).all()
+        assert {(3, 5), (9, 5), (6, 2), (6, 8)} <= set(zip(xs.tolist(), ys.tolist()))
+
+
+def test_images_are_blended():
+    sprite = image_from_array(np.full((2, 2, 4), (255, 0, 0, 128), dtype=np.uint8))
+    with Canvas(4, 4, BLUE) as canvas:
+        canvas.draw_texture(sprite, 1, 1)
+        pixels = canvas.as_array()
+        assert (pixels[1:3, 1:3] == (127, 0, 127, 255)).all()
+        pixels[1:3, 1:3] = (0, 0, 255, 255)
+        assert (canvas.colors() == (0, 0, 255, 255)).all()
+        canvas.draw_texture_pro(sprite, (0, 0, 2, 2), (0, 0, 4, 4), Color(255, 255, 255, 255))
+        assert (canvas.as_array()[:, :, 0] == 127).all()
+    unload_image(sprite)
+
+
+def test_text(font):
+    with Canvas(60, 30, WHITE, font) as canvas:
+        canvas.draw_text("Hi", 5, 4, 20, BLACK)
+        ys, xs = np.nonzero(canvas.colors()[:, :, 0] < 128)
+        width = canvas.measure_text("Hi", 20)
+        assert width > 0 and len(xs)
+        # the ink stays in the measured box
+        assert xs.min() >= 5 and xs.max() < 5 + width
+        assert ys.min() >= 4 and ys.max() < 4 + 20
+        ink = canvas.colors()[:, :, 0] < 128
+
+        # the same text moves with its position
+        canvas.clear_background(WHITE)
+        canvas.draw_text("Hi", 15, 6, 20, BLACK)
+        assert np.array_equal(canvas.colors()[:, :, 0] < 128, np.roll(ink, (2, 10), axis=(0, 1)))
+
+    # no window, no default font
+    with Canvas(8, 8) as canvas:
+        with pytest.raises(ValueError):
+            canvas.draw_text("Hi", 0, 0, 10, BLACK)
+
+
+def render_label(canvas, job):
+    if job == 'broken':
+        raise RuntimeError("cannot render {}".format(job))
+    canvas.draw_rectangle(0, 0, len(job), 2, RED)
+
+
+def test_render_service_in_process(tmp_path):
+    service = RenderService(render_label, 8, 4, BLUE, workers=0)
+    progress = []
+    results = service.run(['a', 'abc', 'broken'], progress=lambda done, total, result: progress.append((done, total)))
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    # in process results come in input order
+    assert [result.job for result in results] == ['a', 'abc', 'broken']
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[2].error == 'RuntimeError: cannot render broken' and results[2].pixels is None
+    pixels = results[1].pixels
+    assert pixels.shape == (4, 8, 4)
+    assert (pixels[:2, :3] == (255, 0, 0, 255)).all()
+    assert (pixels[2:] == (0, 0, 255, 255)).all() and (pixels[:, 3:] == (0, 0, 255, 255)).all()
+
+    results = service.run(['ab'], target=lambda job: str(tmp_path / 'labels' / (job + '.png')))
+    assert results[0].ok and results[0].target == str(tmp_path / 'labels' / 'ab.png')
+    image = load_image(results[0].target)
+    assert (image.as_array()[:2, :2] == (255, 0, 0, 255)).all()
+    unload_image(image)
+    assert service._executor is None
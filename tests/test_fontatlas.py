@@ -0,0 +1,149 @@
+import os
+
+import pytest
+
+import raylibpy
+import raylibpy.fontatlas as fontatlas
+from raylibpy import Texture2D, Vector2, measure_text_ex
+from raylibpy.fontatlas import DynamicFontAtlas, ShelfPacker
+from raylibpy.textlayout import get_glyph_table
+
+FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources', 'KAISG.ttf')
+
+
+def _padded(rect, padding):
+    x, y, width, height = rect
+    return x - padding, y - padding, x + width + padding, y + height + padding
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def test_rects_keep_padding_from_edges_and_each_other():
+    packer = ShelfPacker(64, 64, padding=2)
+    sizes = [(10, 12), (7, 12), (20, 8), (5, 5), (12, 12), (30, 9), (9, 14)]
+    for key, (width, height) in enumerate(sizes):
+        position, evicted = packer.insert(key, width, height)
+        assert position is not None and evicted == []
+    assert packer.rect(0)[:2] == (2, 2)
+    rects = [packer.rect(key) for key in range(len(sizes))]
+    for rect in rects:
+        left, top, right, bottom = _padded(rect, 2)
+        assert left >= 0 and top >= 0 and right <= 64 and bottom <= 64
+    # padded areas may share their padding pixels, never the rectangles
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            assert not _overlap(_padded(a, 1), _padded(b, 1))
+
+
+def test_full_packer_reports_failure_until_grown():
+    packer = ShelfPacker(16, 16, padding=1)
+    assert packer.insert('a', 14, 14)[0] == (1, 1)
+    assert packer.insert('b', 4, 4) == (None, [])
+    packer.grow(32, 16)
+    assert packer.insert('b', 4, 4)[0] == (16, 1)
+    with pytest.raises(ValueError):
+        packer.grow(16, 16)
+
+
+def test_eviction_frees_least_recently_used_unpinned_shelf():
+    packer = ShelfPacker(32, 32, padding=1)
+    packer.insert('a', 8, 8)   # shelf y=1
+    packer.insert('b', 8, 14)  # shelf y=10
+    packer.insert('c', 8, 6)   # fits the first shelf
+    packer.touch('a')
+    assert packer.pop_freed() == []
+
+    assert packer.insert('d', 24, 12)[0] is None
+    position, evicted = packer.insert('d', 24, 12, evict=True, pinned=['a'])
+    # the shelf of 'b' is the least recently used one without a pinned key
+    assert evicted == ['b'] and position == (1, 10)
+    assert packer.pop_freed() == [(0, 10, 32, 15)]
+    assert 'b' not in packer and len(packer) == 3
+
+    assert packer.insert('e', 30, 30, evict=True, pinned=['a', 'd']) == (None, [])
+
+
+def test_remove_frees_the_rect():
+    packer = ShelfPacker(32, 32, padding=1)
+    packer.insert('a', 4, 4)
+    packer.insert('b', 6, 4)
+    packer.remove('a')
+    assert packer.pop_freed() == [(1, 1, 4, 4)]
+    # re-inserting a key moves it and frees its old place
+    packer.insert('b', 6, 4)
+    assert packer.pop_freed() == [(6, 1, 6, 4)]
+    assert packer.pop_freed() == []
+
+
+def test_atlas_rasterizes_and_evicts_headless():
+    atlas = DynamicFontAtlas(FONT, 20, size=64, max_size=64)
+    atlas.ensure("ABC")
+    assert len(atlas) == 3 and 65 in atlas
+    x, y, width, height = atlas.packer.rect(65)
+    assert (x, y) == (1, 1)
+    assert atlas.pixels[y:y + height, x:x + width, 1].any()
+    # nothing outside the packed glyphs
+    coverage = atlas.pixels[:, :, 1].copy()
+    for codepoint in (65, 66, 67):
+        x, y, width, height = atlas.packer.rect(codepoint)
+        coverage[y:y + height, x:x + width] = 0
+    assert not coverage.any()
+
+    for text in ("DEFG", "HIJK", "LMNO", "PQRS", "TUVW", "XYZ0"):
+        atlas.ensure(text)
+    assert 65 not in atlas
+    # evicted coverage is cleared: only the glyphs in the atlas leave pixels behind
+    coverage = atlas.pixels[:, :, 1].copy()
+    for codepoint in atlas.glyphs:
+        x, y, width, height = atlas.packer.rect(codepoint)
+        coverage[y:y + height, x:x + width] = 0
+    assert not coverage.any()
+    assert (atlas.pixels[:, :, 0] == 255).all()
+
+
+def test_atlas_too_small_for_one_text():
+    atlas = DynamicFontAtlas(FONT, 40, size=32, max_size=32)
+    with pytest.raises(ValueError):
+        atlas.ensure("WWWWMMMM@@")
+
+
+def test_rebuilt_font_forgets_only_its_own_caches(monkeypatch):
+    textures = iter(range(20, 40))
+
+    def upload(image):
+        texture = Texture2D()
+        texture.id = next(textures)
+        texture.width, texture.height = image.width, image.height
+        return texture
+
+    monkeypatch.setattr(fontatlas, 'load_texture_from_image', upload)
+    monkeypatch.setattr(fontatlas, 'update_texture', lambda texture, pixels: None)
+    monkeypatch.setattr(fontatlas, 'unload_texture', lambda texture: None)
+    monkeypatch.setattr(raylibpy._rl, 'MeasureTextEx', lambda font, text, size, spacing: Vector2(len(text), size))
+
+    other = DynamicFontAtlas(FONT, 20, size=64)
+    other.ensure("xyz")
+    other_font = other.font
+    measure_text_ex(other_font, "xyz", 20, 1)
+    other_table = get_glyph_table(other_font)
+
+    atlas = DynamicFontAtlas(FONT, 20, size=64)
+    atlas.ensure("AB")
+    old_key = raylibpy._font_key(atlas.font)
+    measure_text_ex(atlas.font, "AB", 20, 1)
+    get_glyph_table(atlas.font)
+    atlas.ensure("C")
+    new_key = raylibpy._font_key(atlas.font)
+
+    assert old_key not in raylibpy._glyph_tables
+    assert not [key for key in raylibpy._measure_cache if key[0] == old_key]
+    # the other font keeps its measurements and glyph table
+    assert get_glyph_table(other_font) is other_table
+    assert (raylibpy._font_key(other_font), "xyz", 20, 1) in raylibpy._measure_cache
+
+    get_glyph_table(atlas.font)
+    atlas.unload()
+    assert new_key not in raylibpy._glyph_tables
+    assert get_glyph_table(other_font) is other_table
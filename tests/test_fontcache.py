@@ -0,0 +1,57 @@
+import os
+from ctypes import c_ubyte
+
+import pytest
+
+import raylibpy.fontcache as fontcache
+from raylibpy import Texture2D, get_pixel_data_size
+
+FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources', 'KAISG.ttf')
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    # no window: record the atlases instead of uploading them
+    images = []
+
+    def upload(image):
+        size = get_pixel_data_size(image.width, image.height, image.format)
+        images.append((image.width, image.height, image.format, bytes((c_ubyte * size).from_address(image.data))))
+        return Texture2D()
+
+    monkeypatch.setattr(fontcache, 'load_texture_from_image', upload)
+    return images
+
+
+def _metrics(font):
+    return [(font.glyphs[i].value, font.glyphs[i].offsetX, font.glyphs[i].offsetY, font.glyphs[i].advanceX,
+             font.recs[i].x, font.recs[i].y, font.recs[i].width, font.recs[i].height) for i in range(font.glyphCount)]
+
+
+def test_warm_load_matches_cold_load(tmp_path, uploads):
+    cold = fontcache.load_font_cached(FONT, 24, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.rlfc'))) == 1
+    warm = fontcache.load_font_cached(FONT, 24, cache_dir=tmp_path)
+    assert (warm.baseSize, warm.glyphCount, warm.glyphPadding) == (cold.baseSize, cold.glyphCount, cold.glyphPadding)
+    assert _metrics(warm) == _metrics(cold)
+    assert uploads[0] == uploads[1]
+
+
+def test_key_depends_on_parameters():
+    key = fontcache.font_cache_key(FONT, 24)
+    assert key == fontcache.font_cache_key(FONT, 24, list(range(32, 127)))
+    assert key != fontcache.font_cache_key(FONT, 25)
+    assert key != fontcache.font_cache_key(FONT, 24, sdf=True)
+    assert key != fontcache.font_cache_key(FONT, 24, [65, 66])
+
+
+def test_damaged_files_are_rasterized_again(tmp_path, uploads):
+    fontcache.load_font_cached(FONT, 20, cache_dir=tmp_path)
+    path, = tmp_path.glob('*.rlfc')
+    data = path.read_bytes()
+    for damaged in (data[:-1], data + b'x', b'XXXX' + data[4:], data[:10]):
+        path.write_bytes(damaged)
+        assert fontcache._read_cache(path) is None
+        fontcache.load_font_cached(FONT, 20, cache_dir=tmp_path)
+        assert path.read_bytes() == data
+    assert fontcache.clear_font_cache(tmp_path) == 1
@@ -0,0 +1,119 @@
+import threading
+from ctypes import string_at
+
+import numpy as np
+import pytest
+
+import raylibpy
+from raylibpy import load_image_anim, unload_image
+from raylibpy.gifrecorder import GifRecorder
+
+COLORS = [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (255, 255, 255, 255), (0, 0, 0, 255)]
+
+
+def _frame(color, width=8, height=6):
+    frame = np.empty((height, width, 4), dtype=np.uint8)
+    frame[:] = color
+    return frame
+
+
+def _delays(data):
+    # frame delays (1/100 s) of the graphic control extensions, walking the GIF blocks
+    position = 13
+    if data[10] & 0x80:
+        position += 3 << ((data[10] & 7) + 1)
+    delays = []
+    while data[position] != 0x3B:
+        if data[position] == 0x21:
+            if data[position + 1] == 0xF9:
+                delays.append(data[position + 4] | data[position + 5] << 8)
+            position += 2
+        else:
+            assert data[position] == 0x2C
+            flags = data[position + 9]
+            position += 10 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0) + 1
+        while data[position]:
+            position += data[position] + 1
+        position += 1
+    return delays
+
+
+def _decode(path):
+    image, frames = load_image_anim(str(path))
+    size = image.width * image.height * 4
+    pixels = np.frombuffer(string_at(image.data, size * frames), dtype=np.uint8)
+    pixels = pixels.reshape(frames, image.height, image.width, 4).copy()
+    unload_image(image)
+    return pixels
+
+
+@pytest.fixture
+def stalled(monkeypatch):
+    # keeps the encoder busy on its first frame until the event is set
+    release = threading.Event()
+    encode = raylibpy._rl.msf_gif_frame_to_file
+
+    def frame_to_file(*args):
+        release.wait(10)
+        return encode(*args)
+
+    monkeypatch.setattr(raylibpy._rl, 'msf_gif_frame_to_file', frame_to_file)
+    return release
+
+
+def test_frames_and_delays(tmp_path):
+    path = tmp_path / 'capture.gif'
+    with GifRecorder(path, scale=2) as recorder:
+        for color, timestamp in zip(COLORS[:3], (10.0, 10.05, 10.12)):
+            assert recorder.add_frame(_frame(color), timestamp)
+        assert recorder.frame_size == (4, 3)
+    assert (recorder.captured, recorder.dropped, recorder.encoded) == (3, 0, 3)
+
+    data = path.read_bytes()
+    assert data.startswith(b'GIF89a') and data.endswith(b';')
+    # the last frame lasts as long as the average of the others
+    assert _delays(data) == [5, 7, 6]
+    frames = _decode(path)
+    assert frames.shape == (3, 3, 4, 4)
+    for frame, color in zip(frames, COLORS):
+        assert (frame == color).all()
+
+
+def test_full_ring_drops_frames(tmp_path, stalled):
+    path = tmp_path / 'capture.gif'
+    recorder = GifRecorder(path, 8, 6, slots=3)
+    # the encoder holds a frame until the next one gives its delay: three frames fill the ring
+    added = [recorder.add_frame(_frame(color), i * 0.1) for i, color in enumerate(COLORS)]
+    assert added == [True, True, True, False, False]
+    assert (recorder.captured, recorder.dropped) == (3, 2)
+    stalled.set()
+    recorder.close()
+    assert recorder.encoded == 3 and recorder.pending == 0
+    with pytest.raises(ValueError):
+        recorder.add_frame(_frame(COLORS[0]))
+
+    data = path.read_bytes()
+    assert data.startswith(b'GIF89a')
+    assert _delays(data) == [10, 10, 10]
+    frames = _decode(path)
+    assert len(frames) == 3
+    for frame, color in zip(frames, COLORS):
+        assert (frame == color).all()
+
+
+def test_every_and_frame_checks(tmp_path):
+    recorder = GifRecorder(tmp_path / 'capture.gif', every=2)
+    assert [recorder.add_frame(_frame(color), i * 0.1) for i, color in enumerate(COLORS)] == \
+        [True, False, True, False, True]
+    # skipped calls do not look at the frame
+    assert not recorder.add_frame(_frame(COLORS[0], width=4), 1.0)
+    with pytest.raises(ValueError):
+        recorder.add_frame(_frame(COLORS[0], width=4), 1.0)
+    assert not recorder.add_frame(None)
+    with pytest.raises(ValueError):
+        recorder.add_frame(np.zeros((6, 8, 3), dtype=np.uint8), 1.0)
+    recorder.close()
+    assert (recorder.captured, recorder.dropped, recorder.encoded) == (3, 0, 3)
+    assert len(_decode(tmp_path / 'capture.gif')) == 3
+    with pytest.raises(ValueError):
+        GifRecorder(tmp_path / 'other.gif', bit_depth=17)
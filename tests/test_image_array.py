@@ -0,0 +1,122 @@
+import gc
+
+import numpy as np
+import pytest
+
+import raylibpy
+from raylibpy import (
+    COMPRESSED_DXT1_RGB,
+    UNCOMPRESSED_GRAY_ALPHA,
+    UNCOMPRESSED_GRAYSCALE,
+    UNCOMPRESSED_R4G4B4A4,
+    UNCOMPRESSED_R5G5B5A1,
+    UNCOMPRESSED_R5G6B5,
+    UNCOMPRESSED_R8G8B8A8,
+    UNCOMPRESSED_R32G32B32A32,
+    Image,
+    image_copy,
+    image_format,
+    image_from_array,
+    unload_image,
+)
+
+
+def _pixels(dtype, channels, seed=0):
+    random = np.random.default_rng(seed)
+    if dtype == 'float32':
+        return random.random((3, 5, channels), dtype=np.float32)
+    return random.integers(0, np.iinfo(dtype).max, (3, 5, channels), endpoint=True).astype(dtype)
+
+
+@pytest.mark.parametrize('pxl_format', sorted(raylibpy._PIXEL_LAYOUTS))
+def test_every_layout_round_trips(pxl_format):
+    dtype, channels = raylibpy._PIXEL_LAYOUTS[pxl_format]
+    array = _pixels(dtype, channels)
+    # packed 16 bit formats cannot be told apart by dtype and channels
+    image = image_from_array(array, pxl_format if dtype == 'uint16' else None)
+    assert (image.width, image.height, image.mipmaps, image.format) == (5, 3, 1, pxl_format)
+    view = image.as_array()
+    assert view.dtype == array.dtype and view.shape == array.shape
+    assert np.array_equal(view, array)
+
+    # raylib sees the same amount of data: its own copy reads back identical
+    copy = image_copy(image)
+    assert np.array_equal(copy.as_array(), array)
+    unload_image(copy)
+    unload_image(image)
+
+
+def test_two_dimensional_arrays_are_one_channel():
+    array = _pixels('uint8', 1)[:, :, 0]
+    image = image_from_array(array)
+    assert image.format == UNCOMPRESSED_GRAYSCALE
+    assert image.as_array().shape == (3, 5, 1)
+    unload_image(image)
+
+
+@pytest.mark.parametrize('pxl_format, value, rgba', [
+    (UNCOMPRESSED_R5G6B5, 0xF800, [255, 0, 0, 255]),
+    (UNCOMPRESSED_R5G5B5A1, 0x07C1, [0, 255, 0, 255]),
+    (UNCOMPRESSED_R4G4B4A4, 0x00F0, [0, 0, 255, 0]),
+])
+def test_packed_formats_mean_what_raylib_means(pxl_format, value, rgba):
+    image = image_from_array(np.full((2, 2), value, dtype=np.uint16), pxl_format)
+    image_format(image, UNCOMPRESSED_R8G8B8A8)
+    assert image.as_array()[0, 0].tolist() == rgba
+    unload_image(image)
+
+
+def test_gray_and_float_formats_convert_like_raylib():
+    gray = image_from_array(np.array([[[10, 200]]], dtype=np.uint8))
+    assert gray.format == UNCOMPRESSED_GRAY_ALPHA
+    image_format(gray, UNCOMPRESSED_R8G8B8A8)
+    assert gray.as_array()[0, 0].tolist() == [10, 10, 10, 200]
+    unload_image(gray)
+
+    hdr = image_from_array(np.array([[[1.0, 0.0, 0.5, 1.0]]], dtype=np.float32))
+    assert hdr.format == UNCOMPRESSED_R32G32B32A32
+    image_format(hdr, UNCOMPRESSED_R8G8B8A8)
+    assert hdr.as_array()[0, 0].tolist() == [255, 0, 127, 255]
+    unload_image(hdr)
+
+
+def test_zero_copy_image_keeps_its_array_alive():
+    image = image_from_array(np.zeros((4, 4, 4), dtype=np.uint8), copy=False)
+    gc.collect()
+    assert image._array.ctypes.data == image.data
+    view = image.as_array()
+    view[1, 2] = (1, 2, 3, 4)
+    assert image._array[1, 2].tolist() == [1, 2, 3, 4]
+
+    array = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+    image = image_from_array(array, copy=False)
+    array[0, 0, 0] = 99
+    assert image.as_array()[0, 0, 0] == 99
+    copied = image_from_array(array)
+    array[0, 0, 0] = 7
+    assert copied.as_array()[0, 0, 0] == 99
+    unload_image(copied)
+
+
+def test_unsupported_arrays_are_refused():
+    for array in (np.zeros((2, 2, 4), dtype=np.int32), np.zeros((2, 2, 4), dtype=np.float64),
+                  np.zeros((2, 2, 5), dtype=np.uint8), np.zeros((2, 2, 2), dtype=np.float32),
+                  np.zeros((2, 2, 2, 4), dtype=np.uint8), np.zeros(4, dtype=np.uint8),
+                  np.zeros((2, 2), dtype=np.uint16)):
+        with pytest.raises(ValueError):
+            image_from_array(array)
+    with pytest.raises(ValueError):
+        image_from_array(np.zeros((2, 2, 3), dtype=np.uint8), UNCOMPRESSED_R8G8B8A8)
+    with pytest.raises(ValueError):
+        image_from_array(np.zeros((2, 2), dtype=np.uint8), UNCOMPRESSED_R5G6B5)
+    with pytest.raises(ValueError):
+        image_from_array(np.zeros((4, 4, 4), dtype=np.uint8)[:, ::2], copy=False)
+
+
+def test_views_need_uncompressed_pixels():
+    with pytest.raises(ValueError):
+        Image(None, 4, 4, 1, UNCOMPRESSED_R8G8B8A8).as_array()
+    image = image_from_array(np.zeros((4, 4, 4), dtype=np.uint8), copy=False)
+    image.format = COMPRESSED_DXT1_RGB
+    with pytest.raises(ValueError):
+        image.as_array()
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from raylibpy import (
+    UNCOMPRESSED_GRAYSCALE,
+    UNCOMPRESSED_R5G6B5,
+    UNCOMPRESSED_R8G8B8,
+    get_image_alpha_border,
+    get_image_color,
+    get_image_colors,
+    image_from_array,
+    image_histogram,
+    image_unique_colors,
+    load_image_colors,
+    load_image_palette,
+    unload_image,
+)
+
+RED, GREEN, BLUE, CLEAR = (255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (0, 0, 0, 0)
+
+
+def _rgba():
+    # 4x3: red background, a green column at x=1, one blue pixel at (3, 2), a clear top right corner
+    pixels = np.empty((3, 4, 4), dtype=np.uint8)
+    pixels[:] = RED
+    pixels[:, 1] = GREEN
+    pixels[2, 3] = BLUE
+    pixels[0, 3] = CLEAR
+    return pixels
+
+
+@pytest.fixture
+def rgba():
+    image = image_from_array(_rgba())
+    yield image
+    unload_image(image)
+
+
+@pytest.fixture
+def rgb():
+    # the same pixels without alpha: raylib converts them through LoadImageColors
+    image = image_from_array(np.ascontiguousarray(_rgba()[:, :, :3]))
+    assert image.format == UNCOMPRESSED_R8G8B8
+    yield image
+    unload_image(image)
+
+
+def _opaque(pixels):
+    pixels = pixels.copy()
+    pixels[:, :, 3] = 255
+    return pixels
+
+
+def test_load_image_colors(rgba, rgb):
+    assert np.array_equal(load_image_colors(rgba), _rgba())
+    assert np.array_equal(load_image_colors(rgb), _opaque(_rgba()))
+    # a copy, not a view on the image
+    colors = load_image_colors(rgba)
+    colors[:] = 0
+    assert np.array_equal(rgba.as_array(), _rgba())
+
+    gray = image_from_array(np.array([[0, 128, 255]], dtype=np.uint8))
+    assert gray.format == UNCOMPRESSED_GRAYSCALE
+    assert load_image_colors(gray)[0].tolist() == [[0, 0, 0, 255], [128, 128, 128, 255], [255, 255, 255, 255]]
+    unload_image(gray)
+
+
+def test_get_image_color_and_colors(rgba, rgb):
+    for image in (rgba, rgb):
+        for (x, y), expected in (((0, 0), RED), ((1, 2), GREEN), ((3, 2), BLUE)):
+            color = get_image_color(image, x, y)
+            assert (color.r, color.g, color.b, color.a) == expected
+    points = [(3, 2), (1, 0), (0, 1), (3, 0)]
+    assert get_image_colors(rgba, points).tolist() == [list(BLUE), list(GREEN), list(RED), list(CLEAR)]
+    assert get_image_colors(rgb, np.array(points)).tolist() == [list(BLUE), list(GREEN), list(RED), [0, 0, 0, 255]]
+    assert get_image_colors(rgba, []).shape == (0, 4)
+    for point in ((-1, 0), (4, 0), (0, 3)):
+        with pytest.raises(ValueError):
+            get_image_colors(rgba, [point])
+
+
+def test_unique_colors_are_counted_most_used_first(rgba, rgb):
+    colors, counts = image_unique_colors(rgba)
+    # ties keep the order of the packed little endian values
+    assert colors.tolist() == [list(RED), list(GREEN), list(CLEAR), list(BLUE)]
+    assert counts.tolist() == [7, 3, 1, 1]
+    colors, counts = image_unique_colors(rgba, max_count=2)
+    assert colors.tolist() == [list(RED), list(GREEN)] and counts.tolist() == [7, 3]
+    colors, counts = image_unique_colors(rgb)
+    assert colors.tolist() == [list(RED), list(GREEN), [0, 0, 0, 255], list(BLUE)]
+    assert counts.tolist() == [7, 3, 1, 1]
+
+
+def test_palette(rgba, rgb):
+    # raylib leaves fully transparent pixels out
+    assert sorted(load_image_palette(rgba).tolist()) == sorted([list(RED), list(GREEN), list(BLUE)])
+    assert load_image_palette(rgba, max_palette_size=2).shape == (2, 4)
+    assert sorted(load_image_palette(rgb).tolist()) == sorted([list(RED), list(GREEN), list(BLUE), [0, 0, 0, 255]])
+
+
+def test_histogram(rgba, rgb):
+    histogram = image_histogram(rgba)
+    assert histogram.shape == (4, 256) and (histogram.sum(axis=1) == 12).all()
+    # red: 7 pixels at 255, the rest at 0; alpha: one clear pixel
+    assert (histogram[0, 255], histogram[0, 0]) == (7, 5)
+    assert (histogram[1, 255], histogram[2, 255]) == (3, 1)
+    assert (histogram[3, 255], histogram[3, 0]) == (11, 1)
+    coarse = image_histogram(rgba, bins=4)
+    assert coarse.tolist() == [[5, 0, 0, 7], [9, 0, 0, 3], [11, 0, 0, 1], [1, 0, 0, 11]]
+    assert image_histogram(rgb, bins=2).tolist() == [[5, 7], [9, 3], [11, 1], [0, 12]]
+
+    packed = image_from_array(np.full((2, 3), 0xF800, dtype=np.uint16), UNCOMPRESSED_R5G6B5)
+    assert image_histogram(packed, bins=2).tolist() == [[0, 6], [6, 0], [6, 0], [0, 6]]
+    unload_image(packed)
+
+
+def test_alpha_border():
+    pixels = np.zeros((6, 8, 4), dtype=np.uint8)
+    pixels[1:4, 2:7] = (255, 255, 255, 200)
+    pixels[4, 3] = (255, 255, 255, 50)
+    image = image_from_array(pixels)
+    border = get_image_alpha_border(image, 0.1)
+    assert (border.x, border.y, border.width, border.height) == (2, 1, 5, 4)
+    # the faint pixel falls under a higher threshold
+    border = get_image_alpha_border(image, 0.5)
+    assert (border.x, border.y, border.width, border.height) == (2, 1, 5, 3)
+    unload_image(image)
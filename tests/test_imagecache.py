@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pytest
+
+import raylibpy.imagecache as imagecache
+from raylibpy import Color, UNCOMPRESSED_R5G6B5, export_image, gen_image_color, unload_image
+from raylibpy.imagecache import clear_image_cache, image_cache_key, load_image_cached, trim_image_cache
+from raylibpy.pipeline import ImagePipeline
+
+
+def _source(path, color, width=16, height=8):
+    image = gen_image_color(width, height, color)
+    assert export_image(str(path), image)
+    unload_image(image)
+    return str(path)
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    # counts the real decodes, a cache hit makes none
+    calls = []
+    load_image = imagecache.load_image
+
+    def counted(file_name):
+        calls.append(file_name)
+        return load_image(file_name)
+
+    monkeypatch.setattr(imagecache, 'load_image', counted)
+    return calls
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    calls = []
+    file_sha1 = imagecache._file_sha1
+
+    def counted(path):
+        calls.append(path)
+        return file_sha1(path)
+
+    monkeypatch.setattr(imagecache, '_file_sha1', counted)
+    return calls
+
+
+def _load(source, recipe, cache_dir, **kwargs):
+    image = load_image_cached(source, recipe, cache_dir=cache_dir, **kwargs)
+    result = (image.width, image.height, image.mipmaps, image.format, image.as_array().copy())
+    unload_image(image)
+    return result
+
+
+def test_warm_load_skips_decoding(tmp_path, decodes):
+    source = _source(tmp_path / 'red.png', Color(255, 0, 0, 255))
+    recipe = ImagePipeline().resize_nn(8, 4).format(UNCOMPRESSED_R5G6B5).mipmaps()
+    cold = _load(source, recipe, tmp_path / 'cache')
+    warm = _load(source, recipe, tmp_path / 'cache')
+    assert decodes == [source]
+    assert cold[:4] == warm[:4] == (8, 4, 4, UNCOMPRESSED_R5G6B5)
+    assert np.array_equal(cold[4], warm[4])
+    assert (warm[4] == 0xF800).all()
+
+
+def test_recipe_change_is_a_new_entry(tmp_path, decodes):
+    source = _source(tmp_path / 'red.png', Color(255, 0, 0, 255))
+    small, large = ImagePipeline().resize_nn(4, 2), ImagePipeline().resize_nn(8, 4)
+    assert image_cache_key(source, small) != image_cache_key(source, large)
+    assert image_cache_key(source, small) == image_cache_key(source, ImagePipeline().resize_nn(4, 2))
+    assert image_cache_key(source) != image_cache_key(str(tmp_path / 'other.png'))
+    assert _load(source, small, tmp_path)[:2] == (4, 2)
+    assert _load(source, large, tmp_path)[:2] == (8, 4)
+    assert _load(source, small, tmp_path)[:2] == (4, 2)
+    assert len(decodes) == 2
+    assert len(list(tmp_path.glob('*.rlic'))) == 2
+
+
+def test_touched_source_is_rehashed_once(tmp_path, decodes, hashes):
+    source = _source(tmp_path / 'red.png', Color(255, 0, 0, 255))
+    _load(source, None, tmp_path / 'cache')
+    hashes.clear()
+    # same contents, newer mtime: the entry stays valid and remembers the new mtime
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _load(source, None, tmp_path / 'cache')
+    assert hashes == [source] and len(decodes) == 1
+    _load(source, None, tmp_path / 'cache')
+    assert hashes == [source] and len(decodes) == 1
+
+
+def test_changed_source_is_rebuilt(tmp_path, decodes):
+    source = _source(tmp_path / 'sprite.png', Color(255, 0, 0, 255))
+    assert _load(source, None, tmp_path / 'cache')[4][0, 0].tolist() == [255, 0, 0, 255]
+    mtime = os.stat(source).st_mtime_ns
+    # new contents with the old mtime would pass for the old file: size differs, so it is hashed
+    _source(tmp_path / 'sprite.png', Color(0, 0, 255, 255), width=17)
+    os.utime(source, ns=(mtime, mtime))
+    assert _load(source, None, tmp_path / 'cache')[4][0, 0].tolist() == [0, 0, 255, 255]
+    # same size, new mtime and contents
+    _source(tmp_path / 'sprite.png', Color(0, 255, 0, 255), width=17)
+    os.utime(source, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    assert _load(source, None, tmp_path / 'cache')[4][0, 0].tolist() == [0, 255, 0, 255]
+    assert len(decodes) == 3
+    assert len(list((tmp_path / 'cache').glob('*'))) == 1
+
+
+def test_damaged_entries_are_rebuilt(tmp_path, decodes):
+    source = _source(tmp_path / 'red.png', Color(255, 0, 0, 255))
+    expected = _load(source, None, tmp_path / 'cache')
+    path, = (tmp_path / 'cache').glob('*.rlic')
+    data = path.read_bytes()
+    for damaged in (data[:-1], b'XXXX' + data[4:], data[:10], b''):
+        path.write_bytes(damaged)
+        assert np.array_equal(_load(source, None, tmp_path / 'cache')[4], expected[4])
+        assert path.read_bytes() == data
+    assert len(decodes) == 5
+
+
+def test_trim_removes_least_recently_used(tmp_path, decodes):
+    sources = [_source(tmp_path / 'image{}.png'.format(i), Color(i * 40, 0, 0, 255)) for i in range(4)]
+    cache = tmp_path / 'cache'
+    for source in sources:
+        _load(source, None, cache, max_bytes=None)
+    paths = {source: cache / (image_cache_key(source) + '.rlic') for source in sources}
+    for i, source in enumerate(sources):
+        os.utime(str(paths[source]), (1000 + i, 1000 + i))
+    entry_size = paths[sources[0]].stat().st_size
+
+    # reading an entry makes it the most recently used one
+    _load(sources[0], None, cache, max_bytes=None)
+    assert trim_image_cache(2 * entry_size, cache) == 2
+    assert sorted(path.name for path in cache.glob('*.rlic')) == sorted(
+        paths[source].name for source in (sources[0], sources[3]))
+    assert trim_image_cache(2 * entry_size, cache) == 0
+
+    # writes trim the cache to max_bytes themselves
+    _load(sources[1], None, cache, max_bytes=2 * entry_size)
+    assert not paths[sources[3]].exists() and paths[sources[0]].exists()
+    assert clear_image_cache(cache) == 2
+    assert list(cache.glob('*')) == []
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from raylibpy import (
+    UNCOMPRESSED_R5G6B5,
+    UNCOMPRESSED_R8G8B8,
+    export_image,
+    image_copy,
+    image_format,
+    image_from_array,
+    unload_image,
+)
+from raylibpy.imagediff import _pixels, compare_images, image_diff, image_ssim
+
+
+def _image(pixels):
+    return image_from_array(np.ascontiguousarray(pixels))
+
+
+def _rgba(seed, height=16, width=16):
+    pixels = np.random.default_rng(seed).integers(0, 256, (height, width, 4), dtype=np.uint8)
+    pixels[:, :, 3] = 255
+    return pixels
+
+
+def test_uint8_diff_and_tolerance():
+    a = _rgba(1)
+    b = a.copy()
+    b[2, 3, 0] = (int(a[2, 3, 0]) + 128) % 256
+    b[5, 6, 1] = a[5, 6, 1] ^ 1
+    diff = image_diff(a, b)
+    assert diff.changed == 2 and diff.delta.dtype == np.uint8
+    assert diff.max_delta == 128
+    assert image_diff(a, b, tolerance=1).changed == 1
+    assert diff.bounds == (3, 2, 4, 4)
+
+
+def test_float_pixels_are_not_truncated():
+    a = np.full((8, 8, 3), 0.5, dtype=np.float32)
+    b = a.copy()
+    b[1, 1, 2] = 0.75
+    b[4, 4, 0] = 0.501
+    diff = image_diff(a, b)
+    assert diff.changed == 2 and diff.delta.dtype == np.float32
+    assert diff.max_delta == pytest.approx(0.25)
+    assert image_diff(a, b, tolerance=0.01).changed == 1
+    assert image_ssim(a, a) == pytest.approx(1.0)
+    assert image_ssim(a, b) < 1.0
+    heat = diff.heatmap()
+    unload_image(heat)
+
+
+def test_images_are_viewed_without_copies():
+    image = _image(_rgba(2)[:, :, :3])
+    assert image.format == UNCOMPRESSED_R8G8B8
+    assert np.shares_memory(_pixels(image), image.as_array())
+    packed = image_copy(image)
+    image_format(packed, UNCOMPRESSED_R5G6B5)
+    assert _pixels(packed).shape == (16, 16, 4)
+    unload_image(packed)
+    unload_image(image)
+
+
+def test_different_layouts_are_compared_as_rgba():
+    pixels = _rgba(3)
+    rgb, rgba = _image(pixels[:, :, :3]), _image(pixels)
+    assert image_diff(rgb, rgba).changed == 0
+    unload_image(rgb)
+    unload_image(rgba)
+    with pytest.raises(ValueError):
+        image_diff(pixels, pixels[:, :, :3])
+
+
+def _files(tmp_path):
+    files = {}
+    for name, seed in (('golden/a/scene.png', 4), ('golden/b/scene.png', 5), ('renders/a/scene.png', 6),
+                       ('renders/b/scene.png', 7)):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        image = _image(_rgba(seed))
+        assert export_image(str(path), image)
+        unload_image(image)
+        files[name] = str(path)
+    return files
+
+
+def test_heatmaps_keep_their_own_names(tmp_path):
+    files = _files(tmp_path)
+    pairs = [(files['golden/a/scene.png'], files['renders/a/scene.png']),
+             (files['golden/b/scene.png'], files['renders/b/scene.png'])]
+
+    with pytest.raises(ValueError):
+        list(compare_images(pairs, heatmap_dir=tmp_path / 'diff', workers=0))
+
+    results = list(compare_images(pairs, heatmap_dir=tmp_path / 'diff', workers=0, root=tmp_path / 'renders'))
+    assert all(result.ok and result.changed for result in results)
+    assert sorted(result.heatmap for result in results) == [str(tmp_path / 'diff' / 'a' / 'scene_diff.png'),
+                                                           str(tmp_path / 'diff' / 'b' / 'scene_diff.png')]
+    assert all((tmp_path / 'diff' / d / 'scene_diff.png').exists() for d in 'ab')
+
+
+def test_heatmaps_stay_in_their_directory(tmp_path):
+    files = _files(tmp_path)
+    pair = (files['golden/b/scene.png'], files['renders/b/scene.png'])
+    # renders/b is outside root: its relative path would climb out of heatmap_dir
+    result, = compare_images([pair], heatmap_dir=str(tmp_path / 'diff'), workers=0, root=str(tmp_path / 'renders' / 'a'))
+    assert result.ok and result.heatmap == str(tmp_path / 'diff' / 'scene_diff.png')
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['diff', 'golden', 'renders']
+    assert [path.name for path in (tmp_path / 'diff').iterdir()] == ['scene_diff.png']
+
+
+def test_failed_heatmap_export_is_an_error(tmp_path):
+    files = _files(tmp_path)
+    # a directory where the heatmap should go
+    (tmp_path / 'diff' / 'scene_diff.png').mkdir(parents=True)
+    result, = compare_images([(files['golden/a/scene.png'], files['renders/a/scene.png'])],
+                             heatmap_dir=str(tmp_path / 'diff'), workers=0)
+    assert not result.ok and result.heatmap is None
+    assert result.error == "ValueError: Cannot export image '{}'.".format(tmp_path / 'diff' / 'scene_diff.png')
@@ -0,0 +1,101 @@
+import threading
+
+import numpy as np
+import pytest
+
+import raylibpy.imageexport as imageexport
+from raylibpy import image_from_array, load_image, unload_image
+from raylibpy.imageexport import ImageExporter, export_image_async, set_png_options
+
+
+def _pixels():
+    # opaque: bmp keeps no alpha
+    pixels = np.arange(6 * 5 * 4, dtype=np.uint32).astype(np.uint8).reshape(5, 6, 4)
+    pixels[:, :, 3] = 255
+    return pixels
+
+
+@pytest.fixture
+def image():
+    image = image_from_array(_pixels())
+    yield image
+    unload_image(image)
+
+
+def _loaded(path):
+    image = load_image(str(path))
+    pixels = image.as_array().copy()
+    unload_image(image)
+    return pixels
+
+
+def test_png_raw_and_bmp_outputs(tmp_path, image):
+    with ImageExporter(workers=2) as exporter:
+        futures = [exporter.export_image(str(tmp_path / name), image) for name in ('a.png', 'a.raw', 'a.bmp')]
+        assert [future.result(timeout=10) for future in futures] == [
+            str(tmp_path / name) for name in ('a.png', 'a.raw', 'a.bmp')]
+    assert exporter.exported == 3 and exporter.skipped == 0
+    # the caller's image is untouched, the copies are unloaded
+    assert np.array_equal(image.as_array(), _pixels())
+    assert np.array_equal(_loaded(tmp_path / 'a.png'), _pixels())
+    assert np.array_equal(_loaded(tmp_path / 'a.bmp'), _pixels())
+    assert (tmp_path / 'a.raw').read_bytes() == _pixels().tobytes()
+
+
+def test_png_options(tmp_path, image):
+    try:
+        set_png_options(compression_level=0, force_filter=1)
+        assert export_image_async(str(tmp_path / 'fast.png'), image).result(timeout=10) == str(tmp_path / 'fast.png')
+        assert np.array_equal(_loaded(tmp_path / 'fast.png'), _pixels())
+    finally:
+        set_png_options(compression_level=8, force_filter=-1)
+    for kwargs in ({'compression_level': 10}, {'force_filter': 5}, {'force_filter': -2}):
+        with pytest.raises(ValueError):
+            set_png_options(**kwargs)
+
+
+def test_pending_exports_are_bounded(tmp_path, image, monkeypatch):
+    release = threading.Event()
+    written = []
+    export_image = imageexport.export_image
+
+    def stalled(file_name, image):
+        release.wait(10)
+        written.append(file_name)
+        return export_image(file_name, image)
+
+    monkeypatch.setattr(imageexport, 'export_image', stalled)
+    exporter = ImageExporter(workers=1, max_pending=2)
+    first = exporter.export_image(str(tmp_path / '1.raw'), image)
+    second = exporter.export_image(str(tmp_path / '2.raw'), image)
+    # both slots are taken: no export, however it is asked for
+    assert exporter.export_image(str(tmp_path / '3.raw'), image, block=False) is None
+    assert exporter.export_image(str(tmp_path / '3.raw'), image, timeout=0.05) is None
+    assert exporter.skipped == 2 and written == []
+
+    release.set()
+    third = exporter.export_image(str(tmp_path / '3.raw'), image, timeout=10)
+    for future in (first, second, third):
+        future.result(timeout=10)
+    exporter.shutdown()
+    assert written == [str(tmp_path / name) for name in ('1.raw', '2.raw', '3.raw')]
+    assert exporter.exported == 3 and exporter.skipped == 2
+    # every slot came back
+    assert all(exporter._slots.acquire(False) for _ in range(2))
+
+
+def test_errors_reach_the_future(tmp_path, image, monkeypatch):
+    unloaded = []
+    monkeypatch.setattr(imageexport, 'unload_image', lambda image: unloaded.append(image.width))
+    with ImageExporter(workers=1, max_pending=1) as exporter:
+        missing = exporter.export_image(str(tmp_path / 'missing' / 'a.png'), image)
+        with pytest.raises(ValueError):
+            missing.result(timeout=10)
+        unknown = exporter.export_image(str(tmp_path / 'a.unknown'), image)
+        with pytest.raises(ValueError):
+            unknown.result(timeout=10)
+        # the slot of a failed export is free again
+        assert exporter.export_image(str(tmp_path / 'a.raw'), image, timeout=10).result(timeout=10)
+    assert exporter.exported == 1
+    # the copies are unloaded whether the export worked or not
+    assert unloaded == [6, 6, 6]
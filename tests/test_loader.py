@@ -0,0 +1,132 @@
+import os
+import struct
+import wave
+
+import pytest
+
+import raylibpy.loader as loader
+from raylibpy import Image, Texture2D, export_image, gen_image_color, unload_image, unload_wave
+from raylibpy.loader import AsyncLoader
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+
+def _wav(path, frames=2205, rate=22050, channels=2):
+    with wave.open(str(path), 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(struct.pack('<{}h'.format(frames * channels), *([1000, -1000] * frames)[:frames * channels]))
+    return str(path)
+
+
+class _Clock(object):
+    # perf_counter() stand-in advanced by the fake uploads: one millisecond each
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def gpu(monkeypatch):
+    # no window: record uploads and unloads instead
+    state = {'uploads': [], 'unloads': [], 'clock': _Clock()}
+
+    def upload(image):
+        state['clock'].now += 0.001
+        state['uploads'].append(image.width)
+        texture = Texture2D()
+        texture.id = 0 if image.width == 13 else len(state['uploads'])
+        texture.width, texture.height = image.width, image.height
+        return texture
+
+    monkeypatch.setattr(loader, 'load_texture_from_image', upload)
+    monkeypatch.setattr(loader, 'unload_image', lambda image: state['unloads'].append(image.width))
+    monkeypatch.setattr(loader, 'time', state['clock'])
+    return state
+
+
+def _image(width):
+    return Image(None, width, 1, 1, 7)
+
+
+def test_decodes_images_and_waves_in_threads(tmp_path):
+    sound = _wav(tmp_path / 'beep.wav')
+    broken = tmp_path / 'broken.png'
+    broken.write_bytes(b'not a png at all')
+    with open(os.path.join(RESOURCES, 'cat.png'), 'rb') as f:
+        cat_data = f.read()
+    with open(sound, 'rb') as f:
+        sound_data = f.read()
+
+    with AsyncLoader(workers=3) as assets:
+        futures = [assets.load_image(os.path.join(RESOURCES, 'scarfy.png')),
+                   assets.load_image_from_memory('.png', cat_data),
+                   assets.load_wave(sound),
+                   assets.load_wave_from_memory('.wav', sound_data),
+                   assets.load_image(str(broken)),
+                   assets.load_wave(str(tmp_path / 'missing.wav'))]
+        scarfy, cat, beep, beep_memory = (future.result(timeout=10) for future in futures[:4])
+        for future in futures[4:]:
+            with pytest.raises(ValueError):
+                future.result(timeout=10)
+
+    assert (scarfy.width, scarfy.height) == (768, 128)
+    assert (cat.width, cat.height) == (384, 512)
+    for decoded in (beep, beep_memory):
+        # the first field holds raylib 4.0's frameCount
+        assert (decoded.sampleCount, decoded.sampleRate, decoded.sampleSize, decoded.channels) == (2205, 22050, 16, 2)
+    for image in (scarfy, cat):
+        unload_image(image)
+    for decoded in (beep, beep_memory):
+        unload_wave(decoded)
+
+
+def test_pump_uploads_in_order_within_budget(gpu):
+    assets = AsyncLoader(workers=1)
+    textures = [assets.load_texture_from_image(_image(width)) for width in (1, 2, 3, 4, 5)]
+    assert assets.pending_uploads == 5
+    # each fake upload takes 1 ms: a 2.5 ms budget fits three of them
+    assert assets.pump(2.5) == 3
+    assert gpu['uploads'] == [1, 2, 3]
+    assert [texture.done() for texture in textures] == [True, True, True, False, False]
+    # at least one upload per call, however small the budget
+    assert assets.pump(0.0) == 1
+    assert assets.pump(10.0) == 1
+    assert gpu['uploads'] == [1, 2, 3, 4, 5]
+    assert [texture.result().width for texture in textures] == [1, 2, 3, 4, 5]
+    # images given by the caller stay theirs
+    assert gpu['unloads'] == []
+    assert assets.uploaded == 5 and assets.pump() == 0
+    assets.shutdown()
+
+
+def test_failed_and_cancelled_uploads(gpu, tmp_path):
+    path = str(tmp_path / 'tile.png')
+    image = gen_image_color(6, 2, (255, 0, 0, 255))
+    export_image(path, image)
+    unload_image(image)
+
+    assets = AsyncLoader(workers=1)
+    cancelled = assets.load_texture_from_image(_image(11))
+    failed = assets.load_texture_from_image(_image(13))
+    decoded = assets.load_texture(path)
+    missing = assets.load_texture(str(tmp_path / 'missing.png'))
+    with pytest.raises(ValueError):
+        missing.result(timeout=10)
+    assets._executor.shutdown(wait=True)
+    assert cancelled.cancel()
+    assert assets.pump(100.0) == 2
+    assert gpu['uploads'] == [13, 6]
+    with pytest.raises(ValueError):
+        failed.result()
+    assert decoded.result().width == 6
+    # images decoded by the loader are unloaded once on the GPU
+    assert gpu['unloads'] == [6]
+
+    queued = assets.load_texture_from_image(_image(7))
+    assets.shutdown()
+    assert queued.cancelled() and assets.pending_uploads == 0
@@ -0,0 +1,41 @@
+from raylibpy import NPT_3PATCH_HORIZONTAL, NPT_9PATCH, NPatchInfo, Rectangle
+from raylibpy.ninepatch import clear_npatch_layout_cache, npatch_layout, npatch_layout_cache_info
+
+
+def test_nine_patch_layout_is_cached():
+    clear_npatch_layout_cache()
+    patch = NPatchInfo(Rectangle(0, 0, 30, 30), 5, 5, 5, 5, NPT_9PATCH)
+    source, dest = npatch_layout(patch, 100, 50)
+    assert len(source) == 9
+    assert source[:3] == ((0, 0, 5, 5), (5, 0, 20, 5), (25, 0, 5, 5))
+    assert dest[:3] == ((0, 0, 5, 5), (5, 0, 90, 5), (95, 0, 5, 5))
+    assert dest[-1] == (95, 45, 5, 5)
+    assert npatch_layout(patch, 100, 50) == (source, dest)
+    assert npatch_layout_cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_borders_shrink_below_their_size():
+    patch = NPatchInfo(Rectangle(0, 0, 30, 30), 6, 5, 2, 5, NPT_9PATCH)
+    source, dest = npatch_layout(patch, 4, 30)
+    # no center column, the borders share the width in proportion
+    assert [rec[2] for rec in dest[:2]] == [3.0, 1.0]
+    assert len(source) == 6
+
+
+def test_three_patch_keeps_the_source_height():
+    patch = NPatchInfo(Rectangle(10, 20, 30, 8), 5, 0, 5, 0, NPT_3PATCH_HORIZONTAL)
+    source, dest = npatch_layout(patch, 60, 100)
+    assert source == ((10, 20, 5, 8), (15, 20, 20, 8), (35, 20, 5, 8))
+    assert dest == ((0, 0, 5, 8), (5, 0, 50, 8), (55, 0, 5, 8))
+
+
+def test_negative_source_size_starts_from_the_far_edge():
+    patch = NPatchInfo(Rectangle(10, 20, -30, 8), 5, 0, 5, 0, NPT_3PATCH_HORIZONTAL)
+    source, dest = npatch_layout(patch, 60, 100)
+    # same texture coordinates as DrawTextureNPatch(): x shifted by the width, width kept negative
+    assert source == ((40, 20, 5, 8), (45, 20, -40, 8), (5, 20, 5, 8))
+    assert dest == ((0, 0, 5, 8), (5, 0, 50, 8), (55, 0, 5, 8))
+
+    patch = NPatchInfo(Rectangle(0, 30, 10, -30), 0, 5, 0, 5, NPT_9PATCH)
+    source, dest = npatch_layout(patch, 10, 40)
+    assert [rec[1] for rec in source] == [60, 65, 25]
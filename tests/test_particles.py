@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+import raylibpy.particles as particles
+from raylibpy import Color, Texture2D, _QuadBuffer
+from raylibpy.particles import Curve, ParticleEmitter, ParticleSystem
+
+
+class _Recorder(object):
+    # stands in for the GPU vertex buffers, keeps what would be uploaded
+
+    POSITIONS = _QuadBuffer.POSITIONS
+    TEXCOORDS = _QuadBuffer.TEXCOORDS
+    COLORS = _QuadBuffer.COLORS
+
+    def __init__(self, capacity) -> None:
+        self.capacity = capacity
+        self.arrays = {}
+        self.uploads = []
+        self.draws = []
+
+    def update(self, index, array, count):
+        self.arrays[index] = array[:count].copy()
+        self.uploads.append(index)
+
+    def draw(self, texture_id, count):
+        self.draws.append((texture_id, count))
+
+    def unload(self):
+        pass
+
+
+@pytest.fixture
+def buffers(monkeypatch):
+    created = []
+
+    class Recorder(_Recorder):
+        def __init__(self, capacity) -> None:
+            super().__init__(capacity)
+            created.append(self)
+
+    monkeypatch.setattr(particles, '_QuadBuffer', Recorder)
+    return created
+
+
+def _texture(width, height, id=5):
+    texture = Texture2D()
+    texture.id = id
+    texture.width = width
+    texture.height = height
+    return texture
+
+
+def test_update_spawns_ages_and_removes_particles():
+    emitter = ParticleEmitter(capacity=1000, rate=100, lifetime=0.55, speed=10, angle=0, seed=1)
+    emitter.update(0.1)
+    assert emitter.count == 10 and emitter.spawned == 10
+    emitter.update(0.1)
+    assert emitter.count == 20
+    # particles move in the update that spawns them: the first batch went 10 px/s for 0.2 s
+    assert np.allclose(emitter.positions[:10, 0], 2.0)
+    assert np.allclose(emitter.positions[:20, 1], 0.0)
+    emitter.active = False
+    for _ in range(4):
+        emitter.update(0.1)
+    assert emitter.count == 10
+    emitter.update(0.1)
+    assert emitter.count == 0
+
+
+def test_removal_keeps_live_particles_packed():
+    emitter = ParticleEmitter(capacity=8, lifetime=1.0, seed=2)
+    emitter.emit(6)
+    emitter.ages[:6] = [0.0, 2.0, 0.5, 2.0, 2.0, 0.25]
+    emitter._remove_dead()
+    assert emitter.count == 3
+    assert sorted(emitter.ages[:3].tolist()) == [0.0, 0.25, 0.5]
+
+
+def test_capacity_drops_extra_particles():
+    emitter = ParticleEmitter(capacity=16, seed=3)
+    assert emitter.emit(10) == 10
+    assert emitter.emit(10) == 6
+    assert emitter.count == 16 and emitter.dropped == 4
+
+
+def test_curves_follow_the_particle_age():
+    emitter = ParticleEmitter(capacity=4, lifetime=1.0, size=[10, 30],
+                              color=[Color(255, 0, 0, 255), Color(0, 0, 255, 0)], seed=4)
+    emitter.emit(1)
+    emitter.update(0.5)
+    assert emitter.sizes[0] == pytest.approx(20.0, abs=0.1)
+    # the middle of the 256 entry table, one sample past half way
+    assert emitter.colors[0].tolist() == [127, 0, 128, 127]
+    assert Curve.of(5.0, color=False).constant
+
+
+def test_draw_uploads_vertices_once_per_frame(buffers):
+    emitter = ParticleEmitter(_texture(32, 32), capacity=64, size=4, speed=0, seed=5)
+    emitter.emit(3, position=(10, 20))
+    emitter.draw()
+    buffer, = buffers
+    assert buffer.capacity == 64
+    assert buffer.draws == [(5, 3)]
+    vertices = buffer.arrays[_QuadBuffer.POSITIONS]
+    assert vertices.shape == (3, 6, 2)
+    assert vertices[0, :, 0].min() == 8 and vertices[0, :, 0].max() == 12
+    assert vertices[0, :, 1].min() == 18 and vertices[0, :, 1].max() == 22
+
+    emitter.draw()
+    # texture coordinates only go up once
+    assert buffer.uploads.count(_QuadBuffer.TEXCOORDS) == 1
+    assert len(buffers) == 1
+
+
+def test_texcoords_follow_texture_and_source_changes(buffers):
+    emitter = ParticleEmitter(_texture(64, 32), capacity=4, source_rec=(16, 8, 16, 8), seed=6)
+    emitter.emit(1)
+    emitter.draw()
+    buffer, = buffers
+    texcoords = buffer.arrays[_QuadBuffer.TEXCOORDS][0]
+    assert (texcoords[:, 0].min(), texcoords[:, 0].max()) == (0.25, 0.5)
+    assert (texcoords[:, 1].min(), texcoords[:, 1].max()) == (0.25, 0.5)
+
+    emitter.texture = _texture(32, 32, id=6)
+    emitter.draw()
+    texcoords = buffer.arrays[_QuadBuffer.TEXCOORDS][0]
+    assert (texcoords[:, 0].min(), texcoords[:, 0].max()) == (0.5, 1.0)
+    assert buffer.draws[-1] == (6, 1)
+
+    emitter.source_rec = None
+    assert emitter.source_rec is None
+    emitter.draw()
+    texcoords = buffer.arrays[_QuadBuffer.TEXCOORDS][0]
+    assert (texcoords.min(), texcoords.max()) == (0.0, 1.0)
+    assert buffer.uploads.count(_QuadBuffer.TEXCOORDS) == 3
+
+
+def test_system_updates_and_draws_every_emitter(buffers):
+    system = ParticleSystem([ParticleEmitter(_texture(8, 8), capacity=32, rate=100, seed=7),
+                             ParticleEmitter(_texture(8, 8, id=9), capacity=32, rate=200, seed=8)])
+    system.update(0.1)
+    assert system.count == 30
+    system.draw()
+    assert [buffer.draws for buffer in buffers] == [[(5, 10)], [(9, 20)]]
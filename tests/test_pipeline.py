@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from raylibpy import export_image, gen_image_color, load_image, unload_image
+from raylibpy.pipeline import ImagePipeline
+
+
+def _sprite(path, width, height):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image = gen_image_color(width, height, (255, 0, 0, 255))
+    assert export_image(str(path), image)
+    unload_image(image)
+    return str(path)
+
+
+def test_outputs_keep_paths_relative_to_root(tmp_path):
+    sources = [_sprite(tmp_path / 'src' / 'a' / 'hero.png', 8, 8), _sprite(tmp_path / 'src' / 'b' / 'hero.png', 8, 8)]
+    results = ImagePipeline().resize_nn(4, 2).run(sources, tmp_path / 'out', root=tmp_path / 'src', workers=0)
+    assert all(result.ok for result in results)
+    assert sorted(result.target for result in results) == [str(tmp_path / 'out' / 'a' / 'hero.png'),
+                                                          str(tmp_path / 'out' / 'b' / 'hero.png')]
+    image = load_image(results[0].target)
+    assert (image.width, image.height) == (4, 2)
+    unload_image(image)
+
+
+def test_outputs_with_the_same_name_are_refused(tmp_path):
+    sources = [_sprite(tmp_path / 'a' / 'hero.png', 8, 8), _sprite(tmp_path / 'b' / 'hero.png', 8, 8)]
+    results = []
+    with pytest.raises(ValueError):
+        for result in ImagePipeline().imap(sources, tmp_path / 'out', workers=0):
+            results.append(result)
+    # the first file was written, the second one never overwrote it
+    assert [result.source for result in results] == sources[:1]
+
+    # the same source listed twice is not a collision
+    assert len(ImagePipeline().run(sources[:1] * 2, tmp_path / 'out', workers=0)) == 2
+
+
+def test_process_pool_matches_in_process_run(tmp_path):
+    sources = [_sprite(tmp_path / 'src' / 'sprite{}.png'.format(i), 8 + i, 8) for i in range(6)]
+    pipeline = ImagePipeline().resize_nn(4, 4).flip_horizontal()
+    results = pipeline.run(sources, tmp_path / 'pool', workers=2, max_pending=3)
+    assert sorted(result.source for result in results) == sorted(sources)
+    assert all(result.ok and (result.width, result.height) == (4, 4) for result in results)
+    for result in results:
+        assert result.target == str(tmp_path / 'pool' / os.path.basename(result.source))
+        image = load_image(result.target)
+        assert (image.width, image.height) == (4, 4)
+        unload_image(image)
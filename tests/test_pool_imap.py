@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from raylibpy import _pool_imap
+
+
+def _square(value):
+    return value * value
+
+
+def test_runs_in_process_without_workers():
+    assert list(_pool_imap(_square, ((i,) for i in range(5)), workers=0)) == [0, 1, 4, 9, 16]
+
+
+def test_keeps_at_most_max_pending_jobs_in_flight():
+    lock = threading.Lock()
+    state = {'submitted': 0, 'finished': 0, 'peak': 0}
+
+    def jobs():
+        for i in range(50):
+            with lock:
+                state['submitted'] += 1
+                state['peak'] = max(state['peak'], state['submitted'] - state['finished'])
+            yield (i,)
+
+    def work(value):
+        with lock:
+            state['finished'] += 1
+        return value
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(_pool_imap(work, jobs(), 3, 4, executor))
+    assert sorted(results) == list(range(50))
+    # one job may be pulled from the input while max_pending are still running
+    assert state['peak'] <= 5
+
+
+def test_process_pool():
+    assert sorted(_pool_imap(_square, ((i,) for i in range(8)), workers=2)) == [i * i for i in range(8)]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from raylibpy import BLACK, UNCOMPRESSED_GRAYSCALE, UNCOMPRESSED_R8G8B8A8, WHITE, unload_image
+from raylibpy import procedural
+from raylibpy.procedural import apply_color_stops, gen_image_gradient, gen_image_noise, gradient_array, noise_array
+
+
+@pytest.mark.parametrize('kind', ['perlin', 'simplex', 'cellular'])
+def test_noise_is_deterministic_and_in_range(kind):
+    values = noise_array(64, 48, frequency=4, octaves=3, kind=kind, seed=3)
+    assert values.shape == (48, 64) and values.dtype == np.float32
+    assert values.min() >= 0.0 and values.max() <= 1.0 and values.std() > 0.05
+    assert np.array_equal(values, noise_array(64, 48, frequency=4, octaves=3, kind=kind, seed=3))
+    assert not np.array_equal(values, noise_array(64, 48, frequency=4, octaves=3, kind=kind, seed=4))
+
+
+@pytest.mark.parametrize('kind', ['perlin', 'cellular'])
+def test_tileable_noise_wraps(kind):
+    values = noise_array(64, 64, frequency=4, octaves=2, kind=kind, tileable=True).astype(np.float64)
+    inner = max(np.abs(np.diff(values, axis=1)).max(), np.abs(np.diff(values, axis=0)).max())
+    # across the edges the steps are no larger than between neighbours inside
+    assert np.abs(values[:, 0] - values[:, -1]).max() <= inner
+    assert np.abs(values[0] - values[-1]).max() <= inner
+
+
+def test_bands_and_threads_give_the_same_pixels(monkeypatch):
+    whole = noise_array(96, 80, frequency=5, octaves=2, warp=0.2, seed=9)
+    monkeypatch.setattr(procedural, '_BAND_PIXELS', 96 * 7)
+    assert np.array_equal(noise_array(96, 80, frequency=5, octaves=2, warp=0.2, seed=9, workers=3), whole)
+
+    image = gen_image_noise(96, 80, frequency=5, octaves=2, warp=0.2, seed=9, workers=2)
+    assert image.format == UNCOMPRESSED_GRAYSCALE
+    assert np.array_equal(image.as_array()[:, :, 0], (whole * 255.0 + 0.5).astype(np.uint8))
+    unload_image(image)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        noise_array(8, 8, kind='value')
+    with pytest.raises(ValueError):
+        noise_array(8, 8, fractal='billow')
+    with pytest.raises(ValueError):
+        noise_array(8, 8, kind='simplex', tileable=True)
+    with pytest.raises(ValueError):
+        gradient_array(8, 8, kind='diamond')
+    with pytest.raises(ValueError):
+        apply_color_stops(np.zeros(4), [])
+
+
+def test_gradients_and_color_stops():
+    values = gradient_array(64, 16)
+    assert values[0, 0] < 0.01 and values[0, -1] > 0.99
+    assert np.all(np.diff(values[0]) > 0) and np.array_equal(values[0], values[-1])
+    radial = gradient_array(64, 64, kind='radial')
+    assert radial[32, 32] < 0.05 and radial[0, 0] == 1.0
+
+    colors = apply_color_stops(np.array([0.0, 0.5, 1.0]), [(1.0, WHITE), (0.0, BLACK)])
+    assert colors.tolist() == [[0, 0, 0, 255], [128, 128, 128, 255], [255, 255, 255, 255]]
+
+    image = gen_image_gradient(64, 16, [(0.0, BLACK), (1.0, WHITE)], angle=0, workers=2)
+    assert image.format == UNCOMPRESSED_R8G8B8A8
+    assert np.array_equal(image.as_array(), apply_color_stops(values, [(0.0, BLACK), (1.0, WHITE)]))
+    unload_image(image)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import raylibpy.rawimage as rawimage
+from raylibpy import (
+    COMPRESSED_ETC1_RGB,
+    UNCOMPRESSED_R8G8B8A8,
+    UNCOMPRESSED_R32,
+    Texture2D,
+    image_copy,
+    unload_image,
+)
+from raylibpy.rawimage import MappedImage, load_image_raw_mapped
+
+HEADER = 16
+
+
+def _raw(path, array, header=HEADER):
+    data = b'H' * header + np.ascontiguousarray(array).tobytes()
+    path.write_bytes(data)
+    return str(path), data
+
+
+def _pixels(width=10, height=7):
+    return np.arange(width * height * 4, dtype=np.uint32).astype(np.uint8).reshape(height, width, 4)
+
+
+def test_tiles_match_numpy_slices(tmp_path):
+    pixels = _pixels()
+    path, data = _raw(tmp_path / 'sprites.raw', pixels)
+    with MappedImage(path, 10, 7, UNCOMPRESSED_R8G8B8A8, header_size=HEADER) as mapped:
+        assert np.array_equal(mapped.array, pixels)
+        # interior tile, right edge, bottom edge and the bottom right corner
+        for x, y, width, height in ((2, 1, 3, 4), (7, 0, 3, 2), (0, 5, 4, 2), (9, 6, 1, 1), (0, 0, 10, 7)):
+            expected = pixels[y:y + height, x:x + width]
+            assert np.array_equal(mapped.tile_array((x, y, width, height)), expected)
+            tile = mapped.tile_image((x, y, width, height))
+            assert (tile.width, tile.height, tile.format) == (width, height, UNCOMPRESSED_R8G8B8A8)
+            assert np.array_equal(tile.as_array(), expected)
+            unload_image(tile)
+        for rec in ((-1, 0, 2, 2), (9, 0, 2, 2), (0, 6, 2, 2), (0, 0, 0, 1)):
+            with pytest.raises(ValueError):
+                mapped.tile_array(rec)
+            with pytest.raises(ValueError):
+                mapped.tile_image(rec)
+
+
+def test_float_heightmap(tmp_path):
+    heights = np.linspace(0.0, 1.0, 6 * 5, dtype=np.float32).reshape(5, 6)
+    path, data = _raw(tmp_path / 'heights.raw', heights, header=0)
+    mapped = load_image_raw_mapped(path, 6, 5, UNCOMPRESSED_R32)
+    assert np.array_equal(mapped.array[:, :, 0], heights)
+    tile = mapped.tile_image((4, 3, 2, 2))
+    assert np.array_equal(tile.as_array()[:, :, 0], heights[3:5, 4:6])
+    unload_image(tile)
+    # the mapped Image is a regular raylib image for functions that only read it
+    copy = image_copy(mapped.image)
+    assert np.array_equal(copy.as_array()[:, :, 0], heights)
+    unload_image(copy)
+    mapped.close()
+    mapped.close()
+
+
+def test_writes_never_reach_the_file(tmp_path):
+    path, data = _raw(tmp_path / 'sprites.raw', _pixels())
+    mapped = MappedImage(path, 10, 7, UNCOMPRESSED_R8G8B8A8, header_size=HEADER)
+    mapped.array[:] = 0
+    mapped.image.as_array()[0, 0] = (1, 2, 3, 4)
+    assert mapped.tile_array((0, 0, 1, 1)).tolist() == [[[1, 2, 3, 4]]]
+    mapped.close()
+    with open(path, 'rb') as f:
+        assert f.read() == data
+    with MappedImage(path, 10, 7, UNCOMPRESSED_R8G8B8A8, header_size=HEADER) as mapped:
+        assert np.array_equal(mapped.array, _pixels())
+
+
+def test_upload_tile_sends_a_packed_copy(tmp_path, monkeypatch):
+    pixels = _pixels()
+    path, data = _raw(tmp_path / 'sprites.raw', pixels)
+    calls = []
+    monkeypatch.setattr(rawimage, 'update_texture_rec', lambda texture, rec, tile: calls.append((
+        (rec.x, rec.y, rec.width, rec.height), tile.flags['C_CONTIGUOUS'], tile.copy())))
+    with MappedImage(path, 10, 7, UNCOMPRESSED_R8G8B8A8, header_size=HEADER) as mapped:
+        mapped.upload_tile(Texture2D(), (6, 2, 4, 3), position=(8, 16))
+    (rec, contiguous, tile), = calls
+    assert rec == (8, 16, 4, 3) and contiguous
+    assert np.array_equal(tile, pixels[2:5, 6:10])
+
+
+def test_short_files_and_compressed_formats_are_refused(tmp_path):
+    path, data = _raw(tmp_path / 'sprites.raw', _pixels())
+    with pytest.raises(ValueError):
+        MappedImage(path, 10, 8, UNCOMPRESSED_R8G8B8A8, header_size=HEADER)
+    with pytest.raises(ValueError):
+        MappedImage(path, 10, 7, UNCOMPRESSED_R8G8B8A8, header_size=HEADER + 1)
+    with pytest.raises(ValueError):
+        MappedImage(path, 4, 4, COMPRESSED_ETC1_RGB)
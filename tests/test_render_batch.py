@@ -0,0 +1,75 @@
+from ctypes import POINTER, cast
+
+import pytest
+
+import raylibpy
+from raylibpy import RL_QUADS, DrawCall, RenderBatch, RenderBatchStats, _sample_render_batch
+
+
+def _batch(draws):
+    # (vertex count, texture id) per pending draw call; raylib leaves the unused ones at 0 vertices
+    calls = (DrawCall * len(draws))(*[DrawCall(RL_QUADS, count, 0, texture) for count, texture in draws])
+    batch = RenderBatch()
+    batch.draws = cast(calls, POINTER(DrawCall))
+    batch.drawCounter = len(draws)
+    batch._calls = calls
+    return batch
+
+
+def test_sample_counts_draw_calls_vertices_and_binds():
+    stats = RenderBatchStats()
+    _sample_render_batch(stats, _batch([(8, 3), (4, 3), (12, 5), (4, 3)]))
+    assert stats.flushes == 1
+    assert stats.draw_calls == 4
+    assert stats.vertices == 28
+    # consecutive draw calls of one texture share a bind
+    assert stats.texture_binds == 3
+    assert stats.textures == 2
+
+
+def test_sample_skips_empty_draw_calls():
+    stats = RenderBatchStats()
+    _sample_render_batch(stats, _batch([(0, 1)]))
+    assert (stats.flushes, stats.draw_calls, stats.vertices) == (0, 0, 0)
+    _sample_render_batch(stats, _batch([(0, 1), (6, 2), (0, 2)]))
+    assert (stats.flushes, stats.draw_calls, stats.vertices, stats.texture_binds) == (1, 1, 6, 1)
+
+
+def test_sample_reads_active_batch(monkeypatch):
+    # the default batch installed by init_window() is the active one unless another is set
+    monkeypatch.setattr(raylibpy, '_active_render_batch', _batch([(4, 1), (4, 2)]))
+    stats = RenderBatchStats()
+    _sample_render_batch(stats)
+    assert (stats.flushes, stats.draw_calls, stats.vertices) == (1, 2, 8)
+
+    monkeypatch.setattr(raylibpy, '_active_render_batch', None)
+    _sample_render_batch(stats)
+    assert stats.flushes == 1
+
+
+def test_frames_rotate():
+    raylibpy.reset_render_batch_stats()
+    _sample_render_batch(raylibpy._render_batch_frame, _batch([(4, 1)]))
+    _sample_render_batch(raylibpy._render_batch_frame, _batch([(4, 2), (8, 2)]))
+    assert raylibpy.get_render_batch_stats().flushes == 0
+    raylibpy._next_render_batch_frame()
+    stats = raylibpy.get_render_batch_stats()
+    assert (stats.flushes, stats.draw_calls, stats.vertices, stats.textures) == (2, 3, 16, 2)
+    assert raylibpy._render_batch_frame.flushes == 0
+    raylibpy.reset_render_batch_stats()
+    assert raylibpy.get_render_batch_stats().flushes == 0
+
+
+def test_merge():
+    first, second = RenderBatchStats(), RenderBatchStats()
+    _sample_render_batch(first, _batch([(4, 1)]))
+    _sample_render_batch(second, _batch([(4, 1), (4, 2)]))
+    first.merge(second)
+    assert (first.flushes, first.draw_calls, first.vertices, first.texture_binds, first.textures) == (2, 3, 12, 3, 2)
+
+
+def test_default_batch_is_not_unloaded_by_hand(monkeypatch):
+    batch = _batch([])
+    monkeypatch.setattr(raylibpy, '_default_render_batch', batch)
+    with pytest.raises(ValueError):
+        raylibpy.unload_render_batch(batch)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import raylibpy.spritesheet as spritesheet
+from raylibpy import Texture2D
+from raylibpy.spritesheet import SpriteAnimator, SpriteSheet, grid_frames
+
+
+def _texture(width, height):
+    texture = Texture2D()
+    texture.id = 4
+    texture.width = width
+    texture.height = height
+    return texture
+
+
+def _sheet():
+    # 4x2 frames of 16x16
+    sheet = SpriteSheet.from_grid(_texture(64, 32), 16, 16)
+    sheet.add_animation('walk', range(4), fps=10)
+    sheet.add_animation('die', [4, 5, 6], fps=10, loop=False)
+    return sheet
+
+
+def test_grid_frames_margin_and_spacing():
+    recs = grid_frames(70, 40, 16, 16, margin=2, spacing=4)
+    assert recs.tolist() == [[2, 2, 16, 16], [22, 2, 16, 16], [42, 2, 16, 16],
+                             [2, 22, 16, 16], [22, 22, 16, 16], [42, 22, 16, 16]]
+    assert grid_frames(70, 40, 16, 16, margin=2, spacing=4, count=4).tolist() == recs[:4].tolist()
+
+
+def test_grid_frames_count_errors():
+    with pytest.raises(ValueError):
+        grid_frames(64, 32, 16, 16, count=9)
+    with pytest.raises(ValueError):
+        grid_frames(64, 32, 16, 16, count=0)
+    with pytest.raises(ValueError):
+        grid_frames(8, 8, 16, 16)
+
+
+def test_add_animation_validation():
+    sheet = SpriteSheet(_texture(32, 16), grid_frames(32, 16, 16, 16), names={'idle': 0, 'jump': 1})
+    assert sheet.add_animation('both', ['idle', 'jump', 1]) == 0
+    assert sheet.tables()[0].tolist() == [0, 1, 1]
+    for frames, fps in (([], 12), ([2], 12), ([-1], 12), ([0], 0)):
+        with pytest.raises(ValueError):
+            sheet.add_animation('bad', frames, fps=fps)
+    with pytest.raises(KeyError):
+        sheet.add_animation('bad', ['run'])
+    assert list(sheet.animations) == ['both']
+
+
+def test_update_loops_or_clamps_frames():
+    sprites = SpriteAnimator(_sheet())
+    walker = sprites.add('walk', (0, 0))
+    dying = sprites.add('die', (0, 0))
+    slow = sprites.add('walk', (0, 0), speed=0.5)
+    sprites.update(0.25)
+    assert sprites.frame[[walker, dying, slow]].tolist() == [2, 6, 1]
+    assert sprites.finished().tolist() == []
+    sprites.update(0.2)
+    # 0.45 s at 10 fps: the walk wraps around, the death stays on its last frame
+    assert sprites.frame[[walker, dying, slow]].tolist() == [0, 6, 2]
+    assert sprites.finished().tolist() == [dying]
+
+    sprites.play(dying, 'walk')
+    assert sprites.frame[dying] == 0 and sprites.finished().tolist() == []
+
+
+def test_flipped_source_recs_start_at_the_right_edge():
+    sprites = SpriteAnimator(_sheet(), anchor=(0.5, 1.0))
+    sprites.add('walk', (100, 50), time=0.1)
+    flipped = sprites.add('walk', (100, 50), scale=2.0, flip_x=True, time=0.1)
+    assert sprites.source_recs().tolist() == [[16, 0, 16, 16], [32, 0, -16, 16]]
+    # the frame table itself is left alone
+    assert sprites.sheet.recs[1].tolist() == [16, 0, 16, 16]
+    assert sprites.dest_recs().tolist() == [[92, 34, 16, 16], [84, 18, 32, 32]]
+
+    sprites.remove(flipped)
+    assert len(sprites) == 1
+    with pytest.raises(KeyError):
+        sprites.remove(flipped)
+
+
+def test_draw_submits_every_sprite_at_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spritesheet, 'draw_texture_quads',
+                        lambda texture, sources, dests, tint, tints: calls.append((texture.id, sources, dests)))
+    sprites = SpriteAnimator(_sheet(), capacity=2)
+    for x in range(5):
+        sprites.add('walk', (x * 20, 0), flip_x=x % 2 == 1)
+    assert sprites.capacity == 8
+    sprites.draw()
+    (texture_id, sources, dests), = calls
+    assert texture_id == 4 and len(sources) == len(dests) == 5
+    assert np.array_equal(sources[:, 2], [16, -16, 16, -16, 16])
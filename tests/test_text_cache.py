@@ -0,0 +1,38 @@
+import raylibpy
+from raylibpy import clear_text_cache, measure_text
+
+
+def test_encoded_text_is_reused_and_bounded(monkeypatch):
+    monkeypatch.setattr(raylibpy, '_TEXT_CACHE_SIZE', 3)
+    clear_text_cache()
+    first = raylibpy._text_in("score: 10")
+    assert first == b"score: 10"
+    assert raylibpy._text_in("score: 10") is first
+    assert raylibpy._text_in(b"raw") == b"raw"
+    assert raylibpy._text_in("été") == "été".encode('utf-8')
+
+    for text in ("a", "b", "c"):
+        raylibpy._text_in(text)
+    # the oldest strings make room, the cache never grows past its size
+    assert len(raylibpy._text_cache) == 3
+    assert "score: 10" not in raylibpy._text_cache
+    clear_text_cache()
+    assert raylibpy._text_cache == {}
+
+
+def test_measurements_are_cached_until_cleared(monkeypatch):
+    calls = []
+
+    def measure(text, font_size):
+        calls.append(text)
+        return len(text) * font_size
+
+    monkeypatch.setattr(raylibpy._rl, 'MeasureText', measure)
+    clear_text_cache()
+    assert measure_text("label", 10) == 50
+    assert measure_text("label", 10) == 50
+    assert measure_text("label", 20) == 100
+    assert calls == [b"label", b"label"]
+    clear_text_cache()
+    assert measure_text("label", 10) == 50
+    assert len(calls) == 3
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+import raylibpy
+import raylibpy.textlayout as textlayout
+from raylibpy import Font, GlyphInfo, Rectangle, unload_font
+from raylibpy.textlayout import ALIGN_CENTER, ALIGN_RIGHT, get_glyph_table, layout_text
+
+
+def _font(padding=0):
+    # monospace: 8x16 glyphs 10 px apart, drawn 1 px right and 2 px down of the pen, at base size 20
+    codepoints = [ord(' '), ord('?')] + list(range(ord('a'), ord('z') + 1))
+    glyphs = (GlyphInfo * len(codepoints))()
+    recs = (Rectangle * len(codepoints))()
+    for i, codepoint in enumerate(codepoints):
+        glyphs[i].value = codepoint
+        glyphs[i].offsetX = 1
+        glyphs[i].offsetY = 2
+        glyphs[i].advanceX = 10
+        recs[i] = Rectangle(float(i * 12), 0.0, 8.0, 16.0)
+    font = Font()
+    font.baseSize = 20
+    font.glyphCount = len(codepoints)
+    font.glyphPadding = padding
+    font.texture.id = 9
+    font.glyphs = glyphs
+    font.recs = recs
+    # keep the arrays alive with the font
+    font._arrays = (glyphs, recs)
+    return font
+
+
+@pytest.fixture(autouse=True)
+def fresh_tables():
+    textlayout.clear_glyph_tables()
+    yield
+    textlayout.clear_glyph_tables()
+
+
+def _lines(layout):
+    return [''.join(chr(c) for c in layout.codepoints[start:end]) for start, end in layout.lines]
+
+
+def test_single_line_placement():
+    layout = layout_text(_font(), "ab cd", 40, 2)
+    assert layout.positions[:, 0].tolist() == [0, 22, 44, 66, 88]
+    assert layout.positions[:, 1].tolist() == [0] * 5
+    assert layout.width == 108 and layout.height == 40
+    # offsets and sizes scale with the font size
+    assert layout.dest_recs[1].tolist() == [24, 4, 16, 32]
+    assert layout.visible.tolist() == [True, True, False, True, True]
+
+
+def test_wrapping_breaks_at_blanks():
+    layout = layout_text(_font(), "aaa bbb ccc", 20, 0, max_width=75)
+    assert _lines(layout) == ["aaa bbb ", "ccc"]
+    assert layout.line_widths.tolist() == [70, 30]
+    assert layout.positions[8].tolist() == [0, 30]
+    assert (layout.width, layout.height) == (75, 50)
+
+    # a word longer than the line is cut where it stops fitting
+    assert _lines(layout_text(_font(), "abcdefgh", 20, 0, max_width=35)) == ["abc", "def", "gh"]
+
+
+def test_alignment_uses_the_block_width():
+    # lines of 70 and 30 px in a 75 px block
+    for align, first, second in ((ALIGN_CENTER, 2.5, 22.5), (ALIGN_RIGHT, 5.0, 45.0)):
+        layout = layout_text(_font(), "aaa bbb ccc", 20, 0, max_width=75, align=align)
+        assert layout.positions[[0, 8], 0].tolist() == [first, second]
+
+
+def test_leading_blank_is_kept_on_the_first_line():
+    layout = layout_text(_font(), " ab", 20, 0)
+    assert _lines(layout) == [" ab"]
+    assert layout.positions[1].tolist() == [10, 0]
+    assert layout.line_widths.tolist() == [30]
+
+    # indentation is not a break point: no empty first line
+    layout = layout_text(_font(), "  aaaa", 20, 0, max_width=40)
+    assert _lines(layout) == ["  aa", "aa"]
+    assert layout.positions[4].tolist() == [0, 30]
+    assert _lines(layout_text(_font(), "  aa bb", 20, 0, max_width=60)) == ["  aa ", "bb"]
+
+
+def test_explicit_newlines_start_lines():
+    layout = layout_text(_font(), "ab\n\ncd", 20, 0, max_width=100)
+    assert _lines(layout) == ["ab\n", "\n", "cd"]
+    assert layout.line_widths.tolist() == [20, 0, 20]
+    assert layout.positions[4].tolist() == [0, 60]
+    assert layout.height == 80
+    assert not layout.visible[[2, 3]].any()
+
+
+def test_missing_glyphs_fall_back_to_question_mark():
+    layout = layout_text(_font(), "aZ", 20, 0)
+    assert layout.glyphs.tolist() == [2, 1]
+
+
+def test_glyph_padding_grows_source_and_dest_rects(monkeypatch):
+    layout = layout_text(_font(padding=2), "ab", 40, 0)
+    assert layout.source_recs.tolist() == [[22, -2, 12, 20], [34, -2, 12, 20]]
+    assert layout.dest_recs.tolist() == [[-2, 0, 24, 40], [18, 0, 24, 40]]
+
+    calls = []
+    monkeypatch.setattr(textlayout, 'draw_texture_quads',
+                        lambda texture, sources, dests, tint: calls.append((texture.id, sources, dests)))
+    textlayout.draw_text_layout(layout_text(_font(padding=2), "a b", 20, 0), (100, 50))
+    (texture_id, sources, dests), = calls
+    assert texture_id == 9
+    assert sources.tolist() == [[22, -2, 12, 20], [34, -2, 12, 20]]
+    assert dests.tolist() == [[99, 50, 12, 20], [119, 50, 12, 20]]
+
+
+def test_unload_font_drops_glyph_tables(monkeypatch):
+    monkeypatch.setattr(raylibpy._rl, 'UnloadFont', lambda font: None)
+    font = _font()
+    table = get_glyph_table(font)
+    assert get_glyph_table(font) is table
+    unload_font(font)
+    assert raylibpy._glyph_tables == {}
+    # a font loaded at the same texture id and address gets a fresh table
+    assert get_glyph_table(font) is not table
+    assert np.array_equal(get_glyph_table(font).advances, table.advances)
@@ -0,0 +1,102 @@
+import numpy as np
+
+import raylibpy
+from raylibpy import (
+    LOC_COLOR_DIFFUSE,
+    LOC_MAP_DIFFUSE,
+    LOC_MATRIX_MVP,
+    LOC_VERTEX_COLOR,
+    LOC_VERTEX_POSITION,
+    LOC_VERTEX_TEXCOORD01,
+    RED,
+    Matrix,
+    Texture2D,
+    draw_texture_quads,
+)
+
+
+class _Recorder(object):
+    # stands in for the GPU vertex buffer, keeps what would be uploaded
+
+    def __init__(self) -> None:
+        self.arrays = {}
+        self.draws = []
+
+    def update(self, index, array, count):
+        self.arrays[index] = array[:count].copy()
+
+    def draw(self, texture_id, count):
+        self.draws.append((texture_id, count))
+
+
+def _record(monkeypatch):
+    recorder = _Recorder()
+    monkeypatch.setattr(raylibpy, '_stream_quads', lambda count: recorder)
+    return recorder
+
+
+def _texture(width, height):
+    texture = Texture2D()
+    texture.id = 7
+    texture.width = width
+    texture.height = height
+    return texture
+
+
+def test_shader_locations_follow_raylib_4():
+    assert (LOC_VERTEX_POSITION, LOC_VERTEX_TEXCOORD01, LOC_VERTEX_COLOR) == (0, 1, 5)
+    assert (LOC_MATRIX_MVP, LOC_COLOR_DIFFUSE, LOC_MAP_DIFFUSE) == (6, 12, 15)
+
+
+def test_quads_are_one_upload_and_one_draw(monkeypatch):
+    recorder = _record(monkeypatch)
+    draw_texture_quads(_texture(64, 32), [(16, 8, 16, 8), (0, 0, 32, 32)], [(100, 50, 20, 10), (0, 0, 5, 5)])
+    assert recorder.draws == [(7, 2)]
+
+    vertices = recorder.arrays[raylibpy._QuadBuffer.POSITIONS]
+    assert vertices.shape == (2, 6, 2)
+    # top left, bottom left, bottom right / top left, bottom right, top right
+    assert vertices[0].tolist() == [[100, 50], [100, 60], [120, 60], [100, 50], [120, 60], [120, 50]]
+
+    texcoords = recorder.arrays[raylibpy._QuadBuffer.TEXCOORDS]
+    assert texcoords[0].tolist() == [[0.25, 0.25], [0.25, 0.5], [0.5, 0.5], [0.25, 0.25], [0.5, 0.5], [0.5, 0.25]]
+    assert texcoords[1, 2].tolist() == [0.5, 1.0]
+
+    colors = recorder.arrays[raylibpy._QuadBuffer.COLORS]
+    assert (colors == 255).all()
+
+
+def test_negative_source_size_mirrors(monkeypatch):
+    recorder = _record(monkeypatch)
+    # render textures are stored bottom up: (0, h, w, -h) draws them upright
+    draw_texture_quads(_texture(32, 32), np.array([[0, 32, 32, -32]]), np.array([[0, 0, 32, 32]]))
+    texcoords = recorder.arrays[raylibpy._QuadBuffer.TEXCOORDS][0]
+    assert texcoords[0].tolist() == [0.0, 1.0]
+    assert texcoords[1].tolist() == [0.0, 0.0]
+
+
+def test_tints(monkeypatch):
+    recorder = _record(monkeypatch)
+    draw_texture_quads(_texture(8, 8), [(0, 0, 8, 8)], [(0, 0, 8, 8)], (1, 2, 3, 4))
+    assert recorder.arrays[raylibpy._QuadBuffer.COLORS][0].tolist() == [[1, 2, 3, 4]] * 6
+
+    draw_texture_quads(_texture(8, 8), [(0, 0, 8, 8)] * 2, [(0, 0, 8, 8)] * 2, RED, tints=[(9, 8, 7, 6), (1, 1, 1, 1)])
+    colors = recorder.arrays[raylibpy._QuadBuffer.COLORS]
+    assert colors[0].tolist() == [[9, 8, 7, 6]] * 6
+    assert colors[1].tolist() == [[1, 1, 1, 1]] * 6
+
+
+def test_nothing_to_draw(monkeypatch):
+    recorder = _record(monkeypatch)
+    draw_texture_quads(_texture(8, 8), [], [])
+    assert recorder.draws == []
+
+
+def test_matrix_arrays():
+    mat = Matrix(m0=1, m4=2, m8=3, m12=4, m1=5, m5=6, m9=7, m13=8, m2=9, m6=10, m10=11, m14=12, m3=13, m7=14, m11=15,
+                 m15=16)
+    array = raylibpy._matrix_array(mat)
+    assert array[0].tolist() == [1, 2, 3, 4]
+    assert array[:, 3].tolist() == [4, 8, 12, 16]
+    back = raylibpy._array_matrix(array * 2)
+    assert (back.m0, back.m12, back.m3, back.m15) == (2, 8, 26, 32)
@@ -0,0 +1,96 @@
+from ctypes import c_ubyte
+
+import numpy as np
+import pytest
+
+import raylibpy
+from raylibpy import (
+    UNCOMPRESSED_R8G8B8A8,
+    Texture2D,
+    update_texture,
+    update_texture_rec,
+    update_texture_regions,
+)
+
+
+def _texture(width, height):
+    texture = Texture2D()
+    texture.id = 3
+    texture.width = width
+    texture.height = height
+    texture.mipmaps = 1
+    texture.format = UNCOMPRESSED_R8G8B8A8
+    return texture
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    # no window: keep what would reach the GPU
+    calls = []
+
+    def update(texture, address):
+        calls.append((None, address, bytes((c_ubyte * (texture.width * texture.height * 4)).from_address(address))))
+
+    def update_rec(texture, rec, address):
+        size = int(rec.width) * int(rec.height) * 4
+        rec = (int(rec.x), int(rec.y), int(rec.width), int(rec.height))
+        calls.append((rec, address, bytes((c_ubyte * size).from_address(address))))
+
+    monkeypatch.setattr(raylibpy._rl, 'UpdateTexture', update)
+    monkeypatch.setattr(raylibpy._rl, 'UpdateTextureRec', update_rec)
+    return calls
+
+
+def _frame(width, height):
+    return np.arange(width * height * 4, dtype=np.uint32).astype(np.uint8).reshape(height, width, 4)
+
+
+def test_arrays_are_not_copied(uploads):
+    frame = _frame(8, 4)
+    update_texture(_texture(8, 4), frame)
+    (rec, address, data), = uploads
+    assert address == frame.ctypes.data
+    assert data == frame.tobytes()
+
+    update_texture(_texture(8, 4), bytearray(frame.tobytes()))
+    assert uploads[1][2] == frame.tobytes()
+
+
+def test_buffers_are_checked(uploads):
+    texture = _texture(8, 4)
+    with pytest.raises(ValueError):
+        update_texture(texture, bytes(8 * 4 * 4 - 1))
+    with pytest.raises(ValueError):
+        update_texture(texture, _frame(4, 8))
+    with pytest.raises(ValueError):
+        update_texture(texture, _frame(16, 4)[:, ::2])
+    with pytest.raises(ValueError):
+        update_texture(texture, np.zeros((4, 8, 4), dtype=np.float32))
+    with pytest.raises(ValueError):
+        update_texture_rec(texture, (0, 0, 4, 4), _frame(4, 2))
+    assert uploads == []
+
+
+def test_regions_are_packed_from_the_frame(uploads):
+    frame = _frame(16, 8)
+    update_texture_regions(_texture(16, 8), frame, [(2, 1, 3, 2), (0, 4, 16, 3), (13, 6, 3, 2)])
+    assert [rec for rec, address, data in uploads] == [(2, 1, 3, 2), (0, 4, 16, 3), (13, 6, 3, 2)]
+    for (x, y, width, height), address, data in uploads:
+        assert data == frame[y:y + height, x:x + width].tobytes()
+    # full rows are sent straight from the frame
+    assert uploads[1][1] == frame.ctypes.data + 4 * 16 * 4
+
+
+def test_regions_outside_the_texture(uploads):
+    with pytest.raises(ValueError):
+        update_texture_regions(_texture(16, 8), _frame(16, 8), [(10, 0, 8, 2)])
+
+
+def test_rec_outside_the_texture(uploads):
+    texture = _texture(16, 8)
+    for rec in ((-1, 0, 4, 4), (0, -2, 4, 4), (13, 0, 4, 4), (0, 5, 4, 4), (0, 0, 0, 4), (0, 0, 17, 1)):
+        with pytest.raises(ValueError):
+            update_texture_rec(texture, rec, _frame(max(rec[2], 1), max(rec[3], 1)))
+    assert uploads == []
+    update_texture_rec(texture, (12, 4, 4, 4), _frame(4, 4))
+    assert uploads[0][0] == (12, 4, 4, 4)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import raylibpy.tilemap as tilemap
+from raylibpy import UNCOMPRESSED_R8G8B8A8, Camera2D, RenderTexture2D, Texture2D
+from raylibpy.tilemap import TileMap
+
+
+def _texture(width, height, texture_id=1):
+    texture = Texture2D()
+    texture.id, texture.width, texture.height, texture.mipmaps, texture.format = \
+        texture_id, width, height, 1, UNCOMPRESSED_R8G8B8A8
+    return texture
+
+
+@pytest.fixture
+def draws(monkeypatch):
+    # no window: record the submissions, render textures only get sizes
+    calls = []
+
+    def draw(texture, sources, dests, tint=None, tints=None):
+        calls.append((texture.id, np.asarray(sources, dtype=np.float32), np.asarray(dests, dtype=np.float32)))
+
+    def load(width, height):
+        target = RenderTexture2D()
+        target.id = 1
+        target.texture = _texture(width, height, 100)
+        target.depth = _texture(width, height, 101)
+        target.depth.format = 19
+        return target
+
+    monkeypatch.setattr(tilemap, 'draw_texture_quads', draw)
+    monkeypatch.setattr(tilemap, 'load_render_texture', load)
+    monkeypatch.setattr(tilemap, 'unload_render_texture', lambda target: None)
+    monkeypatch.setattr(tilemap, 'begin_texture_mode', lambda target: None)
+    monkeypatch.setattr(tilemap, 'end_texture_mode', lambda: None)
+    monkeypatch.setattr(tilemap, 'clear_background', lambda color: None)
+    return calls
+
+
+def _camera():
+    camera = Camera2D()
+    camera.zoom = 1.0
+    return camera
+
+
+def test_chunks_not_rendered_are_drawn_in_one_submission(draws):
+    level = TileMap(_texture(64, 64), 16, 16, 8, 8, chunk_size=4, max_chunks=2)
+    level.fill(0, 0, 8, 8, 3)
+    level.set_tile(5, 1, tilemap.EMPTY_TILE)
+    level.draw(_camera(), screen_width=128, screen_height=128)
+    (texture_id, sources, dests), = draws
+    assert texture_id == 1 and len(sources) == 63
+    assert sources[0].tolist() == [48, 0, 16, 16]
+    assert [5 * 16, 16] not in dests[:, :2].tolist()
+
+    assert level.update(_camera(), 128, 128) == 2
+    # each chunk rendered into its texture with one submission
+    assert [len(call[1]) for call in draws[1:]] == [16, 15]
+    del draws[:]
+    level.draw(_camera(), screen_width=128, screen_height=128)
+    # two chunks from their render textures, the other two tile by tile in one submission
+    assert [call[0] for call in draws] == [100, 100, 1]
+    assert len(draws[-1][1]) == 32
+    assert draws[0][1].tolist() == [[0, 64, 64, -64]]
+
+
+def test_vram_counts_the_depth_buffers(draws):
+    level = TileMap(_texture(64, 64), 16, 16, 8, 8, chunk_size=4, max_chunks=2)
+    assert level.update(_camera(), 128, 128) == 2
+    assert level.vram_bytes == 2 * (64 * 64 * 4 + 64 * 64 * 4)
+    # over the budget the least recently drawn chunk is dropped
+    camera = _camera()
+    camera.target.x = 64
+    camera.target.y = 64
+    level.update(camera, 64, 64)
+    assert level.evicted == 1 and len(list(level.chunks())) == 2